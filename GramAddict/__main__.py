@@ -40,6 +40,12 @@ def cmd_run(args):
     start_bot()
 
 
+def cmd_fleet(args):
+    from GramAddict.core.fleet import start_fleet
+
+    start_fleet(args.configs_list, repeat=args.repeat, debug=args.debug)
+
+
 def cmd_dump(args):
     import os
     import shutil
@@ -99,6 +105,29 @@ _commands = [
             dict(args=["--config"], nargs="?", help="provide the config.yml path"),
         ],
     ),
+    dict(
+        action=cmd_fleet,
+        command="fleet",
+        help="run many accounts at once, one worker per device",
+        flags=[
+            dict(
+                args=["configs_list"],
+                nargs="?",
+                default="configs-list.yml",
+                help="yml file with the config path of every account",
+            ),
+            dict(
+                args=["--repeat"],
+                action="store_true",
+                help="start again from the first account of each device when done",
+            ),
+            dict(
+                args=["--debug"],
+                action="store_true",
+                help="show debug logs in console",
+            ),
+        ],
+    ),
     dict(
         action=cmd_dump,
         command="dump",
@@ -0,0 +1,124 @@
+import logging
+import os
+import socket
+import subprocess
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ADB_HOST = os.environ.get("ANDROID_ADB_SERVER_HOST", "127.0.0.1")
+ADB_PORT = int(os.environ.get("ANDROID_ADB_SERVER_PORT", 5037))
+
+
+class AdbError(Exception):
+    pass
+
+
+class AdbClient:
+    """Talks to the adb server socket directly instead of spawning an adb process for every command.
+    One client per serial: the transport is resolved once and calls are serialized."""
+
+    def __init__(
+        self,
+        serial: Optional[str] = None,
+        host: str = ADB_HOST,
+        port: int = ADB_PORT,
+        timeout: float = 10.0,
+    ):
+        self.serial = serial
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._lock = Lock()
+        self._server_started = False
+
+    def _connect(self) -> socket.socket:
+        try:
+            return socket.create_connection((self.host, self.port), self.timeout)
+        except ConnectionRefusedError:
+            if self._server_started:
+                raise AdbError(f"adb server is not running on {self.host}:{self.port}")
+            # the only time we still need the adb binary
+            logger.debug("adb server is not running, starting it..")
+            subprocess.run(
+                "adb start-server",
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                shell=True,
+            )
+            self._server_started = True
+            return self._connect()
+
+    @staticmethod
+    def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise AdbError("adb server closed the connection")
+            data += chunk
+        return data
+
+    @staticmethod
+    def _recv_all(sock: socket.socket) -> bytes:
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+    def _recv_length_prefixed(self, sock: socket.socket) -> str:
+        size = int(self._recv_exactly(sock, 4), 16)
+        return self._recv_exactly(sock, size).decode("utf-8", "replace")
+
+    def _request(self, sock: socket.socket, request: str) -> None:
+        data = request.encode("utf-8")
+        sock.sendall(f"{len(data):04x}".encode("ascii") + data)
+        status = self._recv_exactly(sock, 4)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            raise AdbError(self._recv_length_prefixed(sock))
+        raise AdbError(f"Unexpected adb server answer: {status!r}")
+
+    def devices(self) -> List[Tuple[str, str]]:
+        """[(serial, state)] as listed by 'adb devices'"""
+        with self._connect() as sock:
+            self._request(sock, "host:devices")
+            output = self._recv_length_prefixed(sock)
+        return [
+            tuple(line.split("\t", 1)) for line in output.splitlines() if "\t" in line
+        ]
+
+    def shell(self, cmd: str) -> str:
+        """output of 'adb shell <cmd>' (stdout and stderr together)"""
+        transport = (
+            "host:transport-any"
+            if self.serial is None
+            else f"host:transport:{self.serial}"
+        )
+        with self._lock, self._connect() as sock:
+            self._request(sock, transport)
+            self._request(sock, f"shell:{cmd}")
+            return self._recv_all(sock).decode("utf-8", "replace")
+
+
+_clients: Dict[Optional[str], AdbClient] = {}
+_clients_lock = Lock()
+
+
+def get_adb(serial: Optional[str] = None) -> AdbClient:
+    """pooled client for this serial (None means the only device connected)"""
+    with _clients_lock:
+        client = _clients.get(serial)
+        if client is None:
+            client = _clients[serial] = AdbClient(serial)
+        return client
+
+
+def set_adb(serial: Optional[str], client) -> None:
+    """answer the calls for this serial with another client, e.g. a trace replay"""
+    with _clients_lock:
+        _clients[serial] = client
@@ -1,5 +1,7 @@
 import logging
+import os
 import random
+import threading
 from datetime import datetime, timedelta
 from time import sleep
 
@@ -17,10 +19,11 @@ from GramAddict.core.log import (
     update_log_file_name,
 )
 from GramAddict.core.navigation import check_if_english
+from GramAddict.core.navigation import load_config as load_navigation
 from GramAddict.core.persistent_list import PersistentList
-from GramAddict.core.report import print_full_report
+from GramAddict.core.report import print_full_report, print_rpc_stats
 from GramAddict.core.session_state import SessionState, SessionStateEncoder
-from GramAddict.core.storage import Storage
+from GramAddict.core.storage import ACCOUNTS, Storage
 from GramAddict.core.utils import (
     ask_for_a_donation,
     can_repeat,
@@ -77,29 +80,59 @@ def start_bot(**kwargs):
     if "--move-folders-in-accounts" in configs.args:
         move_usernames_to_accounts()
 
-    # Global Variables
-    sessions = PersistentList("sessions", SessionStateEncoder)
-
     # Load Config
     configs.load_plugins()
     configs.parse_args()
+    load_configs(configs)
+
+    if not configs.args or not check_adb_connection():
+        return
+
+    run_account(configs)
+
+
+def run_job(device, configs, storage, sessions, filters, plugin):
+    if device.rpc_stats is not None:
+        device.rpc_stats.set_job(plugin)
+    try:
+        configs.actions[plugin].run(device, configs, storage, sessions, filters, plugin)
+    finally:
+        if device.rpc_stats is not None:
+            device.rpc_stats.set_job(None)
+
+
+def load_configs(configs):
     # Some plugins need config values without being passed
     # through. Because we do a weird config/argparse hybrid,
     # we need to load the configs in a weird way
     load_filter(configs)
     load_interaction(configs)
+    load_navigation(configs)
     load_utils(configs)
     load_views(configs)
 
-    if not configs.args or not check_adb_connection():
-        return
+
+def run_account(configs, sessions=None) -> PersistentList:
+    """all the sessions of the account in configs, returns them"""
+    logger = logging.getLogger(__name__)
+
+    # Global Variables
+    if sessions is None:
+        sessions = PersistentList("sessions", SessionStateEncoder)
 
     if len(configs.enabled) < 1:
         logger.error(
             "You have to specify one of these actions: " + ", ".join(configs.actions)
         )
-        return
-    device = create_device(configs.device_id, configs.app_id)
+        return sessions
+    device = create_device(
+        configs.device_id,
+        configs.app_id,
+        configs.args.hierarchy_snapshot,
+        configs.args.adaptive_waits,
+        configs.args.rpc_stats,
+        configs.args.record_trace,
+    )
     session_state = None
     if str(configs.args.total_sessions) != "-1":
         total_sessions = get_value(configs.args.total_sessions, None, -1)
@@ -151,6 +184,10 @@ def start_bot(**kwargs):
             try:
                 running_ig_version = get_instagram_version()
                 logger.info(f"Instagram version: {running_ig_version}")
+                if configs.args.learn_selectors:
+                    device.learn_selectors(running_ig_version)
+                if configs.args.popup_watcher:
+                    device.watch_popups(configs.args.disable_block_detection)
                 if tuple(running_ig_version.split(".")) > tuple(
                     __tested_ig_version__.split(".")
                 ):
@@ -161,6 +198,15 @@ def start_bot(**kwargs):
                     logger.warning(
                         "Using an untested version of IG would cause unexpected behavior because some elements in the user interface may have been changed. Any crashes that occur with an untested version are not taken into account."
                     )
+                    if (
+                        not configs.args.allow_untested_ig_version
+                        and threading.current_thread() is not threading.main_thread()
+                    ):
+                        # a fleet worker, nobody is there to press ENTER
+                        logger.error(
+                            "Add allow-untested-ig-version: true in the config.yml of this account to run it in a fleet. (read the docs for more info)"
+                        )
+                        stop_bot(device, sessions, session_state, was_sleeping=False)
                     if not configs.args.allow_untested_ig_version:
                         logger.warning(
                             "If you press ENTER, you are aware of this and will not ask for support in case of a crash."
@@ -298,9 +344,7 @@ def start_bot(**kwargs):
                     f"Current unfollow-job: {plugin}",
                     extra={"color": f"{Style.BRIGHT}{Fore.BLUE}"},
                 )
-                configs.actions[plugin].run(
-                    device, configs, storage, sessions, filters, plugin
-                )
+                run_job(device, configs, storage, sessions, filters, plugin)
                 unfollow_jobs.remove(plugin)
                 print_limits = True
             else:
@@ -326,14 +370,36 @@ def start_bot(**kwargs):
                     logger.warning(
                         "You're in scraping mode! That means you're only collection data without interacting!"
                     )
-                configs.actions[plugin].run(
-                    device, configs, storage, sessions, filters, plugin
-                )
+                run_job(device, configs, storage, sessions, filters, plugin)
                 print_limits = True
 
         # save the session in sessions.json
         session_state.finishTime = datetime.now()
         sessions.persist(directory=session_state.my_username)
+        logger.debug(f"View info cache saved {device.info_rpc_saved} RPC(s) so far.")
+        if device.waits is not None:
+            device.waits.save()
+            logger.debug(
+                f"Adaptive waits saved {device.waits.saved_seconds:.0f}s of waiting so far."
+            )
+        if device.selector_preferences is not None:
+            device.selector_preferences.save()
+        if device.rpc_stats is not None:
+            print_rpc_stats(device.rpc_stats)
+            device.rpc_stats.dump(
+                os.path.join(
+                    ACCOUNTS,
+                    session_state.my_username,
+                    "rpc_stats",
+                    f"{session_state.id}.json",
+                )
+            )
+            device.rpc_stats.reset()
+        if device.trace is not None:
+            device.trace.checkpoint()
+            logger.debug(
+                f"{device.trace.calls} device call(s) recorded in {device.trace.path}."
+            )
 
         # print reports
         if telegram_reports_at_end:
@@ -423,3 +489,6 @@ def start_bot(**kwargs):
     )
     print_full_report(sessions, configs.args.scrape_to_file)
     ask_for_a_donation()
+    if device.trace is not None:
+        device.trace.close()
+    return sessions
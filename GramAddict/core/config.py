@@ -1,6 +1,7 @@
 import logging
 import os
 import sys
+import threading
 from datetime import datetime
 from typing import Optional
 
@@ -12,13 +13,35 @@ from GramAddict.core.plugin_loader import PluginLoader
 logger = logging.getLogger(__name__)
 
 
+class PerThread:
+    """Value of a module global set by load_config().
+    A thread sees the value it bound itself, otherwise the last one bound (single account runs),
+    so that several accounts can run in the same process."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._last = None
+
+    def bind(self, value):
+        self._local.value = value
+        self._last = value
+
+    def get(self):
+        return getattr(self._local, "value", self._last)
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
 class Config:
-    def __init__(self, first_run=False, **kwargs):
+    def __init__(self, first_run=False, argv=None, **kwargs):
+        # argv lets the fleet orchestrator load many configs in the same process
+        self.argv = sys.argv if argv is None else argv
         if kwargs:
             self.args = kwargs
             self.module = True
         else:
-            self.args = sys.argv
+            self.args = self.argv
             self.module = False
         self.config = None
         self.config_list = None
@@ -157,10 +180,10 @@ class Config:
                     exit(0)
         else:
             if self.first_run:
-                logger.debug(f"Arguments used: {' '.join(sys.argv[1:])}")
+                logger.debug(f"Arguments used: {' '.join(self.argv[1:])}")
                 if self.config:
                     logger.debug(f"Config used: {self.config}")
-                if len(sys.argv) <= 1:
+                if len(self.argv) <= 1:
                     self.parser.print_help()
                     exit(0)
         if self.module:
@@ -171,7 +194,9 @@ class Config:
                 arg_str += f"{new_key} {v}"
             self.args, self.unknown_args = self.parser.parse_known_args(args=arg_str)
         else:
-            self.args, self.unknown_args = self.parser.parse_known_args()
+            self.args, self.unknown_args = self.parser.parse_known_args(
+                args=self.argv[1:]
+            )
         if "run" in self.unknown_args:
             self.unknown_args.remove("run")
         if self.unknown_args and self.first_run:
@@ -199,7 +224,7 @@ class Config:
                 ):
                     self.enabled.append(item)
         else:
-            for item in sys.argv:
+            for item in self.argv:
                 nitem = item[2:]
                 if (
                     nitem in self.actions
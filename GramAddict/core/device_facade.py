@@ -1,42 +1,59 @@
 import logging
-import string
-from datetime import datetime
 from enum import Enum, auto
-from inspect import stack
-from os import getcwd, listdir
-from random import randint, uniform
+from random import uniform
 from re import search
-from subprocess import PIPE, run
-from time import sleep
-from typing import Optional
+from time import perf_counter, sleep
+from typing import Any, Callable, Dict, Optional
 
 import uiautomator2
 
-from GramAddict.core.utils import random_sleep
+from GramAddict.core.adb import get_adb
+from GramAddict.core.hierarchy import Hierarchy, UnsupportedSelector
+from GramAddict.core.popup_watcher import MAX_POPUPS, PopupWatcher
+from GramAddict.core.rpc_stats import RpcStats
+from GramAddict.core.rpc_trace import TraceRecorder
+from GramAddict.core.screen_recorder import CrashRecorder
+from GramAddict.core.selector_preferences import (
+    SelectorPreferences,
+    first_alternative,
+)
+from GramAddict.core.selectors import ViewSelector
+from GramAddict.core.typing_plan import TypingPlan
+from GramAddict.core.utils import _random_delay, random_sleep
+from GramAddict.core.waits import AdaptiveWaits
 
 logger = logging.getLogger(__name__)
 
 
-def create_device(device_id, app_id):
+def create_device(
+    device_id,
+    app_id,
+    snapshot=False,
+    adaptive_waits=False,
+    rpc_stats=False,
+    record_trace=False,
+):
     try:
-        return DeviceFacade(device_id, app_id)
+        return DeviceFacade(
+            device_id,
+            app_id,
+            snapshot,
+            adaptive_waits,
+            rpc_stats,
+            record_trace=record_trace,
+        )
     except ImportError as e:
         logger.error(str(e))
         return None
 
 
 def get_device_info(device):
-    logger.debug(
-        f"Phone Name: {device.get_info()['productName']}, SDK Version: {device.get_info()['sdkInt']}"
-    )
-    if int(device.get_info()["sdkInt"]) < 19:
+    display = device.display
+    logger.debug(f"Phone Name: {display.product_name}, SDK Version: {display.sdk_int}")
+    if display.sdk_int < 19:
         logger.warning("Only Android 4.4+ (SDK 19+) devices are supported!")
-    logger.debug(
-        f"Screen dimension: {device.get_info()['displayWidth']}x{device.get_info()['displayHeight']}"
-    )
-    logger.debug(
-        f"Screen resolution: {device.get_info()['displaySizeDpX']}x{device.get_info()['displaySizeDpY']}"
-    )
+    logger.debug(f"Screen dimension: {display.width}x{display.height}")
+    logger.debug(f"Screen resolution: {display.width_dp}x{display.height_dp}")
     logger.debug(f"Device ID: {device.deviceV2.serial}")
 
 
@@ -80,12 +97,93 @@ class Mode(Enum):
     PASTE = auto()
 
 
+class DisplayMetrics:
+    """Screen geometry from a single get_info(), kept until the rotation changes or the app restarts"""
+
+    def __init__(self, info: dict):
+        self.width = info["displayWidth"]
+        self.height = info["displayHeight"]
+        self.width_dp = info["displaySizeDpX"]
+        self.height_dp = info["displaySizeDpY"]
+        self.rotation = info["displayRotation"]
+        self.product_name = info["productName"]
+        self.sdk_int = int(info["sdkInt"])
+
+    @property
+    def density(self) -> float:
+        """pixels per dp"""
+        return self.width / self.width_dp if self.width_dp else 1.0
+
+    def __repr__(self):
+        return f"DisplayMetrics({self.width}x{self.height}, density={self.density:.2f}, rotation={self.rotation})"
+
+
+class AppStateWatcher:
+    """Keeps track of the app in foreground.
+    The package is asked to the device only after a gesture or when the last answer is too old,
+    instead of before every single selector."""
+
+    MAX_AGE = 1.0
+
+    def __init__(self, facade):
+        self.facade = facade
+        self._package = None
+        self._generation = None
+        self._time = 0.0
+
+    def invalidate(self):
+        """to be called when the app is started or stopped"""
+        self._package = None
+
+    def current_app(self) -> Optional[str]:
+        if (
+            self._package is None
+            or self._generation != self.facade.generation
+            or perf_counter() - self._time > self.MAX_AGE
+        ):
+            self._package = self.facade._get_current_app()
+            self._generation = self.facade.generation
+            self._time = perf_counter()
+        return self._package
+
+    def is_app_opened(self) -> bool:
+        return self.current_app() == self.facade.app_id
+
+
 class DeviceFacade:
-    def __init__(self, device_id, app_id):
+    # snapshots and view infos older than this are fetched again anyway
+    UI_CACHE_MAX_AGE = 2.0
+    # between two dumps while waiting for the screen to settle after a gesture
+    SETTLE_POLL_INTERVAL = 0.2
+
+    def __init__(
+        self,
+        device_id,
+        app_id,
+        snapshot=False,
+        adaptive_waits=False,
+        rpc_stats=False,
+        backend=None,
+        record_trace=False,
+    ):
+        """backend replaces the uiautomator2 device, e.g. a replay.ReplayDevice"""
         self.device_id = device_id
         self.app_id = app_id
+        self.snapshot_enabled = snapshot
+        self._snapshot = None
+        self._snapshot_time = 0.0
+        # bumped on every gesture or key press, anything read before is outdated
+        self.generation = 0
+        self.info_rpc_saved = 0
+        self.app_state = AppStateWatcher(self)
+        self._display = None
+        self.recorder = None
+        # cleared when the uiautomator server doesn't know waitForIdle
+        self._wait_for_idle_rpc = True
         try:
-            if device_id is None or "." not in device_id:
+            if backend is not None:
+                self.deviceV2 = backend
+            elif device_id is None or "." not in device_id:
                 self.deviceV2 = uiautomator2.connect(
                     "" if device_id is None else device_id
                 )
@@ -93,6 +191,114 @@ class DeviceFacade:
                 self.deviceV2 = uiautomator2.connect_adb_wifi(f"{device_id}")
         except ImportError:
             raise ImportError("Please install uiautomator2: pip3 install uiautomator2")
+        self.waits = AdaptiveWaits(self.deviceV2.serial) if adaptive_waits else None
+        self.rpc_stats = None
+        if rpc_stats:
+            self.rpc_stats = RpcStats()
+            self.rpc_stats.install(self.deviceV2)
+        self.trace = None
+        if record_trace:
+            self.trace = TraceRecorder.for_device(self.deviceV2.serial)
+            self.trace.install(self.deviceV2)
+            for serial in {device_id, self.deviceV2.serial}:
+                self.trace.install_adb(get_adb(serial))
+        # set once the IG version is known, see learn_selectors()
+        self.selector_preferences: Optional[SelectorPreferences] = None
+        # set by watch_popups()
+        self.popups: Optional[PopupWatcher] = None
+
+    def get_snapshot(self, refresh=False) -> Hierarchy:
+        """return the hierarchy of the current screen, dumping it only when needed"""
+        if (
+            refresh
+            or self._snapshot is None
+            or perf_counter() - self._snapshot_time > self.UI_CACHE_MAX_AGE
+        ):
+            snapshot = self._dump()
+            if self.popups is not None:
+                for _ in range(MAX_POPUPS):
+                    if not self.popups.check(self, snapshot):
+                        break
+                    snapshot = self._dump()
+            self._snapshot = snapshot
+            self._snapshot_time = perf_counter()
+        return self._snapshot
+
+    def _dump(self) -> Hierarchy:
+        try:
+            xml_dump = self.deviceV2.dump_hierarchy()
+        except uiautomator2.JSONRPCError as e:
+            raise DeviceFacade.JsonRpcError(e)
+        snapshot = Hierarchy(xml_dump)
+        # the dump tells us the rotation for free
+        self._check_rotation(snapshot.rotation)
+        logger.debug(
+            f"Hierarchy snapshot: {len(snapshot.nodes)} nodes parsed in {snapshot.parse_time * 1000:.1f}ms."
+        )
+        return snapshot
+
+    @property
+    def display(self) -> DisplayMetrics:
+        if self._display is None:
+            self._display = DisplayMetrics(self.get_info())
+            logger.debug(f"Display metrics: {self._display}.")
+        return self._display
+
+    def reset_display(self):
+        """to be called when the app (re)starts"""
+        self._display = None
+
+    def _check_rotation(self, rotation: int):
+        if self._display is not None and self._display.rotation != rotation:
+            logger.debug("Screen has been rotated, refreshing display metrics.")
+            self._display = None
+
+    def notify_ui_changed(self):
+        """to be called after every gesture or key press"""
+        self.generation += 1
+        self._snapshot = None
+
+    def gesture_and_settle(
+        self, gesture: Callable[[], object], mode=SleepTime.TINY
+    ) -> Optional[Hierarchy]:
+        """do the gesture, then wait for the screen to stop moving instead of
+        sleeping blindly, never longer than the pause sleep_mode(mode) makes.
+        With snapshots, returns the settled screen: the next find() calls are
+        answered from it without asking the device again."""
+        try:
+            gesture()
+        except uiautomator2.JSONRPCError as e:
+            raise DeviceFacade.JsonRpcError(e)
+        self.notify_ui_changed()
+        start = perf_counter()
+        deadline = start + DeviceFacade.sleep_delay(mode)
+        if not self.snapshot_enabled:
+            self._wait_for_idle(deadline)
+            return None
+        snapshot = self.get_snapshot(refresh=True)
+        while perf_counter() < deadline:
+            sleep(min(self.SETTLE_POLL_INTERVAL, max(0.0, deadline - perf_counter())))
+            settled = self.get_snapshot(refresh=True)
+            if settled.fingerprint == snapshot.fingerprint:
+                logger.debug(
+                    f"Screen settled in {perf_counter() - start:.2f}s after the gesture."
+                )
+                break
+            snapshot = settled
+        return self._snapshot
+
+    def _wait_for_idle(self, deadline: float):
+        if deadline <= perf_counter():
+            return
+        if self._wait_for_idle_rpc:
+            timeout_ms = int(max(0.0, deadline - perf_counter()) * 1000)
+            try:
+                self.deviceV2.jsonrpc.waitForIdle(timeout_ms)
+                return
+            except uiautomator2.JSONRPCError as e:
+                logger.debug(f"Can't wait for the UI to be idle, sleeping instead: {e}")
+                self._wait_for_idle_rpc = False
+        sleep(max(0.0, deadline - perf_counter()))
 
     def _get_current_app(self):
         try:
@@ -101,95 +307,98 @@ class DeviceFacade:
             raise DeviceFacade.JsonRpcError(e)
 
     def _ig_is_opened(self) -> bool:
-        return self._get_current_app() == self.app_id
+        return self.app_state.is_app_opened()
 
     def check_if_ig_is_opened(func):
-        def wrapper(self, **kwargs):
-            avoid_lst = ["choose_cloned_app", "check_if_crash_popup_is_there"]
-            caller = stack()[1].function
-            if not self._ig_is_opened() and caller not in avoid_lst:
+        """find(check_app=False) skips the check, e.g. for popups not owned by IG"""
+
+        def wrapper(self, check_app=True, **kwargs):
+            if check_app and not self._ig_is_opened():
                 raise DeviceFacade.AppHasCrashed("App has crashed / has been closed!")
             return func(self, **kwargs)
 
         return wrapper
 
+    def learn_selectors(self, ig_version: str):
+        """remember which alternative finds each element on this IG version"""
+        self.selector_preferences = SelectorPreferences(
+            self.deviceV2.serial, ig_version
+        )
+
+    def watch_popups(self, block_detection: bool = True):
+        """dismiss popups and raise blocks as soon as they're in a dump: in every
+        fresh snapshot, and in the one detect_block() takes without snapshots"""
+        self.popups = PopupWatcher(self.app_id, block_detection)
+
+    def first_alternative(self, name: str, alternatives: Dict[str, Callable[[], Any]]):
+        """the result of the first alternative giving one, the one which worked
+        last time on this IG version first"""
+        return first_alternative(self.selector_preferences, name, alternatives)
+
     @check_if_ig_is_opened
     def find(
         self,
         index=None,
+        selector: Optional[ViewSelector] = None,
         **kwargs,
     ):
-        #logger.debug(f"Finding view with index: {index}, kwargs: {kwargs}")
+        # logger.debug(f"Finding view with index: {index}, kwargs: {kwargs}")
+        key = None
+        if selector is not None:
+            key = None if kwargs else selector.key
+            kwargs = {**selector.kwargs, **kwargs}
         try:
             view = self.deviceV2(**kwargs)
-            if index is not None and view.count > 1:
-                logger.debug(f"Index is not None and view.count > 1: {index}, {view.count}")
-                if index < 0:
-                    logger.debug(f"Index is negative: {index}, converting to positive...")
-                    index = view.count + index  # Convert negative index to positive
-                view = self.deviceV2(**kwargs)[index]
+            if index is not None:
+                count = DeviceFacade.View(
+                    view=view, device=self.deviceV2, facade=self
+                ).count_items()
+                if count > 1:
+                    logger.debug(
+                        f"Index is not None and view.count > 1: {index}, {count}"
+                    )
+                    if index < 0:
+                        logger.debug(
+                            f"Index is negative: {index}, converting to positive..."
+                        )
+                        index = count + index  # Convert negative index to positive
+                    view = self.deviceV2(**kwargs)[index]
         except uiautomator2.JSONRPCError as e:
             raise DeviceFacade.JsonRpcError(e)
-        return DeviceFacade.View(view=view, device=self.deviceV2)
+        return DeviceFacade.View(
+            view=view,
+            device=self.deviceV2,
+            facade=self,
+            key=key if index is None else None,
+        )
 
     def back(self, modulable: bool = True):
         logger.debug("Press back button.")
         self.deviceV2.press("back")
+        self.notify_ui_changed()
         random_sleep(modulable=modulable)
 
-    def start_screenrecord(self, output="debug_0000.mp4", fps=20):
-        import imageio
-
-        def _run_MOD(self):
-            from collections import deque
-
-            pipelines = [self._pipe_limit, self._pipe_convert, self._pipe_resize]
-            _iter = self._iter_minicap()
-            for p in pipelines:
-                _iter = p(_iter)
-
-            with imageio.get_writer(self._filename, fps=self._fps) as wr:
-                frames = deque(maxlen=self._fps * 30)
-                for im in _iter:
-                    frames.append(im)
-                if self.crash:
-                    for frame in frames:
-                        wr.append_data(frame)
-            self._done_event.set()
-
-        def stop_MOD(self, crash=True):
-            """
-            stop record and finish write video
-            Returns:
-                bool: whether video is recorded.
-            """
-            if self._running:
-                self.crash = crash
-                self._stop_event.set()
-                ret = self._done_event.wait(10.0)
-
-                # reset
-                self._stop_event.clear()
-                self._done_event.clear()
-                self._running = False
-                return ret
-
-        from uiautomator2 import screenrecord as _sr
-
-        _sr.Screenrecord._run = _run_MOD
-        _sr.Screenrecord.stop = stop_MOD
-        mp4_files = [f for f in listdir(getcwd()) if f.endswith(".mp4")]
-        if mp4_files:
-            last_mp4 = mp4_files[-1]
-            debug_number = "{0:0=4d}".format(int(last_mp4[-8:-4]) + 1)
-            output = f"debug_{debug_number}.mp4"
-        self.deviceV2.screenrecord(output, fps)
+    def start_screenrecord(self, fps=20, seconds=30, max_memory_mb=50):
+        """keep the last seconds of the screen, to be saved with the crash"""
+        if self.recorder is None:
+            self.recorder = CrashRecorder(
+                self.deviceV2, fps, seconds, max_memory_mb * 1024 * 1024
+            )
+        self.recorder.start()
         logger.warning("Screen recording has been started.")
 
-    def stop_screenrecord(self, crash=True):
-        if self.deviceV2.screenrecord.stop(crash=crash):
+    def stop_screenrecord(self):
+        if self.recorder is not None and self.recorder.running:
+            self.recorder.stop()
+            self.recorder.clear()
             logger.warning("Screen recorder has been stopped successfully!")
 
+    def save_screenrecord(self, path) -> bool:
+        """write the last seconds of the screen in path, recording goes on"""
+        if self.recorder is None:
+            return False
+        return self.recorder.save(path)
+
     def screenshot(self, path=None):
         if path is None:
             return self.deviceV2.screenshot()
@@ -203,18 +412,13 @@ class DeviceFacade:
 
     def press_power(self):
         self.deviceV2.press("power")
+        self.notify_ui_changed()
         sleep(2)
 
     def is_screen_locked(self):
-        data = run(
-            f"adb -s {self.deviceV2.serial} shell dumpsys window",
-            encoding="utf-8",
-            stdout=PIPE,
-            stderr=PIPE,
-            shell=True,
-        )
+        data = get_adb(self.deviceV2.serial).shell("dumpsys window")
         if data != "":
-            flag = search("mDreamingLockscreen=(true|false)", data.stdout)
+            flag = search("mDreamingLockscreen=(true|false)", data)
             return flag is not None and flag.group(1) == "true"
         else:
             logger.debug(
@@ -223,15 +427,9 @@ class DeviceFacade:
             return None
 
     def _is_keyboard_show(self):
-        data = run(
-            f"adb -s {self.deviceV2.serial} shell dumpsys input_method",
-            encoding="utf-8",
-            stdout=PIPE,
-            stderr=PIPE,
-            shell=True,
-        )
+        data = get_adb(self.deviceV2.serial).shell("dumpsys input_method")
         if data != "":
-            flag = search("mInputShown=(true|false)", data.stdout)
+            flag = search("mInputShown=(true|false)", data)
             return flag.group(1) == "true"
         else:
             logger.debug(
@@ -267,9 +465,11 @@ class DeviceFacade:
 
     def get_orientation(self):
         try:
-            return self.deviceV2._get_orientation()
+            orientation = self.deviceV2._get_orientation()
         except uiautomator2.JSONRPCError as e:
             raise DeviceFacade.JsonRpcError(e)
+        self._check_rotation(orientation)
+        return orientation
 
     def window_size(self):
         """return (width, height)"""
@@ -294,11 +494,9 @@ class DeviceFacade:
 
         logger.debug(f"Swipe {swipe_dir}, scale={scale}")
 
-        try:
-            self.deviceV2.swipe_ext(swipe_dir, scale=scale)
-            DeviceFacade.sleep_mode(SleepTime.TINY)
-        except uiautomator2.JSONRPCError as e:
-            raise DeviceFacade.JsonRpcError(e)
+        return self.gesture_and_settle(
+            lambda: self.deviceV2.swipe_ext(swipe_dir, scale=scale)
+        )
 
     def swipe_points(self, sx, sy, ex, ey, random_x=True, random_y=True):
         if random_x:
@@ -307,12 +505,10 @@ class DeviceFacade:
         if random_y:
             ey = int(ey * uniform(0.98, 1.02))
         sy = int(sy)
-        try:
-            logger.debug(f"Swipe from: ({sx},{sy}) to ({ex},{ey}).")
-            self.deviceV2.swipe_points([[sx, sy], [ex, ey]], uniform(0.2, 0.5))
-            DeviceFacade.sleep_mode(SleepTime.TINY)
-        except uiautomator2.JSONRPCError as e:
-            raise DeviceFacade.JsonRpcError(e)
+        logger.debug(f"Swipe from: ({sx},{sy}) to ({ex},{ey}).")
+        return self.gesture_and_settle(
+            lambda: self.deviceV2.swipe_points([[sx, sy], [ex, ey]], uniform(0.2, 0.5))
+        )
 
     def get_info(self):
         # {'currentPackageName': 'net.oneplus.launcher', 'displayHeight': 1920, 'displayRotation': 0, 'displaySizeDpX': 411,
@@ -325,92 +521,189 @@ class DeviceFacade:
 
     @staticmethod
     def sleep_mode(mode):
+        delay = DeviceFacade.sleep_delay(mode, log=True)
+        if delay:
+            sleep(delay)
+
+    @staticmethod
+    def sleep_delay(mode, log=False) -> float:
+        """how long sleep_mode(mode) sleeps"""
         mode = SleepTime.DEFAULT if mode is None else mode
         if mode == SleepTime.DEFAULT:
-            random_sleep()
+            return _random_delay(0.5, 3.0, modulable=True, log=log)
         elif mode == SleepTime.TINY:
-            random_sleep(0, 1)
+            return _random_delay(0, 1, modulable=True, log=log)
         elif mode == SleepTime.SHORT:
-            random_sleep(1, 2)
-        elif mode == SleepTime.ZERO:
-            pass
+            return _random_delay(1, 2, modulable=True, log=log)
+        return 0.0
 
     class View:
         deviceV2 = None  # uiautomator2
         viewV2 = None  # uiautomator2
 
-        def __init__(self, view, device):
+        def __init__(self, view, device, facade=None, key=None):
             self.viewV2 = view
             self.deviceV2 = device
+            self.facade = facade
+            # set for the selectors of selectors.py, their result is memoized
+            self.key = key
+            self._cached_info = None
+            self._cached_generation = None
+            self._cached_time = 0.0
+
+        def _wrap(self, view):
+            return DeviceFacade.View(
+                view=view, device=self.deviceV2, facade=self.facade
+            )
+
+        def _lookup(self):
+            """resolve the selector against the hierarchy snapshot
+            returns (resolved, nodes): resolved is False when we have to ask the device
+            """
+            if (
+                self.facade is None
+                or not self.facade.snapshot_enabled
+                or self.viewV2 is None
+                or not isinstance(getattr(self.viewV2, "selector", None), dict)
+            ):
+                return False, []
+            try:
+                return True, self.facade.get_snapshot().resolve(
+                    self.viewV2.selector, key=self.key
+                )
+            except UnsupportedSelector as e:
+                logger.debug(f"Snapshot can't answer this selector: {e}")
+                return False, []
+
+        def _get_cached_info(self) -> Optional[dict]:
+            if (
+                self._cached_info is None
+                or self._cached_generation != self.facade.generation
+                or perf_counter() - self._cached_time > DeviceFacade.UI_CACHE_MAX_AGE
+            ):
+                return None
+            self.facade.info_rpc_saved += 1
+            return self._cached_info
+
+        def _info(self) -> dict:
+            """info dict shared by all the getters, fetched once per screen state"""
+            if self.facade is None:
+                return self.viewV2.info
+            info = self._get_cached_info()
+            if info is not None:
+                return info
+            resolved, nodes = self._lookup()
+            info = nodes[0].info if resolved and nodes else self.viewV2.info
+            self._cached_info = info
+            self._cached_generation = self.facade.generation
+            self._cached_time = perf_counter()
+            return info
+
+        def _adaptive_wait(self, ui_timeout) -> Optional[bool]:
+            """wait with the learned deadline, None when the adaptive waits can't be used"""
+            waits = None if self.facade is None else self.facade.waits
+            selector = getattr(self.viewV2, "selector", None)
+            if waits is None or not isinstance(selector, dict):
+                return None
+
+            def probe():
+                snapshot = self.facade.get_snapshot(refresh=True)
+                return (
+                    bool(snapshot.resolve(selector, key=self.key)),
+                    snapshot.fingerprint,
+                )
+
+            try:
+                return waits.wait_for(
+                    waits.key(selector), self.get_ui_timeout(ui_timeout), probe
+                )
+            except UnsupportedSelector:
+                return None
+
+        def _drop_cached_info(self):
+            self._cached_info = None
+
+        def _ui_changed(self):
+            self._drop_cached_info()
+            if self.facade is not None:
+                self.facade.notify_ui_changed()
 
         def __iter__(self):
             children = []
             try:
-                children.extend(
-                    DeviceFacade.View(view=item, device=self.deviceV2)
-                    for item in self.viewV2
-                )
+                resolved, nodes = self._lookup()
+                if resolved:
+                    children.extend(
+                        self._wrap(self.viewV2[i]) for i in range(len(nodes))
+                    )
+                else:
+                    children.extend(self._wrap(item) for item in self.viewV2)
                 return iter(children)
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
 
         def ui_info(self):
             try:
-                return self.viewV2.info
+                return self._info()
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
 
         def get_desc(self):
             try:
-                return self.viewV2.info["contentDescription"]
+                return self._info()["contentDescription"]
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
 
+        def __getitem__(self, index):
+            """n-th view matching the selector, no RPC involved"""
+            return self._wrap(self.viewV2[index])
+
         def child(self, *args, **kwargs):
             try:
                 view = self.viewV2.child(*args, **kwargs)
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
-            return DeviceFacade.View(view=view, device=self.deviceV2)
+            return self._wrap(view)
 
         def sibling(self, *args, **kwargs):
             try:
                 view = self.viewV2.sibling(*args, **kwargs)
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
-            return DeviceFacade.View(view=view, device=self.deviceV2)
+            return self._wrap(view)
 
         def left(self, *args, **kwargs):
             try:
                 view = self.viewV2.left(*args, **kwargs)
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
-            return DeviceFacade.View(view=view, device=self.deviceV2)
+            return self._wrap(view)
 
         def right(self, *args, **kwargs):
             try:
                 view = self.viewV2.right(*args, **kwargs)
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
-            return DeviceFacade.View(view=view, device=self.deviceV2)
+            return self._wrap(view)
 
         def up(self, *args, **kwargs):
             try:
                 view = self.viewV2.up(*args, **kwargs)
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
-            return DeviceFacade.View(view=view, device=self.deviceV2)
+            return self._wrap(view)
 
         def down(self, *args, **kwargs):
             try:
                 view = self.viewV2.down(*args, **kwargs)
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
-            return DeviceFacade.View(view=view, device=self.deviceV2)
+            return self._wrap(view)
 
         def click_gone(self, maxretry=3, interval=1.0):
             try:
                 self.viewV2.click_gone(maxretry, interval)
+                self._ui_changed()
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
 
@@ -453,6 +746,7 @@ class DeviceFacade:
                 try:
                     logger.debug(f"Single click ({coord[0]},{coord[1]})")
                     self.deviceV2.click(coord[0], coord[1])
+                    self._ui_changed()
                     DeviceFacade.sleep_mode(sleep)
                     return
                 except uiautomator2.JSONRPCError as e:
@@ -466,7 +760,17 @@ class DeviceFacade:
                 y_offset = 0.5
 
             try:
-                visible_bounds = self.get_bounds()
+                known_info = (
+                    self._get_cached_info() if self.facade is not None else None
+                )
+                resolved, nodes = self._lookup()
+                if known_info is None and resolved and nodes:
+                    known_info = nodes[0].info
+                visible_bounds = (
+                    known_info["bounds"]
+                    if known_info is not None
+                    else self.get_bounds()
+                )
                 x_abs = int(
                     visible_bounds["left"]
                     + (visible_bounds["right"] - visible_bounds["left"]) * x_offset
@@ -479,10 +783,15 @@ class DeviceFacade:
                 logger.debug(
                     f"Single click in ({x_abs},{y_abs}). Surface: ({visible_bounds['left']}-{visible_bounds['right']},{visible_bounds['top']}-{visible_bounds['bottom']})"
                 )
-                self.viewV2.click(
-                    self.get_ui_timeout(Timeout.LONG),
-                    offset=(x_offset, y_offset),
-                )
+                if known_info is not None:
+                    # we already know where it is, no need to ask uiautomator again
+                    self.deviceV2.click(x_abs, y_abs)
+                else:
+                    self.viewV2.click(
+                        self.get_ui_timeout(Timeout.LONG),
+                        offset=(x_offset, y_offset),
+                    )
+                self._ui_changed()
                 DeviceFacade.sleep_mode(sleep)
 
             except uiautomator2.JSONRPCError as e:
@@ -544,27 +853,42 @@ class DeviceFacade:
                 self.deviceV2.double_click(
                     random_x, random_y, duration=time_between_clicks
                 )
+                self._ui_changed()
                 DeviceFacade.sleep_mode(SleepTime.DEFAULT)
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
 
-        def scroll(self, direction):
+        def _gesture_and_settle(self, gesture) -> Optional[Hierarchy]:
+            self._drop_cached_info()
+            if self.facade is not None:
+                # no pause after scrolls unless the snapshot is worth waiting for
+                mode = (
+                    SleepTime.TINY if self.facade.snapshot_enabled else SleepTime.ZERO
+                )
+                return self.facade.gesture_and_settle(gesture, mode)
             try:
-                if direction == Direction.UP:
-                    self.viewV2.scroll.toBeginning(max_swipes=1)
-                else:
-                    self.viewV2.scroll.toEnd(max_swipes=1)
+                gesture()
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
+            return None
 
-        def fling(self, direction, max_swipes=5):
-            try:
-                if direction == Direction.UP:
-                    self.viewV2.fling.toBeginning(max_swipes=max_swipes)
-                else:
-                    self.viewV2.fling.toEnd(max_swipes=max_swipes)
-            except uiautomator2.JSONRPCError as e:
-                raise DeviceFacade.JsonRpcError(e)
+        def scroll(self, direction) -> Optional[Hierarchy]:
+            if direction == Direction.UP:
+                return self._gesture_and_settle(
+                    lambda: self.viewV2.scroll.toBeginning(max_swipes=1)
+                )
+            return self._gesture_and_settle(
+                lambda: self.viewV2.scroll.toEnd(max_swipes=1)
+            )
+
+        def fling(self, direction, max_swipes=5) -> Optional[Hierarchy]:
+            if direction == Direction.UP:
+                return self._gesture_and_settle(
+                    lambda: self.viewV2.fling.toBeginning(max_swipes=max_swipes)
+                )
+            return self._gesture_and_settle(
+                lambda: self.viewV2.fling.toEnd(max_swipes=max_swipes)
+            )
 
         def exists(self, ui_timeout=None, ignore_bug: bool = False) -> bool:
             try:
@@ -574,7 +898,24 @@ class DeviceFacade:
                 # We will open a ticket to uiautomator2 to fix this inconsistency.
                 if self.viewV2 is None:
                     return False
+                resolved, nodes = self._lookup()
+                if resolved and nodes:
+                    return True
+                if ui_timeout not in (None, Timeout.ZERO):
+                    exists = self._adaptive_wait(ui_timeout)
+                    if exists is not None:
+                        return exists
+                if resolved:
+                    if ui_timeout in (None, Timeout.ZERO):
+                        return False
+                    # not on the screen yet, let uiautomator wait for it
+                    exists = self.viewV2.exists(self.get_ui_timeout(ui_timeout))
+                    if exists:
+                        self._ui_changed()
+                    return exists
                 exists: bool = self.viewV2.exists(self.get_ui_timeout(ui_timeout))
+                if not exists:
+                    self._drop_cached_info()
                 if (
                     hasattr(self.viewV2, "count")
                     and not exists
@@ -593,13 +934,25 @@ class DeviceFacade:
 
         def count_items(self) -> int:
             try:
+                resolved, nodes = self._lookup()
+                if resolved:
+                    return len(nodes)
                 return self.viewV2.count
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
 
         def wait(self, ui_timeout=Timeout.MEDIUM):
             try:
-                return self.viewV2.wait(timeout=self.get_ui_timeout(ui_timeout))
+                resolved, nodes = self._lookup()
+                if resolved and nodes:
+                    return True
+                found = self._adaptive_wait(ui_timeout)
+                if found is not None:
+                    return found
+                found = self.viewV2.wait(timeout=self.get_ui_timeout(ui_timeout))
+                if resolved and found:
+                    self._ui_changed()
+                return found
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
 
@@ -610,11 +963,9 @@ class DeviceFacade:
                 raise DeviceFacade.JsonRpcError(e)
 
         def is_above_this(self, obj2) -> Optional[bool]:
-            obj1 = self.viewV2
-            obj2 = obj2.viewV2
             try:
-                if obj1.exists() and obj2.exists():
-                    return obj1.info["bounds"]["top"] < obj2.info["bounds"]["top"]
+                if self.exists() and obj2.exists():
+                    return self.get_bounds()["top"] < obj2.get_bounds()["top"]
                 else:
                     return None
             except uiautomator2.JSONRPCError as e:
@@ -622,7 +973,7 @@ class DeviceFacade:
 
         def get_bounds(self) -> dict:
             try:
-                return self.viewV2.info["bounds"]
+                return self._info()["bounds"]
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
 
@@ -636,14 +987,14 @@ class DeviceFacade:
 
         def get_property(self, prop: str):
             try:
-                return self.viewV2.info[prop]
+                return self._info()[prop]
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
 
         def is_scrollable(self):
             try:
-                if self.viewV2.exists():
-                    return self.viewV2.info["scrollable"]
+                if self.exists():
+                    return self._info()["scrollable"]
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
 
@@ -665,9 +1016,9 @@ class DeviceFacade:
         def get_text(self, error=True, index=None):
             try:
                 text = (
-                    self.viewV2.info["text"]
+                    self._info()["text"]
                     if index is None
-                    else self.viewV2[index].info["text"]
+                    else self._wrap(self.viewV2[index])._info()["text"]
                 )
                 if text is not None:
                     return text
@@ -681,8 +1032,8 @@ class DeviceFacade:
 
         def get_selected(self) -> bool:
             try:
-                if self.viewV2.exists():
-                    return self.viewV2.info["selected"]
+                if self.exists():
+                    return self._info()["selected"]
                 logger.debug(
                     "Object has disappeared! Probably too short video which has been liked!"
                 )
@@ -691,41 +1042,20 @@ class DeviceFacade:
                 raise DeviceFacade.JsonRpcError(e)
 
         def set_text(self, text: str, mode: Mode = Mode.TYPE) -> None:
-            punct_list = string.punctuation
             try:
                 if mode == Mode.PASTE:
                     self.viewV2.set_text(text)
+                    self._ui_changed()
                 else:
                     self.click(sleep=SleepTime.SHORT)
                     self.deviceV2.clear_text()
                     random_sleep(0.3, 1, modulable=False)
-                    start = datetime.now()
-                    sentences = text.splitlines()
-                    for j, sentence in enumerate(sentences, start=1):
-                        word_list = sentence.split()
-                        n_words = len(word_list)
-                        for n, word in enumerate(word_list, start=1):
-                            i = 0
-                            n_single_letters = randint(1, 3)
-                            for char in word:
-                                if i < n_single_letters:
-                                    self.deviceV2.send_keys(char, clear=False)
-                                    # random_sleep(0.01, 0.1, modulable=False, logging=False)
-                                    i += 1
-                                else:
-                                    if word[-1] in punct_list:
-                                        self.deviceV2.send_keys(word[i:-1], clear=False)
-                                        # random_sleep(0.01, 0.1, modulable=False, logging=False)
-                                        self.deviceV2.send_keys(word[-1], clear=False)
-                                    else:
-                                        self.deviceV2.send_keys(word[i:], clear=False)
-                                    # random_sleep(0.01, 0.1, modulable=False, logging=False)
-                                    break
-                            if n < n_words:
-                                self.deviceV2.send_keys(" ", clear=False)
-                                # random_sleep(0.01, 0.1, modulable=False, logging=False)
-                        if j < len(sentences):
-                            self.deviceV2.send_keys("\n")
+                    plan = TypingPlan(text)
+                    start = perf_counter()
+                    calls = 0
+                    for command in plan.batches():
+                        self.deviceV2.shell(command, timeout=120)
+                        calls += 1
 
                     typed_text = self.viewV2.get_text()
                     if typed_text != text:
@@ -735,15 +1065,16 @@ class DeviceFacade:
                         self.viewV2.set_text(text)
                     else:
                         logger.debug(
-                            f"Text typed in: {(datetime.now()-start).total_seconds():.2f}s"
+                            f"Text typed in: {perf_counter() - start:.2f}s (planned {plan.duration:.2f}s), {len(plan.keystrokes)} keystroke(s) in {calls} call(s)."
                         )
+                    self._ui_changed()
                 DeviceFacade.sleep_mode(SleepTime.SHORT)
             except uiautomator2.JSONRPCError as e:
                 raise DeviceFacade.JsonRpcError(e)
 
         def get_children_count(self) -> int:
             """Returns the number of children of this view.
-            
+
             Returns:
                 int: Number of child views
             """
@@ -14,7 +14,7 @@ import yaml
 from colorama import Fore, Style
 from langdetect import detect
 
-from GramAddict.core.config import get_time_last_save
+from GramAddict.core.config import PerThread, get_time_last_save
 from GramAddict.core.device_facade import Timeout
 from GramAddict.core.resources import ResourceID as resources
 from GramAddict.core.utils import random_sleep
@@ -22,6 +22,10 @@ from GramAddict.core.views import FollowStatus, ProfileView
 
 logger = logging.getLogger(__name__)
 
+args = PerThread()
+configs = PerThread()
+ResourceID = PerThread()
+
 FIELD_SKIP_BUSINESS = "skip_business"
 FIELD_SKIP_NON_BUSINESS = "skip_non_business"
 FIELD_SKIP_FOLLOWING = "skip_following"
@@ -54,12 +58,9 @@ IGNORE_CHARSETS = ["MATHEMATICAL"]
 
 
 def load_config(config):
-    global args
-    global configs
-    global ResourceID
-    args = config.args
-    configs = config
-    ResourceID = resources(config.args.app_id)
+    args.bind(config.args)
+    configs.bind(config)
+    ResourceID.bind(resources(config.args.app_id))
 
 
 class SkipReason(Enum):
@@ -607,21 +608,28 @@ class Filter:
                         logger.warning(
                             "Profile won't load! Maybe you're soft-banned or you've lost your connection!"
                         )
-        profileView = ProfileView(device)
         if not is_restricted:
+            profileView = ProfileView(device)
+            header = profileView.getHeader()
+            biography = header.biography
+            if header.is_biography_truncated:
+                logger.debug('Found "… more" in bio - trying to expand')
+                biography = profileView.getProfileBiography()
             profile = Profile(
-                mutual_friends=self._get_mutual_friends(device, profileView),
-                follow_button_text=self._get_follow_button_text(device, profileView),
+                mutual_friends=header.mutual_friends,
+                follow_button_text=header.follow_status,
                 is_restricted=is_restricted,
-                is_private=self._is_private_account(device, profileView),
-                has_business_category=self._has_business_category(device, profileView),
-                posts_count=self._get_posts_count(device, profileView),
-                biography=self._get_profile_biography(device, profileView),
-                link_in_bio=self._get_link_in_bio(device, profileView),
-                fullname=self._get_fullname(device, profileView),
-            )
-            followers, following = self._get_followers_and_followings(device)
-            profile.set_followers_and_following(followers, following)
+                is_private=header.is_private,
+                has_business_category=header.has_business_category,
+                posts_count=header.posts_count or 0,
+                biography=biography,
+                link_in_bio=header.link_in_bio,
+                fullname=header.fullname,
+            )
+            if header.followers is not None and header.followings is not None:
+                profile.set_followers_and_following(header.followers, header.followings)
+            else:
+                profile.set_followers_and_following(0, 1)
         else:
             profile = Profile(
                 mutual_friends=None,
@@ -637,53 +645,6 @@ class Filter:
             profile.set_followers_and_following(None, None)
         return profile
 
-    @staticmethod
-    def _get_followers_and_followings(
-        device, profileView: ProfileView = None
-    ) -> Tuple[int, int]:
-        followers = 0
-        profileView = ProfileView(device) if profileView is None else profileView
-        try:
-            followers = profileView.getFollowersCount()
-        except Exception as e:
-            logger.error(f"Cannot find followers count view, default is {followers}.")
-            logger.debug(f"Error: {e}")
-
-        followings = 0
-        try:
-            followings = profileView.getFollowingCount()
-        except Exception as e:
-            logger.error(f"Cannot find followings count view, default is {followings}.")
-            logger.debug(f"Error: {e}")
-        if followers is not None and followings is not None:
-            return followers, followings
-        else:
-            return 0, 1
-
-    @staticmethod
-    def _has_business_category(device, ProfileView=None) -> bool:
-        business_category_view = device.find(
-            resourceId=ResourceID.PROFILE_HEADER_BUSINESS_CATEGORY,
-        )
-        return business_category_view.exists()
-
-    @staticmethod
-    def _is_private_account(device, profileView: ProfileView = None) -> Optional[bool]:
-        private = None
-        profileView = ProfileView(device) if profileView is None else profileView
-        try:
-            private = profileView.isPrivateAccount()
-        except Exception as e:
-            logger.error("Cannot find whether it is private or not")
-            logger.debug(f"Error: {e}")
-
-        return private
-
-    @staticmethod
-    def _get_profile_biography(device, profileView: ProfileView = None) -> str:
-        profileView = ProfileView(device) if profileView is None else profileView
-        return profileView.getProfileBiography()
-
     @staticmethod
     def _find_alphabet(biography: str) -> str:
         a_dict = {}
@@ -717,43 +678,3 @@ class Filter:
         except Exception as e:
             logger.error(f"Cannot determine primary language. Error: {e}")
         return language
-
-    @staticmethod
-    def _get_fullname(device, profileView: ProfileView = None) -> str:
-        profileView = ProfileView(device) if profileView is None else profileView
-        fullname = ""
-        try:
-            fullname = profileView.getFullName()
-        except Exception as e:
-            logger.error("Cannot find full name.")
-            logger.debug(f"Error: {e}")
-
-        return fullname
-
-    @staticmethod
-    def _get_posts_count(device, profileView: ProfileView = None) -> int:
-        profileView = ProfileView(device) if profileView is None else profileView
-        posts_count = 0
-        try:
-            posts_count = profileView.getPostsCount()
-        except Exception as e:
-            logger.error("Cannot find posts count. Default is 0.")
-            logger.debug(f"Error: {e}")
-
-        return posts_count
-
-    @staticmethod
-    def _get_follow_button_text(device, profileView: ProfileView = None) -> str:
-        profileView = ProfileView(device) if profileView is None else profileView
-        _, text = profileView.getFollowButton()
-        return text
-
-    @staticmethod
-    def _get_mutual_friends(device, profileView: ProfileView = None) -> int:
-        profileView = ProfileView(device) if profileView is None else profileView
-        return profileView.getMutualFriends()
-
-    @staticmethod
-    def _get_link_in_bio(device, profileView: ProfileView = None) -> str:
-        profileView = ProfileView(device) if profileView is None else profileView
-        return profileView.getLinkInBio()
@@ -0,0 +1,135 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import yaml
+
+from GramAddict.core.adb import AdbError, get_adb
+from GramAddict.core.bot_flow import load_configs, run_account
+from GramAddict.core.config import Config
+from GramAddict.core.log import (
+    configure_logger,
+    configure_thread_logger,
+    remove_thread_logger,
+)
+from GramAddict.core.persistent_list import PersistentList
+from GramAddict.core.report import print_fleet_report
+from GramAddict.core.session_state import SessionStateEncoder
+
+logger = logging.getLogger(__name__)
+
+
+class FleetAccount:
+    """one config of the fleet with the outcome of its run"""
+
+    def __init__(self, name: str, path: str, config: Config):
+        self.name = name
+        self.path = path
+        self.config = config
+        self.sessions = PersistentList("sessions", SessionStateEncoder)
+        self.error: Optional[str] = None
+        self.start_time = None
+        self.finish_time = None
+
+    @property
+    def device_id(self) -> Optional[str]:
+        return self.config.device_id
+
+    @property
+    def username(self) -> str:
+        return self.config.username or self.name
+
+
+def load_fleet(configs_list: str) -> List[FleetAccount]:
+    """configs-list.yml has the same format of extra/configs-loader:
+    account_name:
+      path: accounts/account_name/config.yml
+    """
+    with open(configs_list, encoding="utf-8") as stream:
+        entries = yaml.safe_load(stream) or {}
+    accounts = []
+    for name, entry in entries.items():
+        path = (entry or {}).get("path", "")
+        config = Config(first_run=True, argv=["gramaddict", "run", "--config", path])
+        config.load_plugins()
+        config.parse_args()
+        accounts.append(FleetAccount(name, path, config))
+    return accounts
+
+
+def group_by_device(accounts: List[FleetAccount]) -> Dict[str, List[FleetAccount]]:
+    """accounts sharing a phone run one after the other"""
+    devices = {}
+    for account in accounts:
+        devices.setdefault(account.device_id, []).append(account)
+    return devices
+
+
+def _run_accounts(accounts: List[FleetAccount], repeat: bool) -> None:
+    while True:
+        for account in accounts:
+            threading.current_thread().name = account.username
+            configure_thread_logger(account.username)
+            load_configs(account.config)
+            account.start_time = datetime.now()
+            try:
+                run_account(account.config, account.sessions)
+            except SystemExit as e:
+                # stop_bot() ends the account, not the fleet
+                account.error = f"stopped (exit code {e.code})"
+            except Exception as e:
+                logger.exception(f"@{account.username} crashed.")
+                account.error = f"{type(e).__name__}: {e}"
+            finally:
+                account.finish_time = datetime.now()
+                remove_thread_logger()
+        if not repeat:
+            return
+
+
+def start_fleet(configs_list: str, repeat: bool = False, debug: bool = False):
+    configure_logger(debug, "fleet", thread_names=True)
+    accounts = load_fleet(configs_list)
+    if not accounts:
+        logger.error(f"No configs found in {configs_list}.")
+        return []
+    devices = group_by_device(accounts)
+    if None in devices:
+        logger.error(
+            "Every config of the fleet needs a device, set it in: "
+            + ", ".join(account.path for account in devices[None])
+        )
+        return accounts
+    try:
+        connected = {
+            serial for serial, state in get_adb().devices() if state == "device"
+        }
+    except (AdbError, OSError) as e:
+        logger.error(f"Can't talk with adb server: {e}")
+        return accounts
+    workers = []
+    for device_id, device_accounts in devices.items():
+        if device_id not in connected:
+            logger.error(f"Device {device_id} is not connected, skip.")
+            for account in device_accounts:
+                account.error = "device not connected"
+            continue
+        logger.info(
+            f"Device {device_id}: "
+            + ", ".join(f"@{account.username}" for account in device_accounts)
+        )
+        worker = threading.Thread(
+            target=_run_accounts,
+            args=(device_accounts, repeat),
+            name=device_id,
+            daemon=True,
+        )
+        worker.start()
+        workers.append(worker)
+    for worker in workers:
+        # join with a timeout, so that CTRL+C still reaches the main thread
+        while worker.is_alive():
+            worker.join(1)
+    print_fleet_report(accounts)
+    return accounts
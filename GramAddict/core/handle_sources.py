@@ -12,15 +12,17 @@ from GramAddict.core.navigation import (
     nav_to_feed,
     nav_to_hashtag_or_place,
     nav_to_post_likers,
+    open_with_deep_link,
 )
 from GramAddict.core.resources import ClassName
+from GramAddict.core.resources import ResourceID as resources
 from GramAddict.core.storage import FollowingStatus
 from GramAddict.core.utils import (
     get_value,
-    inspect_current_view,
     random_choice,
     random_sleep,
 )
+from GramAddict.core.user_rows import get_user_rows
 from GramAddict.core.views import (
     FollowingView,
     LikeMode,
@@ -223,10 +225,17 @@ def handle_blogger_from_file(
 
                     if not can_interact:
                         continue
-                    if need_to_refresh:
-                        search_view = TabBarView(device).navigateToSearch()
-                    profile_view = search_view.navigate_to_target(username, current_job)
-                    need_to_refresh = False
+                    if open_with_deep_link(device, username, current_job):
+                        profile_view = True
+                        # back won't lead to the search anymore
+                        need_to_refresh = True
+                    else:
+                        if need_to_refresh:
+                            search_view = TabBarView(device).navigateToSearch()
+                        profile_view = search_view.navigate_to_target(
+                            username, current_job
+                        )
+                        need_to_refresh = False
                     if not profile_view:
                         not_found.append(username_raw)
                         continue
@@ -307,6 +316,7 @@ def handle_likers(
     post_description = ""
     nr_same_post = 0
     nr_same_posts_max = 3
+    resource_ids = resources(self.args.app_id)
     while True:
         flag, post_description, _, _, _, _ = PostsViewList(device)._check_if_last_post(
             post_description, current_job
@@ -349,22 +359,19 @@ def handle_likers(
             if user_container is None:
                 logger.warning("Likers list didn't load :(")
                 return
-            row_height, n_users = inspect_current_view(user_container)
             try:
-                for item in user_container:
-                    cur_row_height = item.get_height()
-                    if cur_row_height < row_height:
+                for row in get_user_rows(device, user_container, resource_ids):
+                    if not row.fully_visible:
                         continue
                     element_opened = False
-                    username_view = OpenedPostView(device)._getUserName(item)
-                    if not username_view.exists(Timeout.MEDIUM):
+                    if row.username is None:
                         logger.info(
                             "Next item not found: probably reached end of the screen.",
                             extra={"color": f"{Fore.GREEN}"},
                         )
                         break
 
-                    username = username_view.get_text()
+                    username = row.username
                     screen_iterated_likers.append(username)
                     posts_end_detector.notify_username_iterated(username)
                     can_interact = False
@@ -393,6 +400,7 @@ def handle_likers(
                             f"@{username}: interact",
                             extra={"color": f"{Fore.YELLOW}"},
                         )
+                        username_view = OpenedPostView(device)._getUserName(row.view)
                         element_opened = username_view.click_retry()
 
                         if element_opened and not interact(
@@ -724,33 +732,31 @@ def iterate_over_followers(
         user_list = device.find(
             resourceIdMatches=self.ResourceID.USER_LIST_CONTAINER,
         )
-        row_height, n_users = inspect_current_view(user_list)
         try:
-            for item in user_list:
-                cur_row_height = item.get_height()
-                if cur_row_height < row_height:
+            for row in get_user_rows(device, user_list, self.ResourceID):
+                if not row.fully_visible:
                     continue
-                user_info_view = item.child(index=1)
-                user_follow_button = item.child(index=2)
-                user_name_view = user_info_view.child(index=0).child()
-                if not user_name_view.exists():
+                if row.username is None:
                     logger.info(
                         "Next item not found: probably reached end of the screen.",
                         extra={"color": f"{Fore.GREEN}"},
                     )
                     break
 
-                username = user_name_view.get_text()
+                username = row.username
                 screen_iterated_followers.append(username)
                 scroll_end_detector.notify_username_iterated(username)
 
                 can_interact = False
                 if storage.is_user_in_blacklist(username):
                     logger.info(f"@{username} is in blacklist. Skip.")
-                elif user_follow_button.exists() and user_follow_button.get_text() != "Follow":
+                elif (
+                    row.follow_button_text is not None
+                    and row.follow_button_text != "Follow"
+                ):
                     screen_skipped_followers_count += 1
                     logger.info(f"@{username} is already followed. Skip.")
-                elif user_info_view.ui_info()["childCount"] != 0:
+                elif row.info_child_count != 0:
                     screen_skipped_followers_count += 1
                     logger.info(f"@{username} doesn't have a story. Skip.")
                 else:
@@ -776,6 +782,7 @@ def iterate_over_followers(
                     logger.info(
                         f"@{username}: interact", extra={"color": f"{Fore.YELLOW}"}
                     )
+                    user_name_view = row.view.child(index=1).child(index=0).child()
                     element_opened = user_name_view.click_retry()
 
                     if element_opened:
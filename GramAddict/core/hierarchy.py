@@ -0,0 +1,291 @@
+import logging
+import re
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from time import perf_counter
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BOUNDS_RE = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+# uiautomator selector keys we know how to answer locally
+EXACT_KEYS = {
+    "text": "text",
+    "className": "class_name",
+    "description": "content_desc",
+    "packageName": "package",
+    "resourceId": "resource_id",
+}
+CONTAINS_KEYS = {
+    "textContains": "text",
+    "descriptionContains": "content_desc",
+}
+STARTS_WITH_KEYS = {
+    "textStartsWith": "text",
+    "descriptionStartsWith": "content_desc",
+}
+MATCHES_KEYS = {
+    "textMatches": "text",
+    "classNameMatches": "class_name",
+    "descriptionMatches": "content_desc",
+    "packageNameMatches": "package",
+    "resourceIdMatches": "resource_id",
+}
+BOOL_KEYS = {
+    "checkable": "checkable",
+    "checked": "checked",
+    "clickable": "clickable",
+    "longClickable": "long_clickable",
+    "scrollable": "scrollable",
+    "enabled": "enabled",
+    "focusable": "focusable",
+    "focused": "focused",
+    "selected": "selected",
+}
+SUPPORTED_KEYS = (
+    set(EXACT_KEYS)
+    | set(CONTAINS_KEYS)
+    | set(STARTS_WITH_KEYS)
+    | set(MATCHES_KEYS)
+    | set(BOOL_KEYS)
+    | {"index", "instance"}
+)
+# internal keys of uiautomator2.Selector
+SELECTOR_META_KEYS = {"mask", "childOrSibling", "childOrSiblingSelector"}
+
+
+class UnsupportedSelector(Exception):
+    pass
+
+
+@lru_cache(maxsize=512)
+def compile_pattern(pattern: str):
+    """uiautomator uses Java's String.matches(), so the whole value has to match"""
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise UnsupportedSelector(f"Can't compile {pattern!r}: {e}")
+
+
+class Node:
+    __slots__ = (
+        "index",
+        "text",
+        "resource_id",
+        "class_name",
+        "package",
+        "content_desc",
+        "checkable",
+        "checked",
+        "clickable",
+        "long_clickable",
+        "enabled",
+        "focusable",
+        "focused",
+        "scrollable",
+        "selected",
+        "visible",
+        "bounds",
+        "parent",
+        "children",
+        "order",
+    )
+
+    def __init__(self, attrib: Dict[str, str], parent=None, order=0):
+        self.index = int(attrib.get("index", 0))
+        self.text = attrib.get("text", "")
+        self.resource_id = attrib.get("resource-id", "")
+        self.class_name = attrib.get("class", "")
+        self.package = attrib.get("package", "")
+        self.content_desc = attrib.get("content-desc", "")
+        self.checkable = attrib.get("checkable") == "true"
+        self.checked = attrib.get("checked") == "true"
+        self.clickable = attrib.get("clickable") == "true"
+        self.long_clickable = attrib.get("long-clickable") == "true"
+        self.enabled = attrib.get("enabled") == "true"
+        self.focusable = attrib.get("focusable") == "true"
+        self.focused = attrib.get("focused") == "true"
+        self.scrollable = attrib.get("scrollable") == "true"
+        self.selected = attrib.get("selected") == "true"
+        self.visible = attrib.get("visible-to-user", "true") == "true"
+        self.bounds = self._parse_bounds(attrib.get("bounds", ""))
+        self.parent = parent
+        self.children: List["Node"] = []
+        self.order = order
+
+    def __repr__(self):
+        return f"Node({self.resource_id or self.class_name}, text={self.text!r}, bounds={self.bounds})"
+
+    @staticmethod
+    def _parse_bounds(raw: str) -> dict:
+        match = BOUNDS_RE.match(raw)
+        if match is None:
+            return {"left": 0, "top": 0, "right": 0, "bottom": 0}
+        left, top, right, bottom = (int(x) for x in match.groups())
+        return {"left": left, "top": top, "right": right, "bottom": bottom}
+
+    @property
+    def info(self) -> dict:
+        """same shape as uiautomator2 UiObject.info"""
+        return {
+            "bounds": dict(self.bounds),
+            "checkable": self.checkable,
+            "checked": self.checked,
+            "childCount": len(self.children),
+            "className": self.class_name,
+            "clickable": self.clickable,
+            "contentDescription": self.content_desc or None,
+            "enabled": self.enabled,
+            "focusable": self.focusable,
+            "focused": self.focused,
+            "longClickable": self.long_clickable,
+            "packageName": self.package,
+            "resourceName": self.resource_id or None,
+            "scrollable": self.scrollable,
+            "selected": self.selected,
+            "text": self.text or None,
+            "visibleBounds": dict(self.bounds),
+        }
+
+    def iter_descendants(self):
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def matches(self, selector: dict) -> bool:
+        if not self.visible:
+            return False
+        for key, value in selector.items():
+            if key == "instance":
+                continue
+            if key in EXACT_KEYS:
+                if getattr(self, EXACT_KEYS[key]) != value:
+                    return False
+            elif key in MATCHES_KEYS:
+                if (
+                    compile_pattern(value).fullmatch(getattr(self, MATCHES_KEYS[key]))
+                    is None
+                ):
+                    return False
+            elif key in CONTAINS_KEYS:
+                if value not in getattr(self, CONTAINS_KEYS[key]):
+                    return False
+            elif key in STARTS_WITH_KEYS:
+                if not getattr(self, STARTS_WITH_KEYS[key]).startswith(value):
+                    return False
+            elif key in BOOL_KEYS:
+                if getattr(self, BOOL_KEYS[key]) != bool(value):
+                    return False
+            elif key == "index":
+                if self.index != value:
+                    return False
+            else:
+                raise UnsupportedSelector(f"Selector key '{key}' is not supported.")
+        return True
+
+
+class Hierarchy:
+    """In-process copy of the screen built from a single dump_hierarchy()"""
+
+    def __init__(self, xml_dump: str):
+        start = perf_counter()
+        # same screen, same fingerprint
+        self.fingerprint = hash(xml_dump)
+        self.nodes: List[Node] = []
+        self.by_resource_id: Dict[str, List[Node]] = {}
+        self.by_class: Dict[str, List[Node]] = {}
+        self.by_text: Dict[str, List[Node]] = {}
+        # results of the selectors declared once, see selectors.ViewSelector
+        self._resolved: Dict[tuple, List[Node]] = {}
+        root = ET.fromstring(xml_dump.encode("utf-8"))
+        self.rotation = int(root.attrib.get("rotation", 0))
+        self.roots: List[Node] = []
+        stack = [(element, None) for element in reversed(list(root))]
+        while stack:
+            element, parent = stack.pop()
+            if element.tag != "node":
+                continue
+            node = Node(element.attrib, parent, len(self.nodes))
+            self.nodes.append(node)
+            if parent is None:
+                self.roots.append(node)
+            else:
+                parent.children.append(node)
+            if node.visible:
+                self.by_resource_id.setdefault(node.resource_id, []).append(node)
+                self.by_class.setdefault(node.class_name, []).append(node)
+                self.by_text.setdefault(node.text, []).append(node)
+            stack.extend((child, node) for child in reversed(list(element)))
+        self.parse_time = perf_counter() - start
+
+    @property
+    def package(self) -> Optional[str]:
+        return self.roots[0].package if self.roots else None
+
+    def _candidates(self, selector: dict) -> List[Node]:
+        """use the most selective index we have for this selector"""
+        if "resourceId" in selector:
+            return self.by_resource_id.get(selector["resourceId"], [])
+        if "text" in selector:
+            return self.by_text.get(selector["text"], [])
+        if "className" in selector:
+            return self.by_class.get(selector["className"], [])
+        return self.nodes
+
+    def find_all(self, **selector) -> List[Node]:
+        """nodes matching a flat selector, in document order"""
+        check_selector(selector)
+        result = [node for node in self._candidates(selector) if node.matches(selector)]
+        return apply_instance(result, selector)
+
+    def find(self, **selector) -> Optional[Node]:
+        result = self.find_all(**selector)
+        return result[0] if result else None
+
+    def resolve(self, selector, key: Optional[tuple] = None) -> List[Node]:
+        """resolve a uiautomator2.Selector (child and sibling chains included),
+        the result is memoized when the selector comes with a key"""
+        if key is not None:
+            result = self._resolved.get(key)
+            if result is None:
+                result = self._resolved[key] = self._resolve(selector)
+            return list(result)
+        return self._resolve(selector)
+
+    def _resolve(self, selector) -> List[Node]:
+        top = {k: v for k, v in selector.items() if k not in SELECTOR_META_KEYS}
+        result = self.find_all(**top)
+        relations = selector.get("childOrSibling", [])
+        sub_selectors = selector.get("childOrSiblingSelector", [])
+        for relation, sub in zip(relations, sub_selectors):
+            sub = {k: v for k, v in sub.items() if k not in SELECTOR_META_KEYS}
+            check_selector(sub)
+            found = {}
+            for node in result:
+                scope = node if relation == "child" else node.parent
+                if scope is None:
+                    continue
+                for candidate in scope.iter_descendants():
+                    if candidate is not node and candidate.matches(sub):
+                        found[candidate.order] = candidate
+            result = apply_instance(
+                [found[order] for order in sorted(found)],
+                sub,
+            )
+        return result
+
+
+def check_selector(selector: dict) -> None:
+    unsupported = set(selector) - SUPPORTED_KEYS
+    if unsupported:
+        raise UnsupportedSelector(f"Selector keys {unsupported} are not supported.")
+
+
+def apply_instance(nodes: List[Node], selector: dict) -> List[Node]:
+    instance = selector.get("instance")
+    if instance is None:
+        return nodes
+    return nodes[instance : instance + 1]
@@ -12,6 +12,7 @@ import spintax
 from colorama import Fore, Style
 
 from GramAddict.core import storage
+from GramAddict.core.config import PerThread
 from GramAddict.core.device_facade import (
     DeviceFacade,
     Location,
@@ -22,6 +23,7 @@ from GramAddict.core.device_facade import (
 from GramAddict.core.report import print_scrape_report, print_short_report
 from GramAddict.core.resources import ClassName
 from GramAddict.core.resources import ResourceID as resources
+from GramAddict.core.screens import Screen, ScreenNavigator
 from GramAddict.core.session_state import SessionState
 from GramAddict.core.utils import (
     append_to_file,
@@ -42,14 +44,15 @@ from GramAddict.core.views import (
 
 logger = logging.getLogger(__name__)
 
+args = PerThread()
+configs = PerThread()
+ResourceID = PerThread()
+
 
 def load_config(config):
-    global args
-    global configs
-    global ResourceID
-    args = config.args
-    configs = config
-    ResourceID = resources(config.args.app_id)
+    args.bind(config.args)
+    configs.bind(config)
+    ResourceID.bind(resources(config.args.app_id))
 
 
 def interact_with_user(
@@ -328,10 +331,7 @@ def interact_with_user(
                     f"Could not {reason} media. Posts count: {profile_data.posts_count}."
                 )
             logger.info("Back to profile.")
-            while not post_grid_view._get_post_view().exists():
-                logger.debug("We are in the wrong place...")
-                device.back()
-            device.back()
+            ScreenNavigator(device).navigate_to(Screen.PROFILE)
 
     if pm_percentage != 0 and can_send_PM(session_state, pm_percentage):
         sent_pm = _send_PM(device, session_state, my_username, swipe_amount)
@@ -874,14 +874,7 @@ def _watch_stories(
                     logger.debug(
                         "Ignore this error! Stories ended while we were interacting with it."
                     )
-                for _ in range(4):
-                    if (
-                        story_view.getUsername().strip().casefold()
-                        == username.casefold()
-                    ):
-                        device.back()
-                    else:
-                        break
+                ScreenNavigator(device).navigate_to(Screen.PROFILE)
                 session_state.check_limit(
                     limit_type=session_state.Limit.WATCHES, output=True
                 )
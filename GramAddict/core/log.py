@@ -1,5 +1,6 @@
 import logging
 import os
+import threading
 from logging import LogRecord
 from logging.handlers import RotatingFileHandler
 from uuid import uuid4
@@ -35,6 +36,19 @@ class LoggerFilterGramAddictOnly(logging.Filter):
         return record.name.startswith("GramAddict")
 
 
+class LoggerFilterThread(logging.Filter):
+    def __init__(self, thread_id):
+        super().__init__()
+        self.thread_id = thread_id
+
+    def filter(self, record: LogRecord):
+        return record.thread == self.thread_id
+
+
+# log file of the account running in this thread (fleet mode)
+_thread_log = threading.local()
+
+
 def create_log_file_handler(filename):
     file_handler = RotatingFileHandler(
         filename,
@@ -55,7 +69,7 @@ def create_log_file_handler(filename):
     return file_handler
 
 
-def configure_logger(debug, username):
+def configure_logger(debug, username, thread_names=False):
     global g_session_id
     global g_log_file_name
     global g_logs_dir
@@ -84,7 +98,12 @@ def configure_logger(debug, username):
     console_handler.setLevel(console_level)
     console_handler.setFormatter(
         ColoredFormatter(
-            fmt="%(asctime)s %(levelname)8s | %(message)s", datefmt="[%m/%d %H:%M:%S]"
+            fmt=(
+                "%(asctime)s %(levelname)8s | %(threadName)s | %(message)s"
+                if thread_names
+                else "%(asctime)s %(levelname)8s | %(message)s"
+            ),
+            datefmt="[%m/%d %H:%M:%S]",
         )
     )
     console_handler.addFilter(LoggerFilterGramAddictOnly())
@@ -100,11 +119,33 @@ def configure_logger(debug, username):
     init_logger.debug(f"Initial log file: {g_logs_dir}/{g_log_file_name}")
 
 
+def configure_thread_logger(username):
+    """log file of an account running in a fleet worker, it gets only the records of this thread"""
+    log_file_name = f"{username}.log"
+    file_handler = create_log_file_handler(f"{g_logs_dir}/{log_file_name}")
+    file_handler.addFilter(LoggerFilterThread(threading.get_ident()))
+    logging.getLogger().addHandler(file_handler)
+    _thread_log.config = (log_file_name, g_logs_dir, file_handler, uuid4())
+
+
+def remove_thread_logger():
+    config = getattr(_thread_log, "config", None)
+    if config is not None:
+        logging.getLogger().removeHandler(config[2])
+        config[2].close()
+        del _thread_log.config
+
+
 def get_log_file_config():
+    config = getattr(_thread_log, "config", None)
+    if config is not None:
+        return config
     return g_log_file_name, g_logs_dir, g_file_handler, g_session_id
 
 
 def is_log_file_updated():
+    if getattr(_thread_log, "config", None) is not None:
+        return True
     return g_log_file_updated
 
 
@@ -0,0 +1,72 @@
+import re
+from enum import Enum, auto
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class MediaType(Enum):
+    PHOTO = auto()
+    VIDEO = auto()
+    REEL = auto()
+    IGTV = auto()
+    CAROUSEL = auto()
+    UNKNOWN = auto()
+
+
+# the first rule matching the content description wins,
+# what doesn't match any of them is a carousel
+MEDIA_TYPE_RULES: Tuple[Tuple["re.Pattern", MediaType], ...] = (
+    (re.compile(r"^,|^\s*$", re.IGNORECASE), MediaType.UNKNOWN),
+    (re.compile(r"^Photo|^Hidden Photo", re.IGNORECASE), MediaType.PHOTO),
+    (re.compile(r"^Video|^Hidden Video", re.IGNORECASE), MediaType.VIDEO),
+    (re.compile(r"^IGTV", re.IGNORECASE), MediaType.IGTV),
+    (re.compile(r"^Reel", re.IGNORECASE), MediaType.REEL),
+)
+_CAROUSEL_RE = re.compile(
+    r"((?P<photo>\d+) photo)|((?P<video>\d+) video)", re.IGNORECASE
+)
+
+# a post is classified again each time the bot looks at it
+CACHE_SIZE = 1024
+
+MediaInfo = Tuple[Optional[MediaType], Optional[int]]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def carousel_counts(content_desc: str) -> Tuple[int, int]:
+    """photos and videos of a carousel from its content description"""
+    n_photos = 0
+    n_videos = 0
+    for match in _CAROUSEL_RE.finditer(content_desc):
+        if match.group("photo"):
+            n_photos = int(match.group("photo"))
+        if match.group("video"):
+            n_videos = int(match.group("video"))
+    return n_photos, n_videos
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _classify(content_desc: str) -> Tuple[MediaType, int]:
+    for pattern, media_type in MEDIA_TYPE_RULES:
+        if pattern.match(content_desc):
+            return media_type, 1
+    return MediaType.CAROUSEL, sum(carousel_counts(content_desc))
+
+
+def classify_media(content_desc: Optional[str]) -> MediaInfo:
+    """media type and count of a post from its content description,
+    (None, None) when there's no description"""
+    if content_desc is None:
+        return None, None
+    return _classify(content_desc)
+
+
+def classify_medias(content_descs: Iterable[Optional[str]]) -> List[MediaInfo]:
+    """the same for many posts at once, like a whole profile grid"""
+    known: Dict[Optional[str], MediaInfo] = {}
+    result = []
+    for content_desc in content_descs:
+        if content_desc not in known:
+            known[content_desc] = classify_media(content_desc)
+        result.append(known[content_desc])
+    return result
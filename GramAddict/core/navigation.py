@@ -1,9 +1,17 @@
 import logging
+import re
 import sys
+from typing import Optional
+from urllib.parse import quote
 
+import emoji
 from colorama import Fore
 
+from GramAddict.core.config import PerThread
 from GramAddict.core.device_facade import Timeout
+from GramAddict.core.resources import ResourceID as resources
+from GramAddict.core.selectors import selectors
+from GramAddict.core.utils import open_instagram_with_url
 from GramAddict.core.views import (
     HashTagView,
     PlacesView,
@@ -15,6 +23,100 @@ from GramAddict.core.views import (
 
 logger = logging.getLogger(__name__)
 
+args = PerThread()
+
+DEEP_LINKS = {
+    "account": "https://www.instagram.com/{}/",
+    "hashtag": "https://www.instagram.com/explore/tags/{}/",
+    "place": "https://www.instagram.com/explore/locations/{}/",
+}
+# a place can be linked by its id only, e.g. 213385402 or 213385402/london-united-kingdom
+_PLACE_ID_RE = re.compile(r"^\d+(/[\w-]+)?/?$")
+
+
+def load_config(config):
+    args.bind(config.args)
+
+
+def _target_kind(job: str) -> str:
+    if "place" in job:
+        return "place"
+    if "hashtag" in job:
+        return "hashtag"
+    return "account"
+
+
+def _target_name(target: str) -> str:
+    return emoji.emojize(target, use_aliases=True).strip().lstrip("@#")
+
+
+def deep_link(target: str, job: str) -> Optional[str]:
+    """the link Instagram opens the target with, None when there's none"""
+    kind = _target_kind(job)
+    name = _target_name(target)
+    if kind == "place" and not _PLACE_ID_RE.match(name):
+        return None
+    return DEEP_LINKS[kind].format(quote(name.strip("/"), safe="/"))
+
+
+def _screen_title(device) -> Optional[str]:
+    title = device.find(selector=selectors(device.app_id).ACTION_BAR_TITLE)
+    if title.exists():
+        return title.get_text(error=False).strip()
+    return None
+
+
+def is_target_title(
+    title: Optional[str], title_before: Optional[str], name: str, kind: str
+) -> bool:
+    """whether the title of the screen is the one of the target: the screen
+    we left can look the same, e.g. the last profile opened with a link"""
+    if not title:
+        return False
+    if kind == "place":
+        # a place is linked by its id, its title is its name
+        slug = name.partition("/")[2].strip("/")
+        if slug:
+            return re.sub(r"\W+", "-", title.casefold()).strip("-") == slug.casefold()
+        return title != title_before
+    return title.lstrip("#").casefold() == name.casefold()
+
+
+def open_with_deep_link(device, target: str, job: str) -> bool:
+    """open the profile, hashtag or place with a view intent instead of typing
+    it in the search, False when it's off or didn't land where expected"""
+    if not args.deep_links:
+        return False
+    url = deep_link(target, job)
+    if url is None:
+        logger.debug(f"No link for {target}, using the search.")
+        return False
+    kind = _target_kind(job)
+    title_before = _screen_title(device)
+    if not open_instagram_with_url(url, package=device.app_id):
+        return False
+    device.notify_ui_changed()
+    if kind == "account":
+        landed = device.find(selector=selectors(device.app_id).POST_COUNT)
+    else:
+        landed = device.find(resourceIdMatches=resources(device.app_id).RECYCLER_VIEW)
+    if landed.exists(Timeout.MEDIUM) and is_target_title(
+        _screen_title(device), title_before, _target_name(target), kind
+    ):
+        logger.info(f"Opened {target} with a link.")
+        return True
+    logger.info(f"The link didn't open {target}, using the search.")
+    return False
+
+
+def nav_to_target(device, target: str, job: str) -> bool:
+    """open the profile, hashtag or place: with a link when possible,
+    through the search otherwise"""
+    if open_with_deep_link(device, target, job):
+        return True
+    search_view = TabBarView(device).navigateToSearch()
+    return search_view.navigate_to_target(target, job)
+
 
 def check_if_english(device):
     """check if app is in English"""
@@ -45,8 +147,7 @@ def nav_to_blogger(device, username, current_job):
             logger.info("Open your following.")
             profile_view.navigateToFollowing()
     else:
-        search_view = TabBarView(device).navigateToSearch()
-        if not search_view.navigate_to_target(username, current_job):
+        if not nav_to_target(device, username, current_job):
             return False
 
         profile_view = ProfileView(device, is_own_profile=False)
@@ -62,8 +163,7 @@ def nav_to_blogger(device, username, current_job):
 
 def nav_to_hashtag_or_place(device, target, current_job):
     """navigate to hashtag/place/feed list"""
-    search_view = TabBarView(device).navigateToSearch()
-    if not search_view.navigate_to_target(target, current_job):
+    if not nav_to_target(device, target, current_job):
         return False
 
     TargetView = HashTagView if current_job.startswith("hashtag") else PlacesView
@@ -99,8 +199,7 @@ def nav_to_post_likers(device, username, my_username):
     if username == my_username:
         TabBarView(device).navigateToProfile()
     else:
-        search_view = TabBarView(device).navigateToSearch()
-        if not search_view.navigate_to_target(username, "account"):
+        if not nav_to_target(device, username, "account"):
             return False
     profile_view = ProfileView(device)
     is_private = profile_view.isPrivateAccount()
@@ -16,6 +16,9 @@ class Plugin(object):
 
 
 class PluginLoader(object):
+    # plugin classes by package: discovered once per process, instantiated for every Config
+    discovered = {}
+
     def __init__(self, plugin_package, first_run):
         self.seen_paths = None
         self.plugins = None
@@ -26,11 +29,18 @@ class PluginLoader(object):
     def reload_plugins(self):
         self.plugins = []
         self.seen_paths = []
-        if self.output:
-            logger.info("Loading plugins . . .")
-        self.walk_package(self.plugin_package)
-
-    def walk_package(self, package):
+        if self.plugin_package not in PluginLoader.discovered:
+            if self.output:
+                logger.info("Loading plugins . . .")
+            classes = []
+            self.walk_package(self.plugin_package, classes)
+            PluginLoader.discovered[self.plugin_package] = classes
+            if self.output:
+                for c in classes:
+                    logger.info(f"  - {c.__name__}: {c.__doc__}")
+        self.plugins = [c() for c in PluginLoader.discovered[self.plugin_package]]
+
+    def walk_package(self, package, classes):
         imported_package = __import__(package, fromlist=["plugins"])
 
         for _, pluginname, ispkg in pkgutil.iter_modules(
@@ -41,6 +51,4 @@ class PluginLoader(object):
                 clsmembers = inspect.getmembers(plugin_module, inspect.isclass)
                 for _, c in clsmembers:
                     if issubclass(c, Plugin) & (c is not Plugin):
-                        if self.output:
-                            logger.info(f"  - {c.__name__}: {c.__doc__}")
-                        self.plugins.append(c())
+                        classes.append(c)
@@ -0,0 +1,161 @@
+import logging
+from enum import Enum, auto
+from functools import lru_cache
+from time import sleep
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from GramAddict.core.hierarchy import Hierarchy, Node
+from GramAddict.core.resources import ClassName
+from GramAddict.core.resources import ResourceID as resources
+from GramAddict.core.selectors import case_insensitive_re
+from GramAddict.core.utils import ActionBlockedError
+
+logger = logging.getLogger(__name__)
+
+
+class PopupAction(Enum):
+    CLICK = auto()
+    WAIT = auto()
+    RAISE = auto()
+
+
+class PopupRule(NamedTuple):
+    name: str
+    # all of them have to be on screen, resourceIdMatches are ResourceID names
+    when: Tuple[Dict[str, str], ...]
+    action: PopupAction
+    # ResourceID name of the button to click, the last view of `when` otherwise
+    button: Optional[str] = None
+    message: str = ""
+
+
+# the first rule matching the screen wins
+POPUP_RULES: Tuple[PopupRule, ...] = (
+    PopupRule(
+        "serious block",
+        (
+            {
+                "className": ClassName.IMAGE,
+                "textMatches": case_insensitive_re("Force reset password icon"),
+            },
+        ),
+        PopupAction.RAISE,
+        message="Serius block detected :(",
+    ),
+    PopupRule(
+        "post deleted dialog",
+        (
+            {"resourceIdMatches": "BLOCK_POPUP"},
+            {
+                "resourceIdMatches": "IGDS_HEADLINE_BODY",
+                "textMatches": r"(?is).+deleted.*",
+            },
+        ),
+        PopupAction.CLICK,
+        button="NEGATIVE_BUTTON",
+    ),
+    PopupRule(
+        "block dialog",
+        ({"resourceIdMatches": "BLOCK_POPUP"},),
+        PopupAction.RAISE,
+        message="Seems that action is blocked. Consider reinstalling Instagram app and be more careful with limits!",
+    ),
+    PopupRule(
+        "crash popup", ({"resourceIdMatches": "CRASH_POPUP"},), PopupAction.CLICK
+    ),
+    PopupRule(
+        "notification",
+        ({"resourceIdMatches": "NOTIFICATION_MESSAGE"},),
+        PopupAction.WAIT,
+    ),
+)
+
+# popups handled in a row before giving the screen as it is
+MAX_POPUPS = 3
+# how long a notification banner is left to go away, once per banner
+NOTIFICATION_WAIT = 10
+
+
+def _with_resource_ids(selector: Dict[str, str], resource_ids) -> Dict[str, str]:
+    if "resourceIdMatches" not in selector:
+        return selector
+    return {
+        **selector,
+        "resourceIdMatches": getattr(resource_ids, selector["resourceIdMatches"]),
+    }
+
+
+@lru_cache(maxsize=None)
+def popup_rules(app_id: str, block_detection: bool = True) -> Tuple[PopupRule, ...]:
+    """the rules for this app, without the blocks when their detection is disabled"""
+    resource_ids = resources(app_id)
+    return tuple(
+        rule._replace(
+            when=tuple(_with_resource_ids(s, resource_ids) for s in rule.when),
+            button=rule.button and getattr(resource_ids, rule.button),
+        )
+        for rule in POPUP_RULES
+        if block_detection or rule.action != PopupAction.RAISE
+    )
+
+
+def match_popup(
+    hierarchy: Hierarchy, rules: Tuple[PopupRule, ...]
+) -> Optional[Tuple[PopupRule, Node]]:
+    """the first rule matching the snapshot with the last view it found"""
+    for rule in rules:
+        node = None
+        for selector in rule.when:
+            node = hierarchy.find(**selector)
+            if node is None:
+                break
+        if node is not None:
+            return rule, node
+    return None
+
+
+class PopupWatcher:
+    """looks for popups and dialogs in every fresh dump instead of polling for
+    each of them after the actions: the harmless ones are dismissed, blocks
+    raise ActionBlockedError. It only runs on the bot thread, on the dumps the
+    bot takes itself."""
+
+    def __init__(self, app_id: str, block_detection: bool = True):
+        self.rules = popup_rules(app_id, block_detection)
+        # the text of the banner we waited for, it's left alone while it's there
+        self._waited_for: Optional[str] = None
+
+    def check(self, device, hierarchy: Hierarchy) -> bool:
+        """handle the first popup of the snapshot, returns whether the screen changed"""
+        found = match_popup(hierarchy, self.rules)
+        if found is None or found[0].action != PopupAction.WAIT:
+            self._waited_for = None
+        if found is None:
+            return False
+        rule, node = found
+        if rule.action == PopupAction.RAISE:
+            logger.error(f"Probably {rule.name} is shown.")
+            raise ActionBlockedError(rule.message)
+        if rule.action == PopupAction.WAIT:
+            if node.text == self._waited_for:
+                return False
+            self._waited_for = node.text
+            logger.warning(
+                f"There is a {rule.name} there! Please disable them in settings.. We will wait {NOTIFICATION_WAIT} seconds before continue.."
+            )
+            sleep(NOTIFICATION_WAIT)
+        else:
+            if node.text:
+                logger.info(node.text)
+            target = (
+                rule.button is not None
+                and hierarchy.find(resourceIdMatches=rule.button)
+            ) or node
+            logger.debug(f"Close the {rule.name}.")
+            bounds = target.bounds
+            device.deviceV2.click(
+                (bounds["left"] + bounds["right"]) // 2,
+                (bounds["top"] + bounds["bottom"]) // 2,
+            )
+        device.notify_ui_changed()
+        return True
@@ -0,0 +1,278 @@
+import logging
+import sys
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from uiautomator2 import ShellResponse, UiObjectNotFoundError
+from uiautomator2._selector import Selector, UiObject
+
+from GramAddict.core.hierarchy import Hierarchy
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayClock:
+    """time.sleep() returning at once: waits only move a virtual clock forward.
+    It replaces the sleep of the time module and of the GramAddict modules
+    which imported it, for the duration of the with block."""
+
+    def __init__(self):
+        self.slept = 0.0
+        self._patched: List[Tuple[object, Callable]] = []
+
+    def sleep(self, seconds: float):
+        self.slept += max(0.0, seconds)
+
+    def __enter__(self) -> "ReplayClock":
+        real_sleep = time.sleep
+        modules = [time] + [
+            module
+            for name, module in list(sys.modules.items())
+            if name.startswith("GramAddict") and module is not None
+        ]
+        for module in modules:
+            if getattr(module, "sleep", None) is real_sleep:
+                self._patched.append((module, real_sleep))
+                module.sleep = self.sleep
+        return self
+
+    def __exit__(self, *exc):
+        for module, real_sleep in self._patched:
+            module.sleep = real_sleep
+        self._patched = []
+
+
+class ReplayScreen:
+    """one recorded screen, e.g. the hierarchy.xml of a crash or of cmd_dump"""
+
+    def __init__(self, xml_dump: str, name: str = ""):
+        self.xml_dump = xml_dump
+        self.name = name
+        self.hierarchy = Hierarchy(xml_dump)
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayScreen":
+        with open(path, encoding="utf-8") as f:
+            return cls(f.read(), path)
+
+
+class _ReplayJsonRpc:
+    """the jsonrpc methods used by uiautomator2 UiObject, answered from the screen"""
+
+    def __init__(self, device: "ReplayDevice"):
+        self.device = device
+
+    def __getattr__(self, method):
+        handler = getattr(self.device, f"_rpc_{method}", None)
+        if handler is None:
+            if method.startswith(("scroll", "fling")):
+                return lambda *args, **kwargs: self.device.notify("swipe", method)
+            raise AttributeError(f"ReplayDevice doesn't answer {method}")
+
+        def call(*args, **kwargs):
+            kwargs.pop("http_timeout", None)
+            self.device.rpc_count += 1
+            return handler(*args, **kwargs)
+
+        return call
+
+
+class ReplayDevice:
+    """stands in for a uiautomator2 Device without a phone: selectors are answered
+    from recorded screens, and clicks, swipes and back presses move forward in the
+    screen sequence. Meant for tests and offline benchmarks of the view layer, e.g.
+
+        device = DeviceFacade(None, app_id, backend=ReplayDevice.from_files(paths))
+    """
+
+    # how long uiautomator2 waits for an element by default
+    wait_timeout = 20.0
+
+    def __init__(
+        self,
+        screens: Sequence[ReplayScreen],
+        advance_on: Sequence[str] = ("click", "swipe", "back"),
+        serial: str = "replay",
+    ):
+        if not screens:
+            raise ValueError("ReplayDevice needs at least one screen.")
+        self.screens = list(screens)
+        self.advance_on = set(advance_on)
+        self.serial = serial
+        self.position = 0
+        self.rpc_count = 0
+        self.events: List[Tuple[str, object]] = []
+        self.texts: Dict[int, str] = {}
+        self.jsonrpc = _ReplayJsonRpc(self)
+        self.toast = _ReplayToast()
+
+    @classmethod
+    def from_files(cls, paths: Sequence[str], **kwargs) -> "ReplayDevice":
+        return cls([ReplayScreen.load(path) for path in paths], **kwargs)
+
+    @property
+    def screen(self) -> ReplayScreen:
+        return self.screens[self.position]
+
+    @property
+    def hierarchy(self) -> Hierarchy:
+        return self.screen.hierarchy
+
+    def notify(self, event: str, detail=None):
+        """a gesture or a key press, the next screen shows up if the script says so"""
+        self.rpc_count += 1
+        self.events.append((event, detail))
+        if event in self.advance_on and self.position < len(self.screens) - 1:
+            self.position += 1
+            self.texts = {}
+            logger.debug(f"Replay: {event} -> {self.screen.name or self.position}")
+
+    def _nodes(self, selector):
+        return self.hierarchy.resolve(selector)
+
+    def _node(self, selector):
+        nodes = self._nodes(selector)
+        if not nodes:
+            raise UiObjectNotFoundError(
+                {"code": -32002, "data": str(selector), "method": "objInfo"}
+            )
+        return nodes[0]
+
+    # jsonrpc
+    def _rpc_objInfo(self, selector):
+        node = self._node(selector)
+        info = node.info
+        if node.order in self.texts:
+            info["text"] = self.texts[node.order]
+        return info
+
+    def _rpc_exist(self, selector):
+        return bool(self._nodes(selector))
+
+    def _rpc_count(self, selector):
+        return len(self._nodes(selector))
+
+    def _rpc_waitForExists(self, selector, timeout):
+        # nothing changes while waiting, the answer is the one of now
+        return bool(self._nodes(selector))
+
+    def _rpc_waitUntilGone(self, selector, timeout):
+        return not self._nodes(selector)
+
+    def _rpc_waitForIdle(self, timeout):
+        # a recorded screen is always idle
+        return None
+
+    def _rpc_getText(self, selector):
+        node = self._node(selector)
+        return self.texts.get(node.order, node.text)
+
+    def _rpc_setText(self, selector, text):
+        self.texts[self._node(selector).order] = text
+        self.events.append(("set_text", text))
+        return True
+
+    def _rpc_clearTextField(self, selector):
+        return self._rpc_setText(selector, "")
+
+    # uiautomator2.Device
+    def __call__(self, **kwargs) -> UiObject:
+        return UiObject(self, Selector(**kwargs))
+
+    @property
+    def info(self) -> dict:
+        self.rpc_count += 1
+        root = self.hierarchy.roots[0].bounds if self.hierarchy.roots else {}
+        width, height = root.get("right", 1080), root.get("bottom", 2340)
+        return {
+            "currentPackageName": self.hierarchy.package,
+            "displayHeight": height,
+            "displayRotation": self.hierarchy.rotation,
+            "displaySizeDpX": round(width / 2.625),
+            "displaySizeDpY": round(height / 2.625),
+            "displayWidth": width,
+            "productName": "replay",
+            "screenOn": True,
+            "sdkInt": 30,
+            "naturalOrientation": True,
+        }
+
+    def window_size(self) -> Tuple[int, int]:
+        info = self.info
+        return info["displayWidth"], info["displayHeight"]
+
+    def _get_orientation(self) -> int:
+        self.rpc_count += 1
+        return self.hierarchy.rotation
+
+    def _is_alive(self) -> bool:
+        return True
+
+    def dump_hierarchy(self, compressed=False, pretty=False) -> str:
+        self.rpc_count += 1
+        return self.screen.xml_dump
+
+    def app_current(self) -> dict:
+        self.rpc_count += 1
+        return {"package": self.hierarchy.package, "activity": ""}
+
+    def app_start(self, package_name, *args, **kwargs):
+        self.notify("app_start", package_name)
+
+    def app_stop(self, package_name):
+        self.notify("app_stop", package_name)
+
+    def app_stop_all(self, excludes=[]):
+        self.notify("app_stop_all", excludes)
+
+    def app_list_running(self) -> List[str]:
+        return [self.hierarchy.package]
+
+    def click(self, x, y):
+        self.notify("click", (x, y))
+
+    def double_click(self, x, y, duration=0.1):
+        self.notify("click", (x, y))
+
+    def long_click(self, x, y, duration: float = 0.5):
+        self.notify("click", (x, y))
+
+    def press(self, key, meta=None):
+        self.notify("back" if key == "back" else "press", key)
+
+    def swipe(self, fx, fy, tx, ty, duration=None, steps=None):
+        self.notify("swipe", (fx, fy, tx, ty))
+
+    def swipe_ext(self, direction, scale=0.9, box=None):
+        self.notify("swipe", direction)
+
+    def swipe_points(self, points, duration: float = 0.5):
+        self.notify("swipe", points)
+
+    def screen_off(self):
+        self.notify("press", "power")
+
+    def screenshot(self, filename=None, format="pillow"):
+        return None
+
+    def shell(self, cmdargs, stream=False, timeout=60):
+        self.rpc_count += 1
+        self.events.append(("shell", cmdargs))
+        return ShellResponse("", 0)
+
+    def clear_text(self):
+        self.events.append(("clear_text", None))
+
+    def send_keys(self, text: str, clear: bool = False):
+        self.events.append(("send_keys", text))
+
+    def set_fastinput_ime(self, enable: bool = True):
+        pass
+
+
+class _ReplayToast:
+    def get_message(self, wait_timeout=10, cache_timeout=10, default=None):
+        return default
+
+    def show(self, text, duration=1.0):
+        pass
@@ -195,6 +195,49 @@ def print_scrape_report(source, session_state):
     )
 
 
+def print_fleet_report(accounts):
+    logger.info(
+        "FLEET SUMMARY",
+        extra={"color": f"{Style.BRIGHT}{Fore.YELLOW}"},
+    )
+    total_interactions = total_followed = total_likes = total_unfollowed = 0
+    for account in accounts:
+        sessions = account.sessions
+        interactions = sum(sum(s.successfulInteractions.values()) for s in sessions)
+        followed = sum(sum(s.totalFollowed.values()) for s in sessions)
+        likes = sum(s.totalLikes for s in sessions)
+        unfollowed = sum(s.totalUnfollowed for s in sessions)
+        crashes = sum(s.totalCrashes for s in sessions)
+        total_interactions += interactions
+        total_followed += followed
+        total_likes += likes
+        total_unfollowed += unfollowed
+        duration = (
+            str(account.finish_time - account.start_time).split(".")[0]
+            if account.start_time and account.finish_time
+            else "-"
+        )
+        logger.info(
+            f"@{account.username} on {account.device_id}: {len(sessions)} session(s) in {duration}, {interactions} successful interaction(s), {followed} followed, {likes} likes, {unfollowed} unfollowed, {crashes} crash(es){'. ' + account.error if account.error else '.'}",
+            extra={
+                "color": f"{Style.BRIGHT}{Fore.RED if account.error else Fore.YELLOW}"
+            },
+        )
+    logger.info(
+        f"Fleet total: {len(accounts)} account(s), {total_interactions} successful interaction(s), {total_followed} followed, {total_likes} likes, {total_unfollowed} unfollowed.",
+        extra={"color": f"{Style.BRIGHT}{Fore.YELLOW}"},
+    )
+
+
+def print_rpc_stats(rpc_stats):
+    logger.info(
+        "RPC LATENCY",
+        extra={"color": f"{Style.BRIGHT}{Fore.YELLOW}"},
+    )
+    for line in rpc_stats.table():
+        logger.info(line, extra={"color": f"{Fore.YELLOW}"})
+
+
 def _stringify_interactions(interactions):
     if len(interactions) == 0:
         return "0"
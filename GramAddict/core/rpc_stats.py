@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+import sys
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+from atomicwrites import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# frames of these files are plumbing, the call site is the first frame outside them
+_PLUMBING = ("device_facade.py", "rpc_stats.py")
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class HdrHistogram:
+    """latencies in microseconds, bucketed with a fixed relative precision
+    like HdrHistogram does: memory depends on the range, not on the samples"""
+
+    # 2^SUB_BUCKET_BITS buckets per power of two, ~3% of precision
+    SUB_BUCKET_BITS = 5
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def add(self, latency: float):
+        us = int(latency * 1_000_000)
+        shift = max(0, us.bit_length() - self.SUB_BUCKET_BITS - 1)
+        bucket = us >> shift << shift
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        if self.count == 0 or us < self.min:
+            self.min = us
+        if us > self.max:
+            self.max = us
+        self.count += 1
+        self.total += us
+
+    def merge(self, other: "HdrHistogram"):
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        if other.count:
+            self.min = other.min if self.count == 0 else min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, q: float) -> float:
+        """in seconds"""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, round(q * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(bucket, self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count / 1_000_000 if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_s": round(self.total / 1_000_000, 3),
+            "mean_ms": round(self.mean * 1000, 1),
+            "min_ms": round(self.min / 1000, 1),
+            "p50_ms": round(self.percentile(0.5) * 1000, 1),
+            "p90_ms": round(self.percentile(0.9) * 1000, 1),
+            "p99_ms": round(self.percentile(0.99) * 1000, 1),
+            "max_ms": round(self.max / 1000, 1),
+        }
+
+
+class RpcStats:
+    """latency of every uiautomator2 call of a device, grouped by job,
+    call site (e.g. ProfileView.getFollowersCount) and RPC"""
+
+    IDLE_JOB = "session"
+    TOP_CALL_SITES = 5
+
+    def __init__(self):
+        self._sites: Dict[object, str] = {}
+        self._in_rpc = False
+        self.reset()
+
+    def reset(self):
+        self.job = self.IDLE_JOB
+        self.histograms: Dict[str, Dict[Tuple[str, str], HdrHistogram]] = {}
+        self.job_time: Dict[str, float] = {}
+        self._job_start = perf_counter()
+
+    def install(self, device_v2):
+        """time the calls of a uiautomator2 device: every jsonrpc method, and the
+        other requests to atx-agent (shell, screenshot, ...)"""
+        jsonrpc_call = device_v2._jsonrpc_call
+        http = device_v2.http
+        request = http.request
+
+        def timed_jsonrpc_call(method, *args, **kwargs):
+            return self._timed(method, jsonrpc_call, method, *args, **kwargs)
+
+        def timed_request(method, url, *args, **kwargs):
+            if self._in_rpc:
+                return request(method, url, *args, **kwargs)
+            return self._timed(f"{method} {url}", request, method, url, *args, **kwargs)
+
+        device_v2._jsonrpc_call = timed_jsonrpc_call
+        http.request = timed_request
+
+    def _timed(self, rpc, func, *args, **kwargs):
+        self._in_rpc = True
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.record(rpc, perf_counter() - start)
+            self._in_rpc = False
+
+    def record(self, rpc: str, latency: float, call_site: Optional[str] = None):
+        key = (call_site or self.call_site(), rpc)
+        histograms = self.histograms.setdefault(self.job, {})
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = HdrHistogram()
+        histogram.add(latency)
+
+    def call_site(self) -> str:
+        frame = sys._getframe(1)
+        while frame is not None:
+            code = frame.f_code
+            site = self._sites.get(code)
+            if site is None:
+                site = self._sites[code] = self._describe(frame)
+            if site:
+                return site
+            frame = frame.f_back
+        return "<unknown>"
+
+    @staticmethod
+    def _describe(frame) -> str:
+        """empty for plumbing frames, cached per code object"""
+        code = frame.f_code
+        filename = code.co_filename
+        if (
+            not filename.startswith(_PACKAGE_DIR)
+            or os.path.basename(filename) in _PLUMBING
+        ):
+            return ""
+        name = getattr(code, "co_qualname", None)
+        if name is None:
+            instance = frame.f_locals.get("self")
+            name = (
+                code.co_name
+                if instance is None
+                else f"{type(instance).__name__}.{code.co_name}"
+            )
+        return name
+
+    def set_job(self, job: Optional[str]):
+        """RPCs are accounted to this job until the next call, None for the session"""
+        now = perf_counter()
+        self.job_time[self.job] = self.job_time.get(self.job, 0.0) + (
+            now - self._job_start
+        )
+        self.job = job or self.IDLE_JOB
+        self._job_start = now
+
+    def job_summary(self, job: str) -> HdrHistogram:
+        total = HdrHistogram()
+        for histogram in self.histograms.get(job, {}).values():
+            total.merge(histogram)
+        return total
+
+    def table(self) -> List[str]:
+        self.set_job(self.job)
+        lines = []
+        for job, histograms in self.histograms.items():
+            summary = self.job_summary(job)
+            wall_time = self.job_time.get(job, 0.0)
+            share = summary.total / 1_000_000 / wall_time * 100 if wall_time else 0
+            lines.append(
+                f"{job}: {summary.count} RPC(s), {summary.total / 1_000_000:.1f}s of {wall_time:.1f}s ({share:.0f}%), p50 {summary.percentile(0.5) * 1000:.0f}ms, p99 {summary.percentile(0.99) * 1000:.0f}ms"
+            )
+            slowest = sorted(
+                histograms.items(), key=lambda item: item[1].total, reverse=True
+            )
+            for (site, rpc), histogram in slowest[: self.TOP_CALL_SITES]:
+                lines.append(
+                    f"    {site} -> {rpc}: {histogram.count}x, {histogram.total / 1_000_000:.1f}s, p50 {histogram.percentile(0.5) * 1000:.0f}ms, max {histogram.max / 1000:.0f}ms"
+                )
+        return lines
+
+    def to_dict(self) -> dict:
+        self.set_job(self.job)
+        return {
+            job: {
+                "wall_time_s": round(self.job_time.get(job, 0.0), 3),
+                "rpc": self.job_summary(job).to_dict(),
+                "call_sites": [
+                    {"call_site": site, "rpc": rpc, **histogram.to_dict()}
+                    for (site, rpc), histogram in histograms.items()
+                ],
+            }
+            for job, histograms in self.histograms.items()
+        }
+
+    def dump(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with atomic_write(path, overwrite=True, encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=4)
@@ -0,0 +1,254 @@
+import atexit
+import base64
+import gzip
+import json
+import logging
+import os
+import random
+import shutil
+import threading
+from datetime import datetime
+from functools import partial
+from time import perf_counter
+from typing import List, Optional
+
+import requests
+import uiautomator2
+
+from GramAddict.core.adb import AdbClient, AdbError, set_adb
+
+logger = logging.getLogger(__name__)
+
+TRACES_DIR = "traces"
+TRACE_VERSION = 1
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _normalize(value):
+    """what the value looks like once written in the trace"""
+    return json.loads(json.dumps(value, default=str))
+
+
+class TraceMismatch(Exception):
+    pass
+
+
+class TraceRecorder:
+    """writes every uiautomator2 call of a device, with its arguments, answer and
+    timing, one JSON per line. The random seed is in the header, so that a replay
+    takes the same decisions."""
+
+    def __init__(self, path: str, serial: str, seed: Optional[int] = None):
+        self.path = path
+        self.seed = random.randrange(2**32) if seed is None else seed
+        random.seed(self.seed)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = _open(path, "w")
+        self._lock = threading.Lock()
+        self._in_rpc = False
+        self._start = perf_counter()
+        self.calls = 0
+        self._write(
+            {
+                "trace": TRACE_VERSION,
+                "serial": serial,
+                "seed": self.seed,
+                "started": datetime.now().isoformat(),
+            }
+        )
+        logger.info(f"Recording the device calls in {path}.")
+        atexit.register(self.close)
+
+    @classmethod
+    def for_device(cls, serial: str) -> "TraceRecorder":
+        name = f"{serial}_{datetime.now():%Y-%m-%d-%H-%M-%S}.jsonl.gz".replace(":", "-")
+        return cls(os.path.join(TRACES_DIR, name), serial)
+
+    def _write(self, record: dict):
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps(record, default=str) + "\n")
+
+    def install(self, device_v2):
+        jsonrpc_call = device_v2._jsonrpc_call
+        http = device_v2.http
+        request = http.request
+
+        def traced_jsonrpc_call(method, params=[], http_timeout=60):
+            record = {"k": "rpc", "m": method, "p": params}
+            return self._traced(record, jsonrpc_call, method, params, http_timeout)
+
+        def traced_request(method, url, **kwargs):
+            if self._in_rpc:
+                return request(method, url, **kwargs)
+            record = {"k": "http", "m": f"{method} {url}", "d": kwargs.get("data")}
+            return self._traced(record, request, method, url, **kwargs)
+
+        device_v2._jsonrpc_call = traced_jsonrpc_call
+        http.request = traced_request
+
+    def install_adb(self, client: AdbClient):
+        """the shell commands sent through the adb server, not uiautomator2"""
+        # the method of the class, in case the client was traced before
+        shell = partial(type(client).shell, client)
+
+        def traced_shell(cmd):
+            record = {"k": "adb", "m": "shell", "a": client.serial, "p": cmd}
+            return self._traced(record, shell, cmd)
+
+        client.shell = traced_shell
+
+    def _traced(self, record, func, *args, **kwargs):
+        self._in_rpc = True
+        start = perf_counter()
+        record["t"] = round(start - self._start, 3)
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            record["e"] = {"type": type(e).__name__, "args": list(e.args)}
+            raise
+        else:
+            if isinstance(result, requests.Response):
+                record["s"] = result.status_code
+                record["b64"] = base64.b64encode(result.content).decode()
+            else:
+                record["r"] = result
+            return result
+        finally:
+            self._in_rpc = False
+            record["ms"] = round((perf_counter() - start) * 1000, 1)
+            self.calls += 1
+            self._write(record)
+
+    def checkpoint(self):
+        """end the gzip member written so far and go on in a new one: the file
+        on disk is then a complete trace, while the recording goes on"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = _open(self.path, "a")
+
+    def save_copy(self, directory: str):
+        self.checkpoint()
+        shutil.copy(self.path, directory)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class TraceReplayer:
+    """answers the calls with the ones of a trace, in order. When the bot asks
+    something else than what comes next, the next calls of the same kind are
+    looked for a little further before giving up."""
+
+    LOOKAHEAD = 50
+
+    def __init__(self, path: str):
+        with _open(path, "r") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        if not lines or lines[0].get("trace") != TRACE_VERSION:
+            raise TraceMismatch(f"{path} is not a trace of this version.")
+        self.header = lines[0]
+        self.records: List[dict] = lines[1:]
+        self.position = 0
+        self.skipped = 0
+        self.replayed = 0
+        self.recorded_ms = 0.0
+
+    def _next(self, kind: str, method: str, key: str, value) -> dict:
+        window = self.records[self.position : self.position + self.LOOKAHEAD]
+        same_kind = [
+            index
+            for index, record in enumerate(window)
+            if record["k"] == kind and record["m"] == method
+        ]
+        exact = [index for index in same_kind if window[index].get(key) == value]
+        found = exact or same_kind
+        if not found:
+            raise TraceMismatch(
+                f"No {method} left in the trace after call #{self.position}."
+            )
+        index = found[0]
+        self.skipped += index
+        self.position += index + 1
+        self.replayed += 1
+        record = window[index]
+        self.recorded_ms += record.get("ms", 0.0)
+        return record
+
+    @staticmethod
+    def _raise(error: dict):
+        cls = getattr(uiautomator2, error["type"], None)
+        if not (isinstance(cls, type) and issubclass(cls, Exception)):
+            cls = uiautomator2.JSONRPCError
+        raise cls(*error["args"])
+
+    def jsonrpc_call(self, method, params=[], http_timeout=60):
+        record = self._next("rpc", method, "p", _normalize(params))
+        if "e" in record:
+            self._raise(record["e"])
+        return record.get("r")
+
+    def request(self, method, url, **kwargs) -> requests.Response:
+        record = self._next(
+            "http", f"{method} {url}", "d", _normalize(kwargs.get("data"))
+        )
+        if "e" in record:
+            raise requests.ConnectionError(*record["e"]["args"])
+        response = requests.Response()
+        response.status_code = record["s"]
+        response._content = base64.b64decode(record["b64"])
+        response.url = url
+        return response
+
+
+class _TraceAdb:
+    """answers the adb shell commands of one serial from the trace"""
+
+    def __init__(self, replayer: TraceReplayer, serial: Optional[str]):
+        self.replayer = replayer
+        self.serial = serial
+
+    def shell(self, cmd: str) -> str:
+        record = self.replayer._next("adb", "shell", "p", cmd)
+        if "e" in record:
+            raise AdbError(*record["e"]["args"])
+        return record.get("r")
+
+
+class _TraceSession(requests.Session):
+    def __init__(self, replayer: TraceReplayer):
+        super().__init__()
+        self.replayer = replayer
+
+    def request(self, method, url, **kwargs):
+        return self.replayer.request(method, url, **kwargs)
+
+
+def open_trace(path: str) -> uiautomator2.Device:
+    """a uiautomator2 Device fed by a recorded trace instead of a phone,
+    to be given to DeviceFacade(backend=...). The adb shell commands are
+    answered from the trace too, see get_adb()"""
+    replayer = TraceReplayer(path)
+    device = uiautomator2.Device("http://trace-replay")
+    device.serial = replayer.header["serial"]
+    device.http = _TraceSession(replayer)
+    device._jsonrpc_call = replayer.jsonrpc_call
+    # nothing to restart offline
+    device.reset_uiautomator = lambda *args, **kwargs: None
+    device.replayer = replayer
+    adb_serials = {
+        record.get("a") for record in replayer.records if record["k"] == "adb"
+    }
+    for serial in adb_serials | {device.serial}:
+        set_adb(serial, _TraceAdb(replayer, serial))
+    random.seed(replayer.header["seed"])
+    return device
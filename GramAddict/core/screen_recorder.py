@@ -0,0 +1,141 @@
+import logging
+import re
+import threading
+from collections import deque
+from io import BytesIO
+from time import perf_counter
+from typing import Deque, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CrashRecorder:
+    """keeps the last seconds of the screen in memory, as the JPEG frames minicap
+    sends them, so that they can be turned into a video when the bot crashes.
+    Frames are decoded only then, and the ring never takes more than max_bytes."""
+
+    def __init__(self, device_v2, fps=20, seconds=30, max_bytes=50 * 1024 * 1024):
+        self.device_v2 = device_v2
+        self.fps = fps
+        self.seconds = seconds
+        self.max_bytes = max_bytes
+        self.frames: Deque[Tuple[float, bytes]] = deque()
+        self.size = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._ws = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        # websocket-client comes with uiautomator2[image], like imageio
+        from websocket import create_connection
+
+        ws_url = re.sub("^http", "ws", self.device_v2.path2url("/minicap"))
+        self._ws = create_connection(ws_url)
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._ws,), name="crash-recorder", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, ws):
+        try:
+            while not self._stop_event.is_set():
+                message = ws.recv()
+                if isinstance(message, bytes):
+                    self.add_frame(message)
+        except Exception as e:
+            if not self._stop_event.is_set():
+                logger.debug(f"Screen recording interrupted: {e}")
+        finally:
+            ws.close()
+
+    def add_frame(self, jpeg: bytes, timestamp: float = None):
+        now = perf_counter() if timestamp is None else timestamp
+        with self._lock:
+            self.frames.append((now, jpeg))
+            self.size += len(jpeg)
+            while self.frames and (
+                self.size > self.max_bytes or now - self.frames[0][0] > self.seconds
+            ):
+                _, dropped = self.frames.popleft()
+                self.size -= len(dropped)
+
+    def stop(self):
+        self._stop_event.set()
+        if self._ws is not None:
+            # unblocks recv() when the screen doesn't change
+            self._ws.close()
+            self._ws = None
+        if self._thread is not None:
+            self._thread.join(5.0)
+            self._thread = None
+
+    def clear(self):
+        with self._lock:
+            self.frames.clear()
+            self.size = 0
+
+    def paced_frames(self):
+        """the frames of the ring at a constant fps, repeating a frame while the
+        screen didn't send a new one, like uiautomator2 screenrecord does"""
+        with self._lock:
+            frames = list(self.frames)
+        if not frames:
+            return []
+        start = frames[0][0]
+        paced = []
+        for index, (timestamp, jpeg) in enumerate(frames):
+            end = (
+                frames[index + 1][0]
+                if index + 1 < len(frames)
+                else timestamp + 1 / self.fps
+            )
+            repeats = int((end - start) * self.fps) - len(paced)
+            paced.extend([jpeg] * max(0, repeats))
+        return paced
+
+    def save(self, path: str) -> bool:
+        """write the ring as a video, returns False when there's nothing to save"""
+        import imageio
+        import numpy as np
+        from PIL import Image
+
+        frames = self.paced_frames()
+        if not frames:
+            return False
+        size = None
+        last_jpeg = image = None
+        with imageio.get_writer(path, fps=self.fps) as writer:
+            for jpeg in frames:
+                # repeated frames are the same object, decode them once
+                if jpeg is not last_jpeg:
+                    last_jpeg = jpeg
+                    frame = Image.open(BytesIO(jpeg)).convert("RGB")
+                    if size is None:
+                        size = frame.size
+                    elif frame.size != size:
+                        frame = _fit(frame, size)
+                    image = np.asarray(frame)
+                writer.append_data(image)
+        return True
+
+
+def _fit(image, size):
+    """scale the frame into size keeping its ratio, e.g. after a rotation"""
+    from PIL import Image
+
+    width, height = size
+    ratio = min(width / image.width, height / image.height)
+    scaled = image.resize(
+        (max(1, int(image.width * ratio)), max(1, int(image.height * ratio)))
+    )
+    canvas = Image.new("RGB", size)
+    canvas.paste(scaled, ((width - scaled.width) // 2, (height - scaled.height) // 2))
+    return canvas
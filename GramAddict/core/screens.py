@@ -0,0 +1,127 @@
+import logging
+from enum import Enum, auto
+from functools import lru_cache
+from time import sleep
+from typing import FrozenSet, Tuple
+
+from GramAddict.core.device_facade import DeviceFacade
+from GramAddict.core.hierarchy import Hierarchy
+from GramAddict.core.resources import ResourceID as resources
+from GramAddict.core.selectors import selectors
+from GramAddict.core.views import UniversalActions
+
+logger = logging.getLogger(__name__)
+
+
+class Screen(Enum):
+    BLOCK_POPUP = auto()
+    DIALOG = auto()
+    STORY = auto()
+    FOLLOW_LIST = auto()
+    LIKERS = auto()
+    SEARCH = auto()
+    PROFILE = auto()
+    POST = auto()
+    FEED = auto()
+    UNKNOWN = auto()
+
+
+# the first signature whose resource-ids are all on screen wins: what is drawn
+# over the others comes first. An opened post, or a hashtag/place list of posts,
+# is a feed with a back button.
+SCREEN_SIGNATURES: Tuple[Tuple[Screen, Tuple[str, ...]], ...] = (
+    (Screen.BLOCK_POPUP, ("DIALOG_CONTAINER",)),
+    (Screen.BLOCK_POPUP, ("DIALOG_ROOT_VIEW",)),
+    (Screen.DIALOG, ("BOTTOM_SHEET_CONTAINER_VIEW",)),
+    (Screen.DIALOG, ("AERR_CLOSE",)),
+    (Screen.STORY, ("REEL_VIEWER_MEDIA_CONTAINER",)),
+    (Screen.FOLLOW_LIST, ("UNIFIED_FOLLOW_LIST_TAB_LAYOUT",)),
+    (Screen.FOLLOW_LIST, ("FOLLOW_LIST_CONTAINER",)),
+    (Screen.LIKERS, ("ROW_USER_CONTAINER_BASE",)),
+    (Screen.SEARCH, ("ACTION_BAR_SEARCH_EDIT_TEXT",)),
+    (Screen.PROFILE, ("ROW_PROFILE_HEADER_TEXTVIEW_POST_COUNT",)),
+    (Screen.PROFILE, ("PROFILE_TABS_CONTAINER",)),
+    (Screen.POST, ("ACTION_BAR_BUTTON_BACK", "ROW_FEED_PHOTO_PROFILE_NAME")),
+    (Screen.FEED, ("ROW_FEED_PHOTO_PROFILE_NAME",)),
+)
+
+# back presses and taps navigate_to() does before giving up
+MAX_STEPS = 5
+# a back press closes them and shows what was below
+CLOSED_BY_BACK = frozenset(
+    (Screen.POST, Screen.STORY, Screen.DIALOG, Screen.BLOCK_POPUP)
+)
+# an UNKNOWN screen is often one in the middle of a transition
+SETTLE_TIME = 0.5
+
+
+@lru_cache(maxsize=None)
+def screen_signatures(app_id: str) -> Tuple[Tuple[Screen, FrozenSet[str]], ...]:
+    resource_ids = resources(app_id)
+    return tuple(
+        (screen, frozenset(getattr(resource_ids, name) for name in names))
+        for screen, names in SCREEN_SIGNATURES
+    )
+
+
+def classify_screen(hierarchy: Hierarchy, app_id: str) -> Screen:
+    """what the snapshot shows, from the resource-ids on screen only"""
+    on_screen = hierarchy.by_resource_id
+    for screen, resource_ids in screen_signatures(app_id):
+        if all(resource_id in on_screen for resource_id in resource_ids):
+            return screen
+    return Screen.UNKNOWN
+
+
+class ScreenNavigator:
+    """finds out where we are from one dump and goes where we want with as few
+    back presses and taps as it takes, looking at the screen after each of them"""
+
+    def __init__(self, device: DeviceFacade):
+        self.device = device
+        self.selectors = selectors(device.app_id)
+        # the screens a tap on the tab bar leads to
+        self.tabs = {
+            Screen.FEED: self.selectors.TAB_HOME,
+            Screen.SEARCH: self.selectors.TAB_SEARCH,
+        }
+
+    def current(self) -> Screen:
+        return classify_screen(self.device.get_snapshot(), self.device.app_id)
+
+    def _has_tab_bar(self) -> bool:
+        tab_bar = self.selectors.TAB_BAR
+        return bool(self.device.get_snapshot().resolve(tab_bar.kwargs, key=tab_bar.key))
+
+    def navigate_to(self, target: Screen, max_steps: int = MAX_STEPS) -> bool:
+        """a block popup raises ActionBlockedError (see detect_block),
+        returns whether we got there. Back is pressed only from the screens
+        which sit above the others, never from one we don't know."""
+        for _ in range(max_steps):
+            screen = self.current()
+            if screen == target:
+                return True
+            if screen == Screen.BLOCK_POPUP:
+                UniversalActions.detect_block(self.device)
+                if self.current() != Screen.BLOCK_POPUP:
+                    continue
+            elif target in self.tabs and self._has_tab_bar():
+                logger.debug(f"On {screen.name}, tap on the tab of {target.name}.")
+                self.device.find(selector=self.tabs[target]).click()
+                continue
+            if screen == Screen.UNKNOWN:
+                logger.debug("Unknown screen, let it settle and look again.")
+                sleep(SETTLE_TIME)
+                self.device.get_snapshot(refresh=True)
+                continue
+            if screen not in CLOSED_BY_BACK:
+                logger.warning(
+                    f"On {screen.name} instead of {target.name}, don't know how to go back."
+                )
+                return False
+            logger.debug(f"On {screen.name} instead of {target.name}, press back.")
+            self.device.back()
+        if self.current() == target:
+            return True
+        logger.warning(f"Can't go back to {target.name} in {max_steps} steps.")
+        return False
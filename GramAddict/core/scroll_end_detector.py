@@ -6,25 +6,41 @@ logger = logging.getLogger(__name__)
 
 
 class ScrollEndDetector:
-    # Specify how many times we'll have to iterate over same users to decide that it's the end of the list
-    repeats_to_end = 0
-    skipped_all = 0
-    skipped_all_fling = 0
-    pages = []
+    """tells when scrolling a list doesn't bring new users anymore.
+    Each page is kept as a hash of its usernames, and only the previous page
+    is remembered together with how many times it has been repeated in a row."""
+
+    _EMPTY_PAGE = hash(())
 
     def __init__(
         self, repeats_to_end=5, skipped_list_limit=999, skipped_fling_limit=999
     ):
+        # Specify how many times we'll have to iterate over same users to decide that it's the end of the list
         self.repeats_to_end = repeats_to_end
         self.skipped_list_limit = skipped_list_limit
         self.skipped_fling_limit = skipped_fling_limit
+        self.skipped_all = 0
+        self.skipped_all_fling = 0
+        self.pages = 0
+        self._page_hash = self._EMPTY_PAGE
+        self._previous_hash = None
+        self._previous_repeats = 0
+
+    def _repeats(self) -> int:
+        """how many pages in a row ended with the same users of the current one"""
+        if self._page_hash == self._previous_hash:
+            return self._previous_repeats + 1
+        return 1
 
     def notify_new_page(self):
-        self.pages.append([])
+        if self.pages:
+            self._previous_repeats = self._repeats()
+            self._previous_hash = self._page_hash
+        self._page_hash = self._EMPTY_PAGE
+        self.pages += 1
 
     def notify_username_iterated(self, username):
-        last_page = self.pages[-1]
-        last_page.append(username)
+        self._page_hash = hash((self._page_hash, username))
 
     def reset_skipped_all(self):
         self.skipped_all = 0
@@ -50,18 +66,11 @@ class ScrollEndDetector:
             return True
 
     def is_the_end(self):
-        if len(self.pages) < 2:
+        if self.pages < 2:
             return False
 
-        is_the_end = True
-        last_page = self.pages[-1]
-        repeats = 1
-        for i in range(2, min(self.repeats_to_end + 1, len(self.pages) + 1)):
-            page = self.pages[-i]
-            if page != last_page:
-                is_the_end = False
-                break
-            repeats += 1
+        repeats = min(self._repeats(), self.repeats_to_end, self.pages)
+        is_the_end = repeats >= min(self.repeats_to_end, self.pages)
 
         if is_the_end:
             logger.info(
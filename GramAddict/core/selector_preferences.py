@@ -0,0 +1,80 @@
+import json
+import logging
+import os
+from typing import Callable, Dict, List, Optional
+
+from atomicwrites import atomic_write
+
+logger = logging.getLogger(__name__)
+
+PREFERENCES_DIR = "devices"
+
+
+class SelectorPreferences:
+    """When an element can be found in several ways depending on the Instagram
+    build, remembers which one matched last on this device and version so that
+    it's tried first next time, instead of waiting for the others to miss."""
+
+    def __init__(self, serial: str, ig_version: str):
+        self.path = os.path.join(PREFERENCES_DIR, f"{serial}", "selectors.json")
+        self.ig_version = ig_version
+        # {IG version: {element: alternative}}
+        self.versions: Dict[str, Dict[str, str]] = {}
+        self.load()
+
+    @property
+    def preferred(self) -> Dict[str, str]:
+        return self.versions.setdefault(self.ig_version, {})
+
+    def order(self, name: str, alternatives: List[str]) -> List[str]:
+        preferred = self.preferred.get(name)
+        if preferred not in alternatives:
+            return list(alternatives)
+        return [preferred] + [alt for alt in alternatives if alt != preferred]
+
+    def record(self, name: str, alternative: str):
+        if self.preferred.get(name) != alternative:
+            logger.debug(f"{name} is found with {alternative} on IG {self.ig_version}.")
+            self.preferred[name] = alternative
+
+    def first(self, name: str, alternatives: Dict[str, Callable[[], object]]):
+        """the result of the first alternative giving one, None if none does"""
+        for alternative in self.order(name, list(alternatives)):
+            result = alternatives[alternative]()
+            if result:
+                self.record(name, alternative)
+                return result
+        return None
+
+    def load(self):
+        if not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.versions = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Can't load selector preferences from {self.path}: {e}")
+            return
+        logger.debug(
+            f"Loaded the preferred selectors of {len(self.preferred)} element(s) for IG {self.ig_version}."
+        )
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with atomic_write(self.path, overwrite=True, encoding="utf-8") as f:
+            json.dump(self.versions, f, indent=2, sort_keys=True)
+
+
+def first_alternative(
+    preferences: Optional[SelectorPreferences],
+    name: str,
+    alternatives: Dict[str, Callable[[], object]],
+):
+    """SelectorPreferences.first, in the given order when nothing is learned"""
+    if preferences is None:
+        for get_result in alternatives.values():
+            result = get_result()
+            if result:
+                return result
+        return None
+    return preferences.first(name, alternatives)
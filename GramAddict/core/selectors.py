@@ -0,0 +1,191 @@
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from GramAddict.core.hierarchy import MATCHES_KEYS, compile_pattern
+from GramAddict.core.resources import ClassName
+from GramAddict.core.resources import ResourceID as resources
+from GramAddict.core.resources import TabBarText
+
+
+@lru_cache(maxsize=256)
+def _case_insensitive_re(strings: str) -> str:
+    return f"(?i)({strings})"
+
+
+def case_insensitive_re(str_list):
+    strings = str_list if isinstance(str_list, str) else "|".join(str_list)
+    return _case_insensitive_re(strings)
+
+
+class ViewSelector:
+    """a selector declared once: its patterns are compiled up front and, being
+    hashable, what it resolves to is memoized per hierarchy snapshot"""
+
+    __slots__ = ("kwargs", "key", "_hash")
+
+    def __init__(self, **kwargs):
+        self.kwargs: Dict[str, object] = kwargs
+        self.key: Tuple = tuple(sorted(kwargs.items()))
+        self._hash = hash(self.key)
+        for name, value in kwargs.items():
+            if name in MATCHES_KEYS:
+                compile_pattern(value)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return isinstance(other, ViewSelector) and self.key == other.key
+
+    def __repr__(self):
+        args = ", ".join(f"{name}={value!r}" for name, value in self.key)
+        return f"ViewSelector({args})"
+
+
+def _tab(content_desc) -> ViewSelector:
+    return ViewSelector(
+        classNameMatches=ClassName.BUTTON_OR_FRAME_LAYOUT_REGEX,
+        descriptionMatches=case_insensitive_re(content_desc),
+    )
+
+
+class Selectors:
+    """the selectors of views.py which don't depend on the screen content"""
+
+    def __init__(self, resource_ids: resources):
+        self.TAB_BAR = ViewSelector(
+            resourceIdMatches=case_insensitive_re(resource_ids.TAB_BAR),
+            className=ClassName.LINEAR_LAYOUT,
+        )
+        self.TAB_HOME = _tab(TabBarText.HOME_CONTENT_DESC)
+        self.TAB_SEARCH = _tab(TabBarText.SEARCH_CONTENT_DESC)
+        self.TAB_REELS = _tab(TabBarText.REELS_CONTENT_DESC)
+        self.TAB_ORDERS = _tab(TabBarText.ORDERS_CONTENT_DESC)
+        self.TAB_ACTIVITY = _tab(TabBarText.ACTIVITY_CONTENT_DESC)
+        self.TAB_PROFILE = _tab(TabBarText.PROFILE_CONTENT_DESC)
+        self.ACTION_BAR = ViewSelector(
+            resourceIdMatches=case_insensitive_re(resource_ids.ACTION_BAR_CONTAINER),
+            className=ClassName.FRAME_LAYOUT,
+        )
+        self.MEDIA_CONTAINER = ViewSelector(
+            resourceIdMatches=case_insensitive_re(resource_ids.MEDIA_CONTAINER)
+        )
+        self.CAROUSEL_AND_MEDIA_GROUP = ViewSelector(
+            resourceIdMatches=resource_ids.CAROUSEL_AND_MEDIA_GROUP
+        )
+        self.PLAY_BUTTON = ViewSelector(
+            resourceIdMatches=case_insensitive_re(resource_ids.VIEW_PLAY_BUTTON)
+        )
+        self.VIDEO_CONTAINER = ViewSelector(
+            resourceIdMatches=case_insensitive_re(
+                resource_ids.VIDEO_CONTAINER_AND_CLIPS_VIDEO_CONTAINER
+            )
+        )
+        self.LIKE_BUTTON = ViewSelector(
+            resourceIdMatches=case_insensitive_re(resource_ids.LIKE_BUTTON)
+        )
+        self.TAGS_ICON = ViewSelector(
+            resourceIdMatches=case_insensitive_re(resource_ids.INDICATOR_ICON_VIEW)
+        )
+        self.UFI_STACK = ViewSelector(
+            resourceIdMatches=case_insensitive_re(resource_ids.UFI_STACK)
+        )
+        self.COORDINATOR_ROOT_LAYOUT = ViewSelector(
+            resourceIdMatches=case_insensitive_re(resource_ids.COORDINATOR_ROOT_LAYOUT)
+        )
+        self.FOLLOWERS_COUNT = ViewSelector(
+            resourceIdMatches=case_insensitive_re(
+                resource_ids.ROW_PROFILE_HEADER_TEXTVIEW_FOLLOWERS_COUNT
+            ),
+            className=ClassName.TEXT_VIEW,
+        )
+        self.FOLLOWING_COUNT = ViewSelector(
+            resourceIdMatches=case_insensitive_re(
+                resource_ids.ROW_PROFILE_HEADER_TEXTVIEW_FOLLOWING_COUNT
+            ),
+            className=ClassName.TEXT_VIEW,
+        )
+        self.ACTION_BAR_TITLE = ViewSelector(
+            resourceIdMatches=case_insensitive_re(
+                [
+                    resource_ids.TITLE_VIEW,
+                    resource_ids.ACTION_BAR_TITLE,
+                    resource_ids.ACTION_BAR_LARGE_TITLE,
+                    resource_ids.ACTION_BAR_TEXTVIEW_TITLE,
+                    resource_ids.ACTION_BAR_TITLE_AUTO_SIZE,
+                    resource_ids.ACTION_BAR_LARGE_TITLE_AUTO_SIZE,
+                ]
+            )
+        )
+        self.POST_COUNT = ViewSelector(
+            resourceIdMatches=case_insensitive_re(
+                resource_ids.ROW_PROFILE_HEADER_TEXTVIEW_POST_COUNT
+            )
+        )
+        self.BIOGRAPHY = ViewSelector(
+            resourceIdMatches=case_insensitive_re(resource_ids.PROFILE_HEADER_BIO_TEXT),
+            className=ClassName.TEXT_VIEW,
+        )
+        self.POST_OWNER = ViewSelector(
+            resourceIdMatches=resource_ids.ROW_FEED_PHOTO_PROFILE_NAME
+        )
+        self.POST_OWNER_LABEL = ViewSelector(resourceId=resource_ids.SECONDARY_LABEL)
+        self.POST_TEXT = ViewSelector(resourceIdMatches=resource_ids.ROW_FEED_TEXT)
+        self.POST_COMMENT = ViewSelector(
+            resourceIdMatches=resource_ids.ROW_FEED_COMMENT_TEXTVIEW_LAYOUT
+        )
+        self.POST_LIKES = ViewSelector(
+            resourceId=resource_ids.ROW_FEED_TEXTVIEW_LIKES,
+            className=ClassName.TEXT_VIEW,
+        )
+        self.POST_HEADER = ViewSelector(resourceId=resource_ids.ROW_FEED_PROFILE_HEADER)
+        self.GAP_VIEW = ViewSelector(resourceId=resource_ids.GAP_VIEW)
+        self.GAP_VIEW_OR_FOOTER = ViewSelector(
+            resourceIdMatches=resource_ids.GAP_VIEW_AND_FOOTER_SPACE
+        )
+        self.FEED_COMPOSER = ViewSelector(
+            resourceId=resource_ids.FEED_INLINE_COMPOSER_BUTTON_TEXTVIEW
+        )
+        self.ACTION_BAR_OVERLAY = ViewSelector(
+            resourceIdMatches=resource_ids.ACTION_BAR_CONTAINER
+        )
+        self.FULL_NAME = ViewSelector(
+            resourceIdMatches=case_insensitive_re(
+                resource_ids.PROFILE_HEADER_FULL_NAME
+            ),
+            className=ClassName.TEXT_VIEW,
+        )
+        self.FOLLOW_CONTEXT = ViewSelector(
+            resourceIdMatches=resource_ids.PROFILE_HEADER_FOLLOW_CONTEXT_TEXT
+        )
+        self.WEBSITE = ViewSelector(
+            resourceIdMatches=resource_ids.PROFILE_HEADER_WEBSITE
+        )
+        self.BUSINESS_CATEGORY = ViewSelector(
+            resourceId=resource_ids.PROFILE_HEADER_BUSINESS_CATEGORY
+        )
+        self.PRIVATE_PROFILE = ViewSelector(
+            resourceIdMatches=case_insensitive_re(
+                [
+                    resource_ids.PRIVATE_PROFILE_EMPTY_STATE,
+                    resource_ids.ROW_PROFILE_HEADER_EMPTY_PROFILE_NOTICE_TITLE,
+                    resource_ids.ROW_PROFILE_HEADER_EMPTY_PROFILE_NOTICE_CONTAINER,
+                ]
+            )
+        )
+        self.FOLLOW_BUTTON = ViewSelector(
+            classNameMatches=f"{ClassName.BUTTON}|{ClassName.TEXT_VIEW}",
+            clickable=True,
+            textMatches=case_insensitive_re(
+                "^following|^requested|^follow back|^follow"
+            ),
+        )
+        self.POST_GRID = ViewSelector(
+            classNameMatches=f"({ClassName.RECYCLER_VIEW}|{ClassName.VIEW})",
+            resourceIdMatches=resource_ids.LIST,
+        )
+
+
+@lru_cache(maxsize=None)
+def selectors(app_id: str) -> Selectors:
+    return Selectors(resources(app_id))
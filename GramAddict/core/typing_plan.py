@@ -0,0 +1,81 @@
+import base64
+import string
+from random import randint, uniform
+from typing import Iterator, List, NamedTuple
+
+
+class Keystroke(NamedTuple):
+    text: str
+    # pause after the chunk is typed, in seconds
+    delay: float
+
+
+class TypingPlan:
+    """how a text is typed like a human: the first 1-3 letters of every word one by
+    one, then the rest of the word, the final punctuation, spaces and new lines.
+    The whole plan is computed in advance, so that it can be sent to the device
+    in a few shell calls instead of one call per chunk."""
+
+    CHUNK_DELAY = (0.05, 0.15)
+    WORD_DELAY = (0.1, 0.35)
+    # a single shell call types at most this, every broadcast costs time on the device too
+    MAX_BATCH_DURATION = 8.0
+    MAX_BATCH_KEYSTROKES = 30
+
+    def __init__(self, text: str):
+        self.text = text
+        self.keystrokes: List[Keystroke] = []
+        sentences = text.splitlines()
+        for j, sentence in enumerate(sentences, start=1):
+            word_list = sentence.split()
+            for n, word in enumerate(word_list, start=1):
+                self._plan_word(word)
+                if n < len(word_list):
+                    self._add(" ", self.WORD_DELAY)
+            if j < len(sentences):
+                self._add("\n", self.WORD_DELAY)
+
+    def _add(self, text: str, delay_range):
+        if text:
+            self.keystrokes.append(Keystroke(text, round(uniform(*delay_range), 2)))
+
+    def _plan_word(self, word: str):
+        n_single_letters = randint(1, 3)
+        for char in word[:n_single_letters]:
+            self._add(char, self.CHUNK_DELAY)
+        rest = word[n_single_letters:]
+        if rest and rest[-1] in string.punctuation:
+            self._add(rest[:-1], self.CHUNK_DELAY)
+            self._add(rest[-1], self.CHUNK_DELAY)
+        else:
+            self._add(rest, self.CHUNK_DELAY)
+
+    @property
+    def duration(self) -> float:
+        return sum(keystroke.delay for keystroke in self.keystrokes)
+
+    def typed_text(self) -> str:
+        return "".join(keystroke.text for keystroke in self.keystrokes)
+
+    @staticmethod
+    def _command(keystroke: Keystroke) -> str:
+        # same broadcast of uiautomator2 send_keys(), FastInputIME does the typing
+        encoded = base64.b64encode(keystroke.text.encode("utf-8")).decode()
+        return f"am broadcast -a ADB_INPUT_TEXT --es text {encoded}; sleep {keystroke.delay}"
+
+    def batches(self) -> Iterator[str]:
+        """shell commands typing the whole plan, with the pauses done on the device"""
+        batch = []
+        planned = 0.0
+        for keystroke in self.keystrokes:
+            if batch and (
+                planned + keystroke.delay > self.MAX_BATCH_DURATION
+                or len(batch) == self.MAX_BATCH_KEYSTROKES
+            ):
+                yield "; ".join(batch)
+                batch = []
+                planned = 0.0
+            batch.append(self._command(keystroke))
+            planned += keystroke.delay
+        if batch:
+            yield "; ".join(batch)
@@ -0,0 +1,111 @@
+import logging
+from collections import Counter
+from typing import List, Optional
+
+from GramAddict.core.hierarchy import Hierarchy, Node
+from GramAddict.core.utils import EmptyList
+
+logger = logging.getLogger(__name__)
+
+
+class UserRow:
+    """One row of a followers / followings / likers list, read from a hierarchy snapshot"""
+
+    __slots__ = (
+        "index",
+        "username",
+        "full_name",
+        "follow_button_text",
+        "story_ring",
+        "bounds",
+        "fully_visible",
+        "info_child_count",
+        "view",
+    )
+
+    def __init__(self, index: int, node: Node):
+        self.index = index
+        self.username: Optional[str] = None
+        self.full_name: Optional[str] = None
+        self.follow_button_text: Optional[str] = None
+        self.story_ring = False
+        self.bounds = dict(node.bounds)
+        self.fully_visible = True
+        # children of the username/full name container
+        self.info_child_count = 0
+        # DeviceFacade.View of the row, set by get_user_rows()
+        self.view = None
+
+    @property
+    def height(self) -> int:
+        return self.bounds["bottom"] - self.bounds["top"]
+
+    def __repr__(self):
+        return f"UserRow(@{self.username}, button={self.follow_button_text!r}, fully_visible={self.fully_visible})"
+
+
+def _first(node: Optional[Node], **selector) -> Optional[Node]:
+    """same as uiautomator child(): first matching descendant in document order"""
+    if node is None:
+        return None
+    return next(
+        (
+            candidate
+            for candidate in node.iter_descendants()
+            if candidate.matches(selector)
+        ),
+        None,
+    )
+
+
+def parse_user_rows(hierarchy: Hierarchy, resource_ids) -> List[UserRow]:
+    """every visible user row of the current list, in screen order"""
+    rows = []
+    for index, node in enumerate(
+        hierarchy.find_all(resourceIdMatches=resource_ids.USER_LIST_CONTAINER)
+    ):
+        row = UserRow(index, node)
+        info_view = _first(node, index=1)
+        username_node = _first(node, resourceId=resource_ids.ROW_USER_PRIMARY_NAME)
+        if username_node is not None:
+            # likers list
+            button = _first(node, resourceId=resource_ids.BUTTON)
+        else:
+            # followers / followings list
+            username_node = _first(_first(info_view, index=0))
+            button = _first(node, index=2)
+        if username_node is not None and username_node.text:
+            row.username = username_node.text
+        if info_view is not None:
+            row.info_child_count = len(info_view.children)
+            texts = [
+                child.text
+                for child in info_view.iter_descendants()
+                if child.visible and child.text
+            ]
+            if row.username in texts:
+                texts.remove(row.username)
+            row.full_name = texts[0] if texts else None
+        if button is not None:
+            row.follow_button_text = button.text
+        row.story_ring = _first(node, resourceId=resource_ids.REEL_RING) is not None
+        rows.append(row)
+    if rows:
+        row_height = Counter(row.height for row in rows).most_common()[0][0]
+        for row in rows:
+            row.fully_visible = row.height >= row_height
+    return rows
+
+
+def get_user_rows(device, user_list, resource_ids) -> List[UserRow]:
+    """all the rows of user_list with a single hierarchy dump instead of several RPCs per row"""
+    user_list.wait()
+    rows = parse_user_rows(device.get_snapshot(), resource_ids)
+    if not rows:
+        raise EmptyList
+    for row in rows:
+        row.view = user_list[row.index]
+    logger.debug(
+        f"There are {len([row for row in rows if row.fully_visible])} users fully visible in that view."
+    )
+    return rows
@@ -6,15 +6,13 @@ import shutil
 import subprocess
 import sys
 import time
-from collections import Counter
 from datetime import datetime
 from math import nan
 from os import getcwd, rename, walk
 from pathlib import Path
 from random import randint, shuffle, uniform
-from subprocess import PIPE
 from time import sleep
-from typing import Optional, Tuple, Union
+from typing import Optional, Union
 from urllib.parse import urlparse
 
 import emoji
@@ -25,7 +23,8 @@ from colorama import Fore, Style
 from packaging.version import parse as parse_version
 
 from GramAddict import __file__, __version__
-from GramAddict.core.config import Config
+from GramAddict.core.adb import AdbError, get_adb
+from GramAddict.core.config import Config, PerThread
 from GramAddict.core.log import get_log_file_config
 from GramAddict.core.report import print_full_report
 from GramAddict.core.resources import ResourceID as resources
@@ -34,16 +33,15 @@ from GramAddict.core.storage import ACCOUNTS
 http = urllib3.PoolManager()
 logger = logging.getLogger(__name__)
 
+args = PerThread()
+configs = PerThread()
+ResourceID = PerThread()
+
 
 def load_config(config: Config):
-    global app_id
-    global args
-    global configs
-    global ResourceID
-    app_id = config.args.app_id
-    args = config.args
-    configs = config
-    ResourceID = resources(app_id)
+    args.bind(config.args)
+    configs.bind(config)
+    ResourceID.bind(resources(config.args.app_id))
 
 
 def update_available():
@@ -148,13 +146,12 @@ def config_examples():
 
 def check_adb_connection():
     is_device_id_provided = configs.device_id is not None
-    # sometimes it needs two requests to wake up...
-    stream = os.popen("adb devices")
-    stream.close()
-    stream = os.popen("adb devices")
-    output = stream.read()
-    devices_count = len(re.findall("device\n", output))
-    stream.close()
+    try:
+        devices = get_adb().devices()
+    except (AdbError, OSError) as e:
+        logger.debug(f"Can't talk with adb server: {e}")
+        devices = []
+    devices_count = len([serial for serial, state in devices if state == "device"])
 
     is_ok = True
     message = "That's ok."
@@ -174,77 +171,73 @@ def check_adb_connection():
 
 
 def get_instagram_version():
-    stream = os.popen(
-        f"adb{'' if configs.device_id is None else ' -s ' + configs.device_id} shell dumpsys package {app_id}"
-    )
-    output = stream.read()
+    output = get_adb(configs.device_id).shell(f"dumpsys package {args.app_id}")
     version_match = re.findall("versionName=(\\S+)", output)
     version = version_match[0] if len(version_match) == 1 else "not found"
-    stream.close()
     return version
 
 
-def open_instagram_with_url(url) -> bool:
+def open_instagram_with_url(url, package: Optional[str] = None) -> bool:
+    """the url is opened by the package when given, without asking which app"""
     logger.info(f"Open Instagram app with url: {url}")
-    cmd = f"adb{'' if configs.device_id is None else ' -s ' + configs.device_id} shell am start -a android.intent.action.VIEW -d {url}"
-    cmd_res = subprocess.run(cmd, stdout=PIPE, stderr=PIPE, shell=True, encoding="utf8")
-    err = cmd_res.stderr.strip()
+    cmd = f"am start -a android.intent.action.VIEW -d '{url}'"
+    if package is not None:
+        cmd += f" -p {package}"
+    output = get_adb(configs.device_id).shell(cmd)
     random_sleep()
+    # stdout and stderr come together over the socket
+    err = [line for line in output.splitlines() if line.startswith("Error")]
     if err:
-        logger.debug(err)
+        logger.debug(output.strip())
         return False
     return True
 
 
 def kill_app(device, app_id):
     device.deviceV2.app_stop(app_id)
+    device.app_state.invalidate()
 
 
 def head_up_notifications(enabled: bool = False):
     """
     Enable or disable head-up-notifications
     """
-    cmd: str = (
-        f"adb{'' if configs.device_id is None else ' -s ' + configs.device_id} shell settings put global heads_up_notifications_enabled {0 if not enabled else 1}"
+    return get_adb(configs.device_id).shell(
+        f"settings put global heads_up_notifications_enabled {0 if not enabled else 1}"
     )
-    return subprocess.run(cmd, stdout=PIPE, stderr=PIPE, shell=True, encoding="utf8")
 
 
 def check_screen_timeout():
     MIN_TIMEOUT = 5 * 6_000
-    cmd: str = (
-        f"adb{'' if configs.device_id is None else f' -s {configs.device_id}'} shell settings get system screen_off_timeout"
-    )
-    resp = subprocess.run(cmd, stdout=PIPE, stderr=PIPE, shell=True, encoding="utf8")
+    adb = get_adb(configs.device_id)
+    resp = adb.shell("settings get system screen_off_timeout")
     try:
-        if int(resp.stdout.lstrip()) < MIN_TIMEOUT:
+        if int(resp.lstrip()) < MIN_TIMEOUT:
             logger.info(
                 f"Setting timeout of the screen to {MIN_TIMEOUT/6_000:.0f} minutes."
             )
-            cmd: str = (
-                f"adb{'' if configs.device_id is None else f' -s {configs.device_id}'} shell settings put system screen_off_timeout {MIN_TIMEOUT}"
-            )
-
-            subprocess.run(cmd, stdout=PIPE, stderr=PIPE, shell=True, encoding="utf8")
+            adb.shell(f"settings put system screen_off_timeout {MIN_TIMEOUT}")
         else:
             logger.info("Screen timeout is fine!")
     except ValueError:
         logger.info("Unable to get screen timeout!")
-        logger.debug(resp.stdout)
+        logger.debug(resp)
 
 
 def open_instagram(device):
-    nl = "\n"
     FastInputIME = "com.github.uiautomator/.FastInputIME"
     logger.info("Open Instagram app.")
 
     def call_ig():
         try:
-            return device.deviceV2.app_start(app_id, use_monkey=True)
+            return device.deviceV2.app_start(args.app_id, use_monkey=True)
         except uiautomator2.exceptions.BaseError as exc:
             return exc
 
     err = call_ig()
+    device.app_state.invalidate()
+    device.notify_ui_changed()
+    device.reset_display()
     if err:
         logger.error(err)
         return False
@@ -253,10 +246,10 @@ def open_instagram(device):
 
     max_tries = 3
     n = 0
-    while device.deviceV2.app_current()["package"] != app_id:
+    while device.deviceV2.app_current()["package"] != args.app_id:
         if n == max_tries:
             logger.critical(
-                f"Unable to open Instagram. Bot will stop. Current package name: {device.deviceV2.app_current()['package']} (Looking for {app_id})"
+                f"Unable to open Instagram. Bot will stop. Current package name: {device.deviceV2.app_current()['package']} (Looking for {args.app_id})"
             )
             return False
         n += 1
@@ -264,6 +257,9 @@ def open_instagram(device):
         if check_if_crash_popup_is_there(device):
             logger.info("Ig crashed, try to open it again...")
         call_ig()
+        device.app_state.invalidate()
+        device.notify_ui_changed()
+        device.reset_display()
         choose_cloned_app(device)
         random_sleep(3, 3, modulable=False)
 
@@ -272,27 +268,21 @@ def open_instagram(device):
     random_sleep()
     if configs.args.close_apps:
         logger.info("Close all the other apps, to avoid interferences...")
-        device.deviceV2.app_stop_all(excludes=[app_id])
+        device.deviceV2.app_stop_all(excludes=[args.app_id])
+        device.app_state.invalidate()
         random_sleep()
     logger.debug("Setting FastInputIME as default keyboard.")
     device.deviceV2.set_fastinput_ime(True)
-    cmd: str = (
-        f"adb{'' if configs.device_id is None else ' -s ' + configs.device_id} shell settings get secure default_input_method"
-    )
-    cmd_res = subprocess.run(cmd, stdout=PIPE, stderr=PIPE, shell=True, encoding="utf8")
-    if cmd_res.stdout.replace(nl, "") != FastInputIME:
+    adb = get_adb(configs.device_id)
+    cmd_res = adb.shell("settings get secure default_input_method")
+    if cmd_res.strip() != FastInputIME:
         logger.warning(
-            f"FastInputIME is not the default keyboard! Default is: {cmd_res.stdout.replace(nl, '')}. Changing it via adb.."
-        )
-        cmd: str = (
-            f"adb{'' if configs.device_id is None else ' -s ' + configs.device_id} shell ime set {FastInputIME}"
+            f"FastInputIME is not the default keyboard! Default is: {cmd_res.strip()}. Changing it via adb.."
         )
-        cmd_res = subprocess.run(
-            cmd, stdout=PIPE, stderr=PIPE, shell=True, encoding="utf8"
-        )
-        if cmd_res.stdout.startswith("Error:"):
+        cmd_res = adb.shell(f"ime set {FastInputIME}")
+        if cmd_res.startswith("Error:"):
             logger.warning(
-                f"{cmd_res.stdout.replace(nl, '')}. It looks like you don't have FastInputIME installed :S"
+                f"{cmd_res.strip()}. It looks like you don't have FastInputIME installed :S"
             )
         else:
             logger.info("FastInputIME is the default keyboard.")
@@ -300,7 +290,10 @@ def open_instagram(device):
         logger.info("FastInputIME is the default keyboard.")
     if configs.args.screen_record:
         try:
-            device.start_screenrecord()
+            device.start_screenrecord(
+                seconds=int(configs.args.screen_record_seconds),
+                max_memory_mb=int(configs.args.screen_record_memory),
+            )
         except Exception as e:
             logger.error(
                 f"You can't use this feature without installing dependencies. Type that in console: 'pip3 install -U \"uiautomator2[image]\" -i https://pypi.doubanio.com/simple'. Exception: {e}"
@@ -310,11 +303,13 @@ def open_instagram(device):
 
 def close_instagram(device):
     logger.info("Close Instagram app.")
-    device.deviceV2.app_stop(app_id)
+    device.deviceV2.app_stop(args.app_id)
+    device.app_state.invalidate()
+    device.notify_ui_changed()
     random_sleep(5, 5, modulable=False)
     if configs.args.screen_record:
         try:
-            device.stop_screenrecord(crash=False)
+            device.stop_screenrecord()
         except Exception as e:
             logger.error(
                 f"You can't use this feature without installing dependencies. Type that in console: 'pip3 install -U \"uiautomator2[image]\" -i https://pypi.doubanio.com/simple'. Exception: {e}"
@@ -322,9 +317,10 @@ def close_instagram(device):
 
 
 def check_if_crash_popup_is_there(device) -> bool:
-    obj = device.find(resourceId=ResourceID.CRASH_POPUP)
+    obj = device.find(resourceIdMatches=ResourceID.CRASH_POPUP, check_app=False)
     if obj.exists():
         obj.click()
+        device.app_state.invalidate()
         return True
     return False
 
@@ -395,7 +391,7 @@ def countdown(seconds: int = 10, waiting_message: str = "") -> None:
 def choose_cloned_app(device) -> None:
     """if dialog box is displayed choose for original or cloned app"""
     app_number = "2" if configs.args.use_cloned_app else "1"
-    obj = device.find(resourceId=f"{ResourceID.MIUI_APP}{app_number}")
+    obj = device.find(resourceId=f"{ResourceID.MIUI_APP}{app_number}", check_app=False)
     if obj.exists(3):
         logger.debug(f"Cloned app menu exists. Pressing on app number {app_number}.")
         obj.click()
@@ -428,28 +424,23 @@ def print_telegram_reports(
 def kill_atx_agent(device):
     _restore_keyboard(device)
     logger.info("Kill atx agent.")
-    cmd: str = (
-        f"adb{'' if configs.device_id is None else f' -s {configs.device_id}'} shell pkill atx-agent"
-    )
-    subprocess.run(cmd, stdout=PIPE, stderr=PIPE, shell=True, encoding="utf8")
+    get_adb(configs.device_id).shell("pkill atx-agent")
 
 
 def restart_atx_agent(device):
     kill_atx_agent(device)
     logger.info("Restarting atx agent.")
-    cmd: str = (
-        f"adb{'' if configs.device_id is None else f' -s {configs.device_id}'} shell /data/local/tmp/atx-agent server -d"
-    )
-
     try:
-        result = subprocess.run(
-            cmd, stdout=PIPE, stderr=PIPE, shell=True, encoding="utf8", check=True
+        # '; echo $?' since the exit code doesn't travel over the adb socket
+        result = get_adb(configs.device_id).shell(
+            "/data/local/tmp/atx-agent server -d; echo $?"
         )
-        if result.returncode != 0:
-            logger.error(f"Failed to restart atx-agent: {result.stderr}")
+        output, _, returncode = result.rstrip().rpartition("\n")
+        if returncode.strip() != "0":
+            logger.error(f"Failed to restart atx-agent: {output}")
         else:
             logger.info("atx-agent restarted successfully.")
-    except subprocess.CalledProcessError as e:
+    except AdbError as e:
         logger.error(f"Error occurred while restarting atx-agent: {e}")
 
 
@@ -458,14 +449,18 @@ def _restore_keyboard(device):
     device.deviceV2.set_fastinput_ime(False)
 
 
-def random_sleep(inf=0.5, sup=3.0, modulable=True, log=True):
+def _random_delay(inf, sup, modulable, log) -> float:
     MIN_INF = 0.3
     multiplier = float(args.speed_multiplier)
     delay = uniform(inf, sup) / (multiplier if modulable else 1.0)
     delay = max(delay, MIN_INF)
     if log:
         logger.debug(f"{str(delay)[:4]}s sleep")
-    sleep(delay)
+    return delay
+
+
+def random_sleep(inf=0.5, sup=3.0, modulable=True, log=True):
+    sleep(_random_delay(inf, sup, modulable, log))
 
 
 def save_crash(device):
@@ -490,16 +485,15 @@ def save_crash(device):
         logger.error(f"Cannot save 'hierarchy.{hierarchy_format}'.")
     if args.screen_record:
         try:
-            device.stop_screenrecord(crash=True)
+            if not device.save_screenrecord(os.path.join(crash_path, "video.mp4")):
+                logger.error("Nothing has been recorded!")
         except Exception as e:
             logger.error(
                 f"You can't use this feature without installing dependencies. Type that in console: 'pip3 install -U \"uiautomator2[image]\" -i https://pypi.doubanio.com/simple'. Exception: {e}"
             )
-        files = [f for f in os.listdir("./") if f.endswith(".mp4")]
-        try:
-            os.replace(files[-1], os.path.join(crash_path, "video.mp4"))
-        except (FileNotFoundError, IndexError):
-            logger.error("File *.mp4 not found!")
+    if device.trace is not None:
+        # the calls until the crash, to replay it without the phone
+        device.trace.save_copy(crash_path)
     g_log_file_name, g_logs_dir, _, _ = get_log_file_config()
     src_file = os.path.join(g_logs_dir, g_log_file_name)
     target_file = os.path.join(crash_path, "logs.txt")
@@ -516,13 +510,6 @@ def save_crash(device):
     )
     logger.info("https://discord.gg/66zWWCDM7x\n", extra={"color": Fore.GREEN})
     check_if_updated(crash=True)
-    if args.screen_record:
-        try:
-            device.start_screenrecord()
-        except Exception as e:
-            logger.error(
-                f"You can't use this feature without installing dependencies. Type that in console: 'pip3 install -U \"uiautomator2[image]\" -i https://pypi.doubanio.com/simple'. Exception: {e}"
-            )
 
 
 def trim_txt(source: str, target: str) -> None:
@@ -546,6 +533,8 @@ def stop_bot(device, sessions, session_state, was_sleeping=False):
     if args.kill_atx_agent:
         kill_atx_agent(device)
     head_up_notifications(enabled=True)
+    if device.trace is not None:
+        device.trace.close()
     logger.info(
         f"-------- FINISH: {datetime.now().strftime('%H:%M:%S')} --------",
         extra={"color": f"{Style.BRIGHT}{Fore.YELLOW}"},
@@ -740,19 +729,6 @@ def wait_for_next_session(time_left, session_state, sessions, device):
         stop_bot(device, sessions, session_state, was_sleeping=True)
 
 
-def inspect_current_view(user_list) -> Tuple[int, int]:
-    """
-    return the number of users and each row height in the current view
-    """
-    user_list.wait()
-    lst = [item.get_height() for item in user_list if item.wait()]
-    if not lst:
-        raise EmptyList
-    row_height, n_users = Counter(lst).most_common()[0]
-    logger.debug(f"There are {n_users} users fully visible in that view.")
-    return row_height, n_users
-
-
 class ActionBlockedError(Exception):
     pass
 
@@ -5,11 +5,12 @@ import platform
 from enum import Enum, auto
 from random import choice, randint, uniform
 from time import sleep
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import emoji
 from colorama import Fore, Style
 
+from GramAddict.core.config import PerThread
 from GramAddict.core.device_facade import (
     DeviceFacade,
     Direction,
@@ -18,9 +19,18 @@ from GramAddict.core.device_facade import (
     SleepTime,
     Timeout,
 )
+from GramAddict.core.hierarchy import Hierarchy
+from GramAddict.core.media_type import (
+    MediaInfo,
+    MediaType,
+    carousel_counts,
+    classify_media,
+    classify_medias,
+)
 from GramAddict.core.resources import ClassName
 from GramAddict.core.resources import ResourceID as resources
 from GramAddict.core.resources import TabBarText
+from GramAddict.core.selectors import case_insensitive_re, selectors
 from GramAddict.core.utils import (
     ActionBlockedError,
     Square,
@@ -31,19 +41,38 @@ from GramAddict.core.utils import (
 
 logger = logging.getLogger(__name__)
 
+args = PerThread()
+configs = PerThread()
+ResourceID = PerThread()
+Selectors = PerThread()
+
 
 def load_config(config):
-    global args
-    global configs
-    global ResourceID
-    args = config.args
-    configs = config
-    ResourceID = resources(config.args.app_id)
+    args.bind(config.args)
+    configs.bind(config)
+    ResourceID.bind(resources(config.args.app_id))
+    Selectors.bind(selectors(config.args.app_id))
+
+
+# compiled once, some of them run for every post
+_LIKES_RE = re.compile(r"(?P<likes>\d+) (?:others|likes)", re.IGNORECASE)
+_VIEWS_RE = re.compile(r"(?P<views>\d+) views", re.IGNORECASE)
+_MUTUAL_FRIENDS_RE = re.compile(r"((?P<others>\s\d+\s)|(?P<extra>,))", re.IGNORECASE)
+_COUNTER_RE = re.compile(r"(?!(K|M|\.))\D+")
+_LONG_BIO_RE = re.compile(r"{0}$".format("… more"), flags=re.IGNORECASE)
+_NOT_DIGITS_RE = re.compile("[^0-9]")
+_POST_DELETED_RE = re.compile(r".+deleted", re.IGNORECASE)
 
+_MEDIA_TYPE_NAMES = {
+    MediaType.PHOTO: "photo",
+    MediaType.VIDEO: "video",
+    MediaType.IGTV: "IGTV",
+    MediaType.REEL: "Reel",
+}
 
-def case_insensitive_re(str_list):
-    strings = str_list if isinstance(str_list, str) else "|".join(str_list)
-    return f"(?i)({strings})"
+
+def _existing(view: DeviceFacade.View, timeout=None) -> Optional[DeviceFacade.View]:
+    return view if view.exists(timeout) else None
 
 
 class TabBarTabs(Enum):
@@ -80,15 +109,6 @@ class LikeMode(Enum):
     DOUBLE_CLICK = auto()
 
 
-class MediaType(Enum):
-    PHOTO = auto()
-    VIDEO = auto()
-    REEL = auto()
-    IGTV = auto()
-    CAROUSEL = auto()
-    UNKNOWN = auto()
-
-
 class Owner(Enum):
     OPEN = auto()
     GET_NAME = auto()
@@ -100,10 +120,7 @@ class TabBarView:
         self.device = device
 
     def _getTabBar(self):
-        return self.device.find(
-            resourceIdMatches=case_insensitive_re(ResourceID.TAB_BAR),
-            className=ClassName.LINEAR_LAYOUT,
-        )
+        return self.device.find(selector=Selectors.TAB_BAR)
 
     def navigateToHome(self):
         self._navigateTo(TabBarTabs.HOME)
@@ -133,56 +150,64 @@ class TabBarView:
                 return button
         return None
 
+    def _navigateToSearchFromHome(self) -> bool:
+        """whether the search opened, so that a miss isn't remembered as the way to it"""
+        # Some accounts display the search btn only in Home -> action bar
+        logger.debug("Didn't find search in the tab bar...")
+        home_view = self.navigateToHome()
+        if not home_view._getSearchButton().exists(Timeout.SHORT):
+            return False
+        home_view.navigateToSearch()
+        search_edit_text = self.device.find(
+            resourceIdMatches=case_insensitive_re(
+                ResourceID.ACTION_BAR_SEARCH_EDIT_TEXT
+            )
+        )
+        return search_edit_text.exists(Timeout.MEDIUM)
+
     def _navigateTo(self, tab: TabBarTabs):
         tab_name = tab.name
         logger.debug(f"Navigate to {tab_name}")
         button = None
         UniversalActions.close_keyboard(self.device)
         if tab == TabBarTabs.HOME:
-            button = self.device.find(
-                classNameMatches=ClassName.BUTTON_OR_FRAME_LAYOUT_REGEX,
-                descriptionMatches=case_insensitive_re(TabBarText.HOME_CONTENT_DESC),
-            )
+            button = self.device.find(selector=Selectors.TAB_HOME)
 
         elif tab == TabBarTabs.SEARCH:
-            button = self.device.find(
-                classNameMatches=ClassName.BUTTON_OR_FRAME_LAYOUT_REGEX,
-                descriptionMatches=case_insensitive_re(TabBarText.SEARCH_CONTENT_DESC),
+            # while learning, the tab has to show up before it's remembered
+            # as the way to the search
+            learning = self.device.selector_preferences is not None
+            button = self.device.first_alternative(
+                "search_tab",
+                {
+                    "tab_bar": lambda: _existing(
+                        self.device.find(selector=Selectors.TAB_SEARCH),
+                        Timeout.SHORT if learning else None,
+                    ),
+                    "home_action_bar": self._navigateToSearchFromHome,
+                },
             )
-
-            if not button.exists():
-                # Some accounts display the search btn only in Home -> action bar
-                logger.debug("Didn't find search in the tab bar...")
-                home_view = self.navigateToHome()
-                home_view.navigateToSearch()
+            if button is True:
                 return
         elif tab == TabBarTabs.REELS:
-            button = self.device.find(
-                classNameMatches=ClassName.BUTTON_OR_FRAME_LAYOUT_REGEX,
-                descriptionMatches=case_insensitive_re(TabBarText.REELS_CONTENT_DESC),
-            )
+            button = self.device.find(selector=Selectors.TAB_REELS)
 
         elif tab == TabBarTabs.ORDERS:
-            button = self.device.find(
-                classNameMatches=ClassName.BUTTON_OR_FRAME_LAYOUT_REGEX,
-                descriptionMatches=case_insensitive_re(TabBarText.ORDERS_CONTENT_DESC),
-            )
+            button = self.device.find(selector=Selectors.TAB_ORDERS)
 
         elif tab == TabBarTabs.ACTIVITY:
-            button = self.device.find(
-                classNameMatches=ClassName.BUTTON_OR_FRAME_LAYOUT_REGEX,
-                descriptionMatches=case_insensitive_re(
-                    TabBarText.ACTIVITY_CONTENT_DESC
-                ),
-            )
+            button = self.device.find(selector=Selectors.TAB_ACTIVITY)
 
         elif tab == TabBarTabs.PROFILE:
-            button = self.device.find(
-                classNameMatches=ClassName.BUTTON_OR_FRAME_LAYOUT_REGEX,
-                descriptionMatches=case_insensitive_re(TabBarText.PROFILE_CONTENT_DESC),
+            button = self.device.first_alternative(
+                "profile_tab",
+                {
+                    "tab_bar": lambda: _existing(
+                        self.device.find(selector=Selectors.TAB_PROFILE)
+                    ),
+                    "profile_button": self._get_new_profile_position,
+                },
             )
-            if not button.exists():
-                button = self._get_new_profile_position()
 
         if button is not None and button.exists(Timeout.MEDIUM):
             # Two clicks to reset tab content
@@ -200,10 +225,7 @@ class ActionBarView:
         self.action_bar = self._getActionBar()
 
     def _getActionBar(self):
-        return self.device.find(
-            resourceIdMatches=case_insensitive_re(ResourceID.ACTION_BAR_CONTAINER),
-            className=ClassName.FRAME_LAYOUT,
-        )
+        return self.device.find(selector=Selectors.ACTION_BAR)
 
 
 class HomeView(ActionBarView):
@@ -211,11 +233,14 @@ class HomeView(ActionBarView):
         super().__init__(device)
         self.device = device
 
-    def navigateToSearch(self):
-        logger.debug("Navigate to Search")
-        search_btn = self.action_bar.child(
+    def _getSearchButton(self):
+        return self.action_bar.child(
             descriptionMatches=case_insensitive_re(TabBarText.SEARCH_CONTENT_DESC)
         )
+
+    def navigateToSearch(self):
+        logger.debug("Navigate to Search")
+        search_btn = self._getSearchButton()
         search_btn.click()
 
         return SearchView(self.device)
@@ -456,6 +481,112 @@ class SearchView:
         return False
 
 
+class FeedPost:
+    """the post in view of a feed, hashtag or place list, read from a single
+    hierarchy dump: the PostsViewList helpers share it until the next gesture"""
+
+    def __init__(self, hierarchy: Hierarchy):
+        self.hierarchy = hierarchy
+        self.owners = self._nodes(Selectors.POST_OWNER)
+        self.owner = self.owners[0] if self.owners else None
+        self.likes = self._first(Selectors.POST_LIKES)
+        self.has_comment = bool(self._nodes(Selectors.POST_COMMENT))
+        self.has_gap_or_footer = bool(self._nodes(Selectors.GAP_VIEW_OR_FOOTER))
+        self.gap_view = self._first(Selectors.GAP_VIEW)
+        self.feed_composer = self._first(Selectors.FEED_COMPOSER)
+        self.headers = self._nodes(Selectors.POST_HEADER)
+        self.medias = self._nodes(Selectors.MEDIA_CONTAINER)
+        media_group = self._first(Selectors.CAROUSEL_AND_MEDIA_GROUP)
+        self.media_desc = None if media_group is None else media_group.content_desc
+        self.has_tags = bool(self._nodes(Selectors.TAGS_ICON))
+        self.action_bar = self._first(Selectors.ACTION_BAR_OVERLAY)
+        self._media = None
+
+    def _nodes(self, selector):
+        return self.hierarchy.resolve(selector.kwargs, key=selector.key)
+
+    def _first(self, selector):
+        nodes = self._nodes(selector)
+        return nodes[0] if nodes else None
+
+    def owner_named(self, username: Optional[str] = None):
+        if username is None:
+            return self.owner
+        for owner in self.owners:
+            if owner.text.startswith(username):
+                return owner
+        return None
+
+    @staticmethod
+    def username_of(owner) -> str:
+        return owner.text.replace("•", "").strip().split(" ", 1)[0]
+
+    def ad_or_hashtag(self, owner) -> Optional[Tuple[bool, bool, str]]:
+        """is_ad, is_hashtag and owner name, None when the name is only in the pixels"""
+        owner_name = owner.text or owner.content_desc
+        if not owner_name:
+            return None
+        logger.debug("Checking if it's an AD or an hashtag..")
+        label = None
+        if owner.parent is not None:
+            label = next(
+                (
+                    node
+                    for node in owner.parent.iter_descendants()
+                    if node is not owner
+                    and node.matches(Selectors.POST_OWNER_LABEL.kwargs)
+                ),
+                None,
+            )
+        return FeedPost.classify_owner(
+            owner_name, None if label is None else label.text or label.content_desc
+        )
+
+    @staticmethod
+    def classify_owner(
+        owner_name: str, label_text: Optional[str]
+    ) -> Tuple[bool, bool, str]:
+        is_ad = False
+        is_hashtag = False
+        if owner_name.startswith("#"):
+            is_hashtag = True
+            logger.debug("Looks like an hashtag, skip.")
+        if label_text is not None:
+            if label_text.casefold() == "sponsored":
+                logger.debug("Looks like an AD, skip.")
+                is_ad = True
+            elif is_hashtag:
+                owner_name = owner_name.split("•")[0].strip()
+        return is_ad, is_hashtag, owner_name
+
+    def description_of(self, username) -> Optional[str]:
+        """the last text of the post starting with the owner name, upper-cased"""
+        texts = [
+            node.text
+            for node in self._nodes(Selectors.POST_TEXT)
+            if username is None or node.text.startswith(username)
+        ]
+        return texts[-1].upper() if texts else None
+
+    def header_is_above_the_end(self) -> Optional[bool]:
+        """is the header of the post above the gap view (or the comment box)"""
+        end = self.gap_view or self.feed_composer
+        if not self.headers or end is None:
+            return None
+        return self.headers[0].bounds["top"] < end.bounds["top"]
+
+    def action_bar_position(self) -> Tuple[bool, int, int]:
+        if self.action_bar is None:
+            return False, 0, 0
+        return True, self.action_bar.bounds["top"], self.action_bar.bounds["bottom"]
+
+    @property
+    def media(self) -> Tuple[Optional[MediaType], Optional[int]]:
+        if self._media is None:
+            self._media = PostsViewList.detect_media_type(self.media_desc)
+        return self._media
+
+
 class PostsViewList:
     def __init__(self, device: DeviceFacade):
         self.device = device
@@ -465,7 +596,7 @@ class PostsViewList:
         logger.debug("swipe_to_fit_posts")
         """calculate the right swipe amount necessary to swipe to next post in hashtag post view
         in order to make it available to other plug-ins I cut it in two moves"""
-        displayWidth = self.device.get_info()["displayWidth"]
+        displayWidth = self.device.display.width
         containers_content = ResourceID.MEDIA_CONTAINER
         containers_gap = ResourceID.GAP_VIEW_AND_FOOTER_SPACE
         suggested_users = ResourceID.NETEGO_CAROUSEL_HEADER
@@ -545,70 +676,54 @@ class PostsViewList:
             )
             return True
 
+    def _current_post(self) -> FeedPost:
+        return FeedPost(self.device.get_snapshot())
+
     def _find_likers_container(self):
         universal_actions = UniversalActions(self.device)
-        containers_gap = ResourceID.GAP_VIEW_AND_FOOTER_SPACE
-        media_container = ResourceID.MEDIA_CONTAINER
         likes = 0
         for attempt in range(4):
             logger.debug(f"Attempt {attempt + 1} to find likers container.")
-            gap_view_obj = self.device.find(resourceIdMatches=containers_gap)
-            likes_view = self.device.find(
-                resourceId=ResourceID.ROW_FEED_TEXTVIEW_LIKES,
-                className=ClassName.TEXT_VIEW
-            )
-            if likes_view.exists():
+            post = self._current_post()
+            if post.likes is not None:
                 logger.debug("Found likes view.")
-            else:
-                likes_view = None
-
-            description_view = self.device.find(
-                resourceIdMatches=ResourceID.ROW_FEED_COMMENT_TEXTVIEW_LAYOUT
-            )
-            media = self.device.find(
-                resourceIdMatches=media_container,
-            )
-            media_count = media.count_items()
+            media_count = len(post.medias)
             logger.debug(f"I can see {media_count} media(s) in this view..")
+            media_bottom = post.medias[0].bounds["bottom"] if post.medias else None
 
-            if media_count > 1 and (
-                media.get_bounds()["bottom"]
-                < self.device.get_info()["displayHeight"] / 3
-            ):
+            if media_count > 1 and media_bottom < self.device.display.height / 3:
                 logger.debug("Multiple media detected, swiping down a bit.")
                 universal_actions._swipe_points(Direction.DOWN, delta_y=100)
                 continue
 
-            if not likes_view or not likes_view.exists():
-                if description_view.exists() or gap_view_obj.exists():
+            if post.likes is None:
+                if post.has_comment or post.has_gap_or_footer:
                     logger.debug("Description view or gap view exists, but no likes view found.")
                     return False, likes
                 else:
                     logger.debug("No likes view, description view, or gap view found. Swiping down.")
                     universal_actions._swipe_points(Direction.DOWN, delta_y=100)
                     continue
-            elif media.get_bounds()["bottom"] > likes_view.get_bounds()["bottom"]:
+            elif (
+                media_bottom is not None and media_bottom > post.likes.bounds["bottom"]
+            ):
                 logger.debug("Media bottom is below likes view bottom, swiping down.")
                 universal_actions._swipe_points(Direction.DOWN, delta_y=100)
                 continue
 
             logger.debug("Likers container exists!")
-            likes = self._get_number_of_likers(likes_view)
-            return likes_view.exists(), likes
+            likes = self._get_number_of_likers(post.likes.text)
+            return True, likes
 
         logger.debug("Failed to find likers container after 4 attempts.")
         return False, 0
 
-    def _get_number_of_likers(self, likes_view):
+    def _get_number_of_likers(self, likes_view_text: Optional[str]):
         likes = 0
-        if likes_view.exists():
-            likes_view_text = likes_view.get_text().replace(",", "")
-            matches_likes = re.search(
-                r"(?P<likes>\d+) (?:others|likes)", likes_view_text, re.IGNORECASE
-            )
-            matches_view = re.search(
-                r"(?P<views>\d+) views", likes_view_text, re.IGNORECASE
-            )
+        if likes_view_text is not None:
+            likes_view_text = likes_view_text.replace(",", "")
+            matches_likes = _LIKES_RE.search(likes_view_text)
+            matches_view = _VIEWS_RE.search(likes_view_text)
             if hasattr(matches_likes, "group"):
                 likes = int(matches_likes.group("likes"))
                 logger.info(
@@ -703,10 +818,7 @@ class PostsViewList:
                 likes_view.click(Location.LEFT)
 
     def _has_tags(self) -> bool:
-        tags_icon = self.device.find(
-            resourceIdMatches=case_insensitive_re(ResourceID.INDICATOR_ICON_VIEW)
-        )
-        self.has_tags = tags_icon.exists()
+        self.has_tags = self._current_post().has_tags
         return self.has_tags
 
     def _check_if_last_post(
@@ -720,21 +832,10 @@ class PostsViewList:
         )
         has_tags = self._has_tags()
         while True:
-            post_description = self.device.find(
-                index=-1,
-                resourceIdMatches=ResourceID.ROW_FEED_TEXT,
-                textStartsWith=username,
-            )
-            if not post_description.exists() and post_description.count_items() >= 1:
-                text = post_description.get_text()
-                post_description = self.device.find(
-                    index=-1,
-                    resourceIdMatches=ResourceID.ROW_FEED_TEXT,
-                    text=text,
-                )
-            if post_description.exists():
+            post = self._current_post()
+            new_description = post.description_of(username)
+            if new_description is not None:
                 logger.debug("Description found!")
-                new_description = post_description.get_text().upper()
                 if new_description != last_description:
                     return False, new_description, username, is_ad, is_hashtag, has_tags
                 logger.info(
@@ -742,26 +843,17 @@ class PostsViewList:
                 )
                 return True, new_description, username, is_ad, is_hashtag, has_tags
             else:
-                gap_view_obj = self.device.find(resourceId=ResourceID.GAP_VIEW)
-                feed_composer = self.device.find(
-                    resourceId=ResourceID.FEED_INLINE_COMPOSER_BUTTON_TEXTVIEW
-                )
-                if gap_view_obj.exists() and gap_view_obj.get_bounds()["bottom"] < (
-                    self.device.get_info()["displayHeight"] / 3
+                if post.gap_view is not None and post.gap_view.bounds["bottom"] < (
+                    self.device.display.height / 3
                 ):
                     universal_actions._swipe_points(
                         direction=Direction.DOWN, delta_y=200
                     )
                     continue
-                row_feed_profile_header = self.device.find(
-                    resourceId=ResourceID.ROW_FEED_PROFILE_HEADER
-                )
-                if row_feed_profile_header.count_items() > 1:
+                if len(post.headers) > 1:
                     logger.info("This post hasn't the description...")
                     return False, "", username, is_ad, is_hashtag, has_tags
-                profile_header_is_above = row_feed_profile_header.is_above_this(
-                    gap_view_obj if gap_view_obj.exists() else feed_composer
-                )
+                profile_header_is_above = post.header_is_above_the_end()
                 if profile_header_is_above is not None:
                     if not profile_header_is_above:
                         logger.info("This post hasn't the description...")
@@ -787,15 +879,7 @@ class PostsViewList:
     def _get_action_bar_position(self) -> Tuple[bool, int, int]:
         """action bar is overlay, if you press on it, you go back to the first post
         knowing his position is important to avoid it: exists, top, bottom"""
-        action_bar = self.device.find(resourceIdMatches=ResourceID.ACTION_BAR_CONTAINER)
-        if action_bar.exists():
-            return (
-                True,
-                action_bar.get_bounds()["top"],
-                action_bar.get_bounds()["bottom"],
-            )
-        else:
-            return False, 0, 0
+        return self._current_post().action_bar_position()
 
     def _refresh_feed(self):
         logger.info("Refresh feed..")
@@ -810,28 +894,24 @@ class PostsViewList:
         """returns a tuple[var, bool, bool]"""
         is_ad = False
         is_hashtag = False
-        if username is None:
-            post_owner_obj = self.device.find(
-                resourceIdMatches=ResourceID.ROW_FEED_PHOTO_PROFILE_NAME
-            )
-        else:
+        post = self._current_post()
+        post_owner = post.owner_named(username)
+        if username is not None:
             for _ in range(2):
-                post_owner_obj = self.device.find(
-                    resourceIdMatches=ResourceID.ROW_FEED_PHOTO_PROFILE_NAME,
-                    textStartsWith=username,
-                )
-                notification = self.device.find(
+                notification = post.hierarchy.find_all(
                     resourceIdMatches=ResourceID.NOTIFICATION_MESSAGE
                 )
-                if not post_owner_obj.exists and notification.exists():
+                if post_owner is None and notification:
                     logger.warning(
                         "There is a notification there! Please disable them in settings.. We will wait 10 seconds before continue.."
                     )
                     sleep(10)
+                    post = self._current_post()
+                    post_owner = post.owner_named(username)
         post_owner_clickable = False
 
         for _ in range(3):
-            if not post_owner_obj.exists():
+            if post_owner is None:
                 if mode == Owner.OPEN:
                     comment_description = self.device.find(
                         resourceIdMatches=ResourceID.ROW_FEED_COMMENT_TEXTVIEW_LAYOUT,
@@ -851,9 +931,8 @@ class PostsViewList:
                         comment_description.child().click()
                         return True, is_ad, is_hashtag
                 UniversalActions(self.device)._swipe_points(direction=Direction.UP)
-                post_owner_obj = self.device.find(
-                    resourceIdMatches=ResourceID.ROW_FEED_PHOTO_PROFILE_NAME,
-                )
+                post = self._current_post()
+                post_owner = post.owner
             else:
                 post_owner_clickable = True
                 break
@@ -863,34 +942,41 @@ class PostsViewList:
             return False, is_ad, is_hashtag
         if mode == Owner.OPEN:
             logger.info("Open post owner.")
+            post_owner_obj = self._post_owner_view(post, post_owner)
             PostsViewList(self.device)._if_action_bar_is_over_obj_swipe(post_owner_obj)
             post_owner_obj.click()
             return True, is_ad, is_hashtag
         elif mode == Owner.GET_NAME:
             if current_job == "feed":
-                is_ad, is_hashtag, username = PostsViewList(
-                    self.device
-                )._check_if_ad_or_hashtag(post_owner_obj)
+                ad_or_hashtag = post.ad_or_hashtag(post_owner)
+                if ad_or_hashtag is None:
+                    ad_or_hashtag = self._check_if_ad_or_hashtag(
+                        self._post_owner_view(post, post_owner)
+                    )
+                is_ad, is_hashtag, username = ad_or_hashtag
             if username is None:
-                username = (
-                    post_owner_obj.get_text().replace("•", "").strip().split(" ", 1)[0]
-                )
+                username = FeedPost.username_of(post_owner)
             return username, is_ad, is_hashtag
 
         elif mode == Owner.GET_POSITION:
-            return post_owner_obj.get_bounds(), is_ad
+            return dict(post_owner.bounds), is_ad
         else:
             return None, is_ad, is_hashtag
 
+    def _post_owner_view(self, post: FeedPost, post_owner):
+        """the view of an owner of the snapshot, for what needs the device"""
+        return self.device.find(
+            index=post.owners.index(post_owner), selector=Selectors.POST_OWNER
+        )
+
     def _get_post_owner_name(self):
         return self.device.find(
             resourceIdMatches=ResourceID.ROW_FEED_PHOTO_PROFILE_NAME
         ).get_text()
 
     def _get_media_container(self):
-        media = self.device.find(resourceIdMatches=ResourceID.CAROUSEL_AND_MEDIA_GROUP)
-        content_desc = media.get_desc() if media.exists() else None
-        return media, content_desc
+        media = self.device.find(selector=Selectors.CAROUSEL_AND_MEDIA_GROUP)
+        return media, self._current_post().media_desc
 
     @staticmethod
     def detect_media_type(content_desc) -> Tuple[Optional[MediaType], Optional[int]]:
@@ -899,45 +985,23 @@ class PostsViewList:
         :return: MediaType and count
         :rtype: MediaType, int
         """
-        obj_count = 1
-        if content_desc is None:
-            return None, None
-        if re.match(r"^,|^\s*$", content_desc, re.IGNORECASE):
+        media_type, obj_count = classify_media(content_desc)
+        PostsViewList.log_media_type(content_desc, media_type)
+        return media_type, obj_count
+
+    @staticmethod
+    def log_media_type(content_desc, media_type: Optional[MediaType]):
+        if media_type == MediaType.UNKNOWN:
             logger.info(
                 "That media is missing content description, so I don't know which kind of video it is."
             )
-            media_type = MediaType.UNKNOWN
-        elif re.match(r"^Photo|^Hidden Photo", content_desc, re.IGNORECASE):
-            logger.info("It's a photo.")
-            media_type = MediaType.PHOTO
-        elif re.match(r"^Video|^Hidden Video", content_desc, re.IGNORECASE):
-            logger.info("It's a video.")
-            media_type = MediaType.VIDEO
-        elif re.match(r"^IGTV", content_desc, re.IGNORECASE):
-            logger.info("It's a IGTV.")
-            media_type = MediaType.IGTV
-        elif re.match(r"^Reel", content_desc, re.IGNORECASE):
-            logger.info("It's a Reel.")
-            media_type = MediaType.REEL
-        else:
-            carousel_obj = re.finditer(
-                r"((?P<photo>\d+) photo)|((?P<video>\d+) video)",
-                content_desc,
-                re.IGNORECASE,
-            )
-            n_photos = 0
-            n_videos = 0
-            for match in carousel_obj:
-                if match.group("photo"):
-                    n_photos = int(match.group("photo"))
-                if match.group("video"):
-                    n_videos = int(match.group("video"))
+        elif media_type == MediaType.CAROUSEL:
+            n_photos, n_videos = carousel_counts(content_desc)
             logger.info(
                 f"It's a carousel with {n_photos} photo(s) and {n_videos} video(s)."
             )
-            obj_count = n_photos + n_videos
-            media_type = MediaType.CAROUSEL
-        return media_type, obj_count
+        elif media_type is not None:
+            logger.info(f"It's a {_MEDIA_TYPE_NAMES[media_type]}.")
 
     def _like_in_post_view(
         self,
@@ -1031,12 +1095,8 @@ class PostsViewList:
     def _check_if_ad_or_hashtag(
         self, post_owner_obj
     ) -> Tuple[bool, bool, Optional[str]]:
-        is_hashtag = False
-        is_ad = False
         logger.debug("Checking if it's an AD or an hashtag..")
-        ad_like_obj = post_owner_obj.sibling(
-            resourceId=ResourceID.SECONDARY_LABEL,
-        )
+        ad_like_obj = post_owner_obj.sibling(**Selectors.POST_OWNER_LABEL.kwargs)
 
         owner_name = post_owner_obj.get_text() or post_owner_obj.get_desc() or ""
         if not owner_name:
@@ -1053,19 +1113,10 @@ class PostsViewList:
                 logger.error(
                     "You need to install Tesseract (the engine: it depends on your system) in order to use OCR feature."
                 )
-        if owner_name.startswith("#"):
-            is_hashtag = True
-            logger.debug("Looks like an hashtag, skip.")
+        ad_like_txt = None
         if ad_like_obj.exists():
-            sponsored_txt = "Sponsored"
             ad_like_txt = ad_like_obj.get_text() or ad_like_obj.get_desc()
-            if ad_like_txt.casefold() == sponsored_txt.casefold():
-                logger.debug("Looks like an AD, skip.")
-                is_ad = True
-            elif is_hashtag:
-                owner_name = owner_name.split("•")[0].strip()
-
-        return is_ad, is_hashtag, owner_name
+        return FeedPost.classify_owner(owner_name, ad_like_txt)
 
     def get_text_from_screen(self, pt, obj) -> Optional[str]:
 
@@ -1288,9 +1339,7 @@ class OpenedPostView:
         :return: post has been liked
         :rtype: bool
         """
-        post_media_view = self.device.find(
-            resourceIdMatches=case_insensitive_re(ResourceID.MEDIA_CONTAINER)
-        )
+        post_media_view = self.device.find(selector=Selectors.MEDIA_CONTAINER)
         liked = False
         if post_media_view.exists():
             logger.info("Liking post.")
@@ -1319,9 +1368,7 @@ class OpenedPostView:
         :return: has play button been pressed
         :rtype: bool
         """
-        play_button = self.device.find(
-            resourceIdMatches=case_insensitive_re(ResourceID.VIEW_PLAY_BUTTON)
-        )
+        play_button = self.device.find(selector=Selectors.PLAY_BUTTON)
         if play_button.exists(Timeout.TINY):
             logger.debug("Pressing on play button.")
             play_button.click()
@@ -1334,9 +1381,7 @@ class OpenedPostView:
         :return: video in full-screen mode
         :rtype: bool
         """
-        post_media_view = self.device.find(
-            resourceIdMatches=case_insensitive_re(ResourceID.MEDIA_CONTAINER)
-        )
+        post_media_view = self.device.find(selector=Selectors.MEDIA_CONTAINER)
         in_fullscreen = False
         if post_media_view.exists():
             logger.info("Going in full screen.")
@@ -1398,28 +1443,20 @@ class OpenedPostView:
         """
         Check if video is in full-screen mode
         """
-        video_container = self.device.find(
-            resourceIdMatches=case_insensitive_re(
-                ResourceID.VIDEO_CONTAINER_AND_CLIPS_VIDEO_CONTAINER
-            )
-        )
+        video_container = self.device.find(selector=Selectors.VIDEO_CONTAINER)
         return video_container.exists(), video_container
 
     def _is_video_liked(self) -> Tuple[Optional[bool], Optional[DeviceFacade.View]]:
         """
         Check if video has been liked
         """
-        like_button = self.device.find(
-            resourceIdMatches=case_insensitive_re(ResourceID.LIKE_BUTTON)
-        )
+        like_button = self.device.find(selector=Selectors.LIKE_BUTTON)
         if like_button.exists():
             return like_button.get_selected(), like_button
         return False, None
 
     def _has_tags(self) -> bool:
-        tags_icon = self.device.find(
-            resourceIdMatches=case_insensitive_re(ResourceID.INDICATOR_ICON_VIEW)
-        )
+        tags_icon = self.device.find(selector=Selectors.TAGS_ICON)
         self.has_tags = tags_icon.exists()
         return self.has_tags
 
@@ -1429,9 +1466,7 @@ class OpenedPostView:
         :return: video has been liked
         :rtype: bool
         """
-        sidebar = self.device.find(
-            resourceIdMatches=case_insensitive_re(ResourceID.UFI_STACK)
-        )
+        sidebar = self.device.find(selector=Selectors.UFI_STACK)
         liked = False
         full_screen, obj = self._is_video_in_fullscreen()
         if full_screen:
@@ -1482,13 +1517,143 @@ class OpenedPostView:
         return text in ["Following", "Requested"]
 
 
+class GridCell:
+    """a post of the profile grid, as the snapshot shows it"""
+
+    def __init__(self, row: int, column: int, node, visible_bounds: dict):
+        self.row = row
+        self.column = column
+        self.bounds = node.bounds
+        self.visible_bounds = visible_bounds
+        self.fully_visible = visible_bounds == node.bounds
+        self.content_desc = node.content_desc
+        self._media = None
+
+    @property
+    def media(self) -> Tuple[Optional[MediaType], Optional[int]]:
+        """media type and count, worked out for the posts we open only"""
+        if self._media is None:
+            self._media = PostsViewList.detect_media_type(self.content_desc)
+        return self._media
+
+    def random_point(self) -> Tuple[int, int]:
+        bounds = self.visible_bounds
+        x_offset = uniform(0.15, 0.85)
+        y_offset = uniform(0.15, 0.85)
+        return (
+            int(bounds["left"] + (bounds["right"] - bounds["left"]) * x_offset),
+            int(bounds["top"] + (bounds["bottom"] - bounds["top"]) * y_offset),
+        )
+
+
+class PostGrid:
+    """the posts grid of a profile, read from a single hierarchy dump"""
+
+    COLUMNS = 3
+    # the rows of posts start at this index of the list
+    ROW_OFFSET = 1
+    # no more rows are looked at, 12 likes per user at most
+    MAX_ROWS = 4
+
+    def __init__(self, hierarchy: Hierarchy):
+        self.cells: List[GridCell] = []
+        self._medias: Optional[Dict[Tuple[int, int], MediaInfo]] = None
+        nodes = hierarchy.resolve(
+            Selectors.POST_GRID.kwargs, key=Selectors.POST_GRID.key
+        )
+        self.bounds = nodes[0].bounds if nodes else None
+        if not nodes:
+            return
+        for row_node in nodes[0].children:
+            if row_node.index < self.ROW_OFFSET:
+                continue
+            for cell_node in row_node.children:
+                visible_bounds = self._clip(cell_node.bounds)
+                if cell_node.visible and visible_bounds is not None:
+                    self.cells.append(
+                        GridCell(
+                            row_node.index - self.ROW_OFFSET,
+                            cell_node.index,
+                            cell_node,
+                            visible_bounds,
+                        )
+                    )
+
+    @classmethod
+    def load(cls, device: DeviceFacade) -> "PostGrid":
+        grid = cls(device.get_snapshot())
+        if grid.bounds is None and device.find(selector=Selectors.POST_GRID).exists(
+            Timeout.MEDIUM
+        ):
+            grid = cls(device.get_snapshot(refresh=True))
+        return grid
+
+    def _clip(self, bounds: dict) -> Optional[dict]:
+        """the part of the cell inside the list, None when there's nothing of it"""
+        clipped = {
+            "left": max(bounds["left"], self.bounds["left"]),
+            "top": max(bounds["top"], self.bounds["top"]),
+            "right": min(bounds["right"], self.bounds["right"]),
+            "bottom": min(bounds["bottom"], self.bounds["bottom"]),
+        }
+        if clipped["left"] >= clipped["right"] or clipped["top"] >= clipped["bottom"]:
+            return None
+        return clipped
+
+    def medias(self) -> Dict[Tuple[int, int], MediaInfo]:
+        """media type and count of every post in view, by row and column"""
+        if self._medias is None:
+            medias = classify_medias(cell.content_desc for cell in self.cells)
+            self._medias = {
+                (cell.row, cell.column): media
+                for cell, media in zip(self.cells, medias)
+            }
+        return self._medias
+
+    def cell(self, row: int, column: int) -> Optional[GridCell]:
+        for cell in self.cells:
+            if cell.row == row and cell.column == column:
+                return cell
+        return None
+
+    def _first_full_row(self) -> Optional[int]:
+        rows = [cell.row for cell in self.cells if cell.fully_visible]
+        return min(rows) if rows else None
+
+    def visible_cell(self, row: int, column: int) -> Optional[GridCell]:
+        """the fully visible post, rows counted from the first fully visible one"""
+        first_row = self._first_full_row()
+        if first_row is None:
+            return None
+        cell = self.cell(first_row + row, column)
+        return cell if cell is not None and cell.fully_visible else None
+
+    def shape(self) -> Tuple[int, int]:
+        """rows filled with fully visible posts, from the first of them wherever
+        it is, and the number of fully visible posts after them"""
+        first_row = self._first_full_row()
+        if first_row is None:
+            return 0, 0
+        full_rows = 0
+        while full_rows < self.MAX_ROWS:
+            in_row = sum(
+                1
+                for cell in self.cells
+                if cell.row == first_row + full_rows and cell.fully_visible
+            )
+            if in_row < self.COLUMNS:
+                return full_rows, in_row
+            full_rows += 1
+        return full_rows, 0
+
+
 class PostsGridView:
     def __init__(self, device: DeviceFacade):
         self.device = device
 
     def scrollDown(self):
         coordinator_layout = self.device.find(
-            resourceIdMatches=case_insensitive_re(ResourceID.COORDINATOR_ROOT_LAYOUT)
+            selector=Selectors.COORDINATOR_ROOT_LAYOUT
         )
         if coordinator_layout.exists():
             coordinator_layout.scroll(Direction.DOWN)
@@ -1497,25 +1662,110 @@ class PostsGridView:
         return False
 
     def _get_post_view(self):
-        return self.device.find(resourceIdMatches=case_insensitive_re(ResourceID.LIST))
+        return self.device.find(selector=Selectors.POST_GRID)
 
     def navigateToPost(self, row, col):
-        post_list_view = self._get_post_view()
-        post_list_view.wait(Timeout.MEDIUM)
-        OFFSET = 1  # row with post starts from index 1
-        row_view = post_list_view.child(index=row + OFFSET)
-        if not row_view.exists():
+        grid = PostGrid.load(self.device)
+        cell = grid.visible_cell(row, col)
+        if cell is None:
             return None, None, None
-        post_view = row_view.child(index=col)
-        if not post_view.exists():
-            return None, None, None
-        content_desc = post_view.ui_info()["contentDescription"]
-        media_type, obj_count = PostsViewList.detect_media_type(content_desc)
-        post_view.click()
+        media_type, obj_count = grid.medias()[(cell.row, cell.column)]
+        PostsViewList.log_media_type(cell.content_desc, media_type)
+        self._get_post_view().click(Location.CUSTOM, coord=cell.random_point())
 
         return OpenedPostView(self.device), media_type, obj_count
 
 
+class ProfileHeader:
+    """what the header of a profile shows, read from a single hierarchy dump:
+    an element which isn't there is missing right away, nothing to wait for"""
+
+    def __init__(self, hierarchy: Hierarchy):
+        self.hierarchy = hierarchy
+        follow_context = self._text(Selectors.FOLLOW_CONTEXT)
+        self.mutual_friends = (
+            0 if follow_context is None else self.parse_mutual_friends(follow_context)
+        )
+        follow_button = self._text(Selectors.FOLLOW_BUTTON)
+        if follow_button is None:
+            logger.warning(
+                "The follow button doesn't exist! Maybe the profile is not loaded!"
+            )
+            self.follow_status = FollowStatus.NONE
+        else:
+            self.follow_status = self.parse_follow_status(follow_button)
+        self.is_private = self._exists(Selectors.PRIVATE_PROFILE)
+        self.has_business_category = self._exists(Selectors.BUSINESS_CATEGORY)
+        self.posts_count = self._counter(Selectors.POST_COUNT, "posts")
+        self.biography = self._text(Selectors.BIOGRAPHY) or ""
+        self.link_in_bio = self._text(Selectors.WEBSITE) or None
+        self.fullname = self._text(Selectors.FULL_NAME) or ""
+        self.followers = self._counter(Selectors.FOLLOWERS_COUNT, "followers")
+        self.followings = self._counter(Selectors.FOLLOWING_COUNT, "following")
+
+    def _nodes(self, selector):
+        return self.hierarchy.resolve(selector.kwargs, key=selector.key)
+
+    def _exists(self, selector) -> bool:
+        return bool(self._nodes(selector))
+
+    def _text(self, selector) -> Optional[str]:
+        nodes = self._nodes(selector)
+        return nodes[0].text if nodes else None
+
+    def _counter(self, selector, name: str) -> Optional[int]:
+        text = self._text(selector)
+        if not text:
+            logger.error(f"Cannot get {name} count text.")
+            return None
+        return self.parse_counter(text)
+
+    @property
+    def is_biography_truncated(self) -> bool:
+        """a long biography ends with "… more", the whole text needs a click"""
+        return _LONG_BIO_RE.search(self.biography) is not None
+
+    @staticmethod
+    def parse_counter(raw_text: str) -> Optional[int]:
+        multiplier = 1
+        text = _COUNTER_RE.sub(".", raw_text)
+        if "K" in text:
+            value = float(text.replace("K", ""))
+            multiplier = 1_000
+        elif "M" in text:
+            value = float(text.replace("M", ""))
+            multiplier = 1_000_000
+        else:
+            try:
+                value = int(text.replace(".", ""))
+            except ValueError:
+                logger.error(f"Cannot parse {repr(raw_text)}.")
+                return None
+        return int(value * multiplier)
+
+    @staticmethod
+    def parse_mutual_friends(text: str) -> int:
+        n_others = 0
+        n_extra = 0
+        for match in _MUTUAL_FRIENDS_RE.finditer(text):
+            if match.group("others"):
+                n_others = int(match.group("others"))
+            if match.group("extra"):
+                n_extra = 2
+        if n_others != 0:
+            return n_others + n_extra if n_extra != 0 else n_others + 1
+        return n_extra if n_extra != 0 else 1
+
+    @staticmethod
+    def parse_follow_status(button_text: str) -> FollowStatus:
+        button_text = button_text.casefold()
+        if button_text in ["following", "requested"]:
+            return FollowStatus.FOLLOWING
+        elif button_text == "follow back":
+            return FollowStatus.FOLLOW_BACK
+        return FollowStatus.FOLLOW
+
+
 class ProfileView(ActionBarView):
     def __init__(self, device: DeviceFacade, is_own_profile=False):
         super().__init__(device)
@@ -1530,19 +1780,7 @@ class ProfileView(ActionBarView):
         return OptionsView(self.device)
 
     def _getActionBarTitleBtn(self, watching_stories=False):
-        bar = case_insensitive_re(
-            [
-                ResourceID.TITLE_VIEW,
-                ResourceID.ACTION_BAR_TITLE,
-                ResourceID.ACTION_BAR_LARGE_TITLE,
-                ResourceID.ACTION_BAR_TEXTVIEW_TITLE,
-                ResourceID.ACTION_BAR_TITLE_AUTO_SIZE,
-                ResourceID.ACTION_BAR_LARGE_TITLE_AUTO_SIZE,
-            ]
-        )
-        action_bar = self.device.find(
-            resourceIdMatches=bar,
-        )
+        action_bar = self.device.find(selector=Selectors.ACTION_BAR_TITLE)
         if not watching_stories and action_bar.exists(Timeout.LONG) or watching_stories:
             return action_bar
         logger.error(
@@ -1606,29 +1844,27 @@ class ProfileView(ActionBarView):
         return found
 
     def click_on_avatar(self):
-        while True:
-            if self._new_ui_profile_button():
-                break
-            if self._old_ui_profile_button():
-                break
+        while not self.device.first_alternative(
+            "profile_avatar",
+            {
+                "profile_button": self._new_ui_profile_button,
+                "tab_avatar": self._old_ui_profile_button,
+            },
+        ):
             self.device.back()
 
+    def getHeader(self) -> ProfileHeader:
+        """the whole header in a single dump, once the profile is loaded"""
+        return ProfileHeader(self.device.get_snapshot(refresh=True))
+
     def getFollowButton(self):
-        button_regex = f"{ClassName.BUTTON}|{ClassName.TEXT_VIEW}"
-        following_regex_all = "^following|^requested|^follow back|^follow"
         following_or_follow_back_button = self.device.find(
-            classNameMatches=button_regex,
-            clickable=True,
-            textMatches=case_insensitive_re(following_regex_all),
+            selector=Selectors.FOLLOW_BUTTON
         )
         if following_or_follow_back_button.exists(Timeout.MEDIUM):
-            button_text = following_or_follow_back_button.get_text().casefold()
-            if button_text in ["following", "requested"]:
-                button_status = FollowStatus.FOLLOWING
-            elif button_text == "follow back":
-                button_status = FollowStatus.FOLLOW_BACK
-            else:
-                button_status = FollowStatus.FOLLOW
+            button_status = ProfileHeader.parse_follow_status(
+                following_or_follow_back_button.get_text()
+            )
             return following_or_follow_back_button, button_status
         else:
             logger.warning(
@@ -1645,7 +1881,7 @@ class ProfileView(ActionBarView):
         return None
 
     def getLinkInBio(self):
-        obj = self.device.find(resourceIdMatches=ResourceID.PROFILE_HEADER_WEBSITE)
+        obj = self.device.find(selector=Selectors.WEBSITE)
         if obj.exists():
             website = obj.get_text()
             return website if website != "" else None
@@ -1653,57 +1889,16 @@ class ProfileView(ActionBarView):
 
     def getMutualFriends(self) -> int:
         logger.debug("Looking for mutual friends tab.")
-        follow_context = self.device.find(
-            resourceIdMatches=ResourceID.PROFILE_HEADER_FOLLOW_CONTEXT_TEXT
-        )
+        follow_context = self.device.find(selector=Selectors.FOLLOW_CONTEXT)
         if follow_context.exists():
-            text = follow_context.get_text()
-            mutual_friends = re.finditer(
-                r"((?P<others>\s\d+\s)|(?P<extra>,))",
-                text,
-                re.IGNORECASE,
-            )
-            n_others = 0
-            n_extra = 0
-            for match in mutual_friends:
-                if match.group("others"):
-                    n_others = int(match.group("others"))
-                if match.group("extra"):
-                    n_extra = 2
-            if n_others != 0:
-                mutual_friends = n_others + n_extra if n_extra != 0 else n_others + 1
-            else:
-                mutual_friends = n_extra if n_extra != 0 else 1
-        else:
-            mutual_friends = 0
-        return mutual_friends
+            return ProfileHeader.parse_mutual_friends(follow_context.get_text())
+        return 0
 
     def _parseCounter(self, raw_text: str) -> Optional[int]:
-        multiplier = 1
-        regex = r"(?!(K|M|\.))\D+"
-        subst = "."
-        text = re.sub(regex, subst, raw_text)
-        if "K" in text:
-            value = float(text.replace("K", ""))
-            multiplier = 1_000
-        elif "M" in text:
-            value = float(text.replace("M", ""))
-            multiplier = 1_000_000
-        else:
-            try:
-                value = int(text.replace(".", ""))
-            except ValueError:
-                logger.error(f"Cannot parse {repr(raw_text)}.")
-                return None
-        return int(value * multiplier)
+        return ProfileHeader.parse_counter(raw_text)
 
     def _getFollowersTextView(self):
-        followers_text_view = self.device.find(
-            resourceIdMatches=case_insensitive_re(
-                ResourceID.ROW_PROFILE_HEADER_TEXTVIEW_FOLLOWERS_COUNT
-            ),
-            className=ClassName.TEXT_VIEW,
-        )
+        followers_text_view = self.device.find(selector=Selectors.FOLLOWERS_COUNT)
         followers_text_view.wait(Timeout.MEDIUM)
         return followers_text_view
 
@@ -1722,12 +1917,7 @@ class ProfileView(ActionBarView):
         return followers
 
     def _getFollowingTextView(self):
-        following_text_view = self.device.find(
-            resourceIdMatches=case_insensitive_re(
-                ResourceID.ROW_PROFILE_HEADER_TEXTVIEW_FOLLOWING_COUNT
-            ),
-            className=ClassName.TEXT_VIEW,
-        )
+        following_text_view = self.device.find(selector=Selectors.FOLLOWING_COUNT)
         following_text_view.wait(Timeout.MEDIUM)
         return following_text_view
 
@@ -1746,11 +1936,7 @@ class ProfileView(ActionBarView):
         return following
 
     def getPostsCount(self) -> int:
-        post_count_view = self.device.find(
-            resourceIdMatches=case_insensitive_re(
-                ResourceID.ROW_PROFILE_HEADER_TEXTVIEW_POST_COUNT
-            )
-        )
+        post_count_view = self.device.find(selector=Selectors.POST_COUNT)
         if post_count_view.exists(Timeout.MEDIUM):
             count = post_count_view.get_text()
             if count is not None:
@@ -1760,23 +1946,7 @@ class ProfileView(ActionBarView):
 
     def count_photo_in_view(self) -> Tuple[int, int]:
         """return rows filled and the number of post in the last row"""
-        views = f"({ClassName.RECYCLER_VIEW}|{ClassName.VIEW})"
-        grid_post = self.device.find(
-            classNameMatches=views, resourceIdMatches=ResourceID.LIST
-        )
-        if not grid_post.exists(Timeout.MEDIUM):
-            return 0, 0
-        for i in range(2, 6):
-            lin_layout = grid_post.child(index=i, className=ClassName.LINEAR_LAYOUT)
-            if i == 5 or not lin_layout.exists():
-                last_index = i - 1
-                last_lin_layout = grid_post.child(index=last_index)
-                for n in range(1, 4):
-                    if n == 3 or not last_lin_layout.child(index=n).exists():
-                        if n == 3:
-                            return last_index, 0
-                        else:
-                            return last_index - 1, n
+        return PostGrid.load(self.device).shape()
 
     def getProfileInfo(self):
         username = self.getUsername()
@@ -1787,16 +1957,11 @@ class ProfileView(ActionBarView):
         return username, posts, followers, following
 
     def getProfileBiography(self) -> str:
-        biography = self.device.find(
-            resourceIdMatches=case_insensitive_re(ResourceID.PROFILE_HEADER_BIO_TEXT),
-            className=ClassName.TEXT_VIEW,
-        )
+        biography = self.device.find(selector=Selectors.BIOGRAPHY)
         if biography.exists():
             biography_text = biography.get_text()
             # If the biography is very long, blabla text and end with "...more" click the bottom of the text and get the new text
-            is_long_bio = re.compile(
-                r"{0}$".format("… more"), flags=re.IGNORECASE
-            ).search(biography_text)
+            is_long_bio = _LONG_BIO_RE.search(biography_text)
             if is_long_bio is not None:
                 logger.debug('Found "… more" in bio - trying to expand')
                 username = self.getUsername()
@@ -1812,10 +1977,7 @@ class ProfileView(ActionBarView):
         return ""
 
     def getFullName(self):
-        full_name_view = self.device.find(
-            resourceIdMatches=case_insensitive_re(ResourceID.PROFILE_HEADER_FULL_NAME),
-            className=ClassName.TEXT_VIEW,
-        )
+        full_name_view = self.device.find(selector=Selectors.FULL_NAME)
         if full_name_view.exists(Timeout.SHORT):
             fullname_text = full_name_view.get_text()
             if fullname_text is not None:
@@ -1823,15 +1985,7 @@ class ProfileView(ActionBarView):
         return ""
 
     def isPrivateAccount(self):
-        private_profile_view = self.device.find(
-            resourceIdMatches=case_insensitive_re(
-                [
-                    ResourceID.PRIVATE_PROFILE_EMPTY_STATE,
-                    ResourceID.ROW_PROFILE_HEADER_EMPTY_PROFILE_NOTICE_TITLE,
-                    ResourceID.ROW_PROFILE_HEADER_EMPTY_PROFILE_NOTICE_CONTAINER,
-                ]
-            )
-        )
+        private_profile_view = self.device.find(selector=Selectors.PRIVATE_PROFILE)
         return private_profile_view.exists()
 
     def StoryRing(self) -> DeviceFacade.View:
@@ -1897,7 +2051,7 @@ class ProfileView(ActionBarView):
     def swipe_to_fit_posts(self):
         logger.debug("swipe_to_fit_posts")
         """calculate the right swipe amount necessary to see 12 photos"""
-        displayWidth = self.device.get_info()["displayWidth"]
+        displayWidth = self.device.display.width
         element_to_swipe_over_obj = self.device.find(
             resourceIdMatches=ResourceID.PROFILE_TABS_CONTAINER
         )
@@ -2087,7 +2241,7 @@ class CurrentStoryView:
         )
         if reel_viewer_timestamp.exists():
             timestamp = reel_viewer_timestamp.get_text().strip()
-            value = int(re.sub("[^0-9]", "", timestamp))
+            value = int(_NOT_DIGITS_RE.sub("", timestamp))
             if timestamp[-1] == "s":
                 return datetime.timestamp(
                     datetime.datetime.now() - datetime.timedelta(seconds=value)
@@ -2120,8 +2274,8 @@ class UniversalActions:
         delta_y=450,
     ) -> None:
         logger.debug("_swipe_points")
-        displayWidth = self.device.get_info()["displayWidth"]
-        displayHeight = self.device.get_info()["displayHeight"]
+        displayWidth = self.device.display.width
+        displayHeight = self.device.display.height
         middle_point_x = displayWidth / 2
         if start_point_y == -1:
             start_point_y = displayHeight / 2
@@ -2177,6 +2331,11 @@ class UniversalActions:
         logger.debug("Checking for block...")
         if "blocked" in device.deviceV2.toast.get_message(1.0, 2.0, default=""):
             logger.warning("Toast detected!")
+        if device.popups is not None:
+            # the rules of PopupWatcher run on every fresh dump, without
+            # snapshots this is the only one taken
+            device.get_snapshot(refresh=True)
+            return False
         serius_block = device.find(
             className=ClassName.IMAGE,
             textMatches=case_insensitive_re("Force reset password icon"),
@@ -2192,8 +2351,7 @@ class UniversalActions:
         popup_appears = block_dialog.exists()
         if popup_appears:
             if popup_body.exists():
-                regex = r".+deleted"
-                is_post_deleted = re.match(regex, popup_body.get_text(), re.IGNORECASE)
+                is_post_deleted = _POST_DELETED_RE.match(popup_body.get_text())
                 if is_post_deleted:
                     logger.info(f"{is_post_deleted.group()}")
                     logger.debug("Click on OK button.")
@@ -0,0 +1,115 @@
+import json
+import logging
+import os
+from collections import deque
+from time import perf_counter, sleep
+from typing import Callable, Dict, Tuple
+
+from atomicwrites import atomic_write
+
+logger = logging.getLogger(__name__)
+
+WAITS_DIR = "devices"
+
+
+class LatencyHistogram:
+    """last appearance latencies of a selector, in seconds"""
+
+    SIZE = 50
+
+    def __init__(self, samples=()):
+        self.samples = deque(samples, maxlen=self.SIZE)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def add(self, latency: float):
+        self.samples.append(latency)
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class AdaptiveWaits:
+    """Deadlines for exists()/wait() learned from how long each selector took to show up.
+    A wait also ends early when the screen stops changing without the element."""
+
+    PERCENTILE = 0.95
+    MIN_SAMPLES = 5
+    # deadline = max(MIN_DEADLINE, percentile * MARGIN), never above the Timeout asked
+    MARGIN = 2.0
+    MIN_DEADLINE = 1.0
+    STABLE_FOR = 1.5
+    POLL_INTERVAL = 0.3
+
+    def __init__(self, serial: str):
+        self.path = os.path.join(WAITS_DIR, f"{serial}", "waits.json")
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.saved_seconds = 0.0
+        self.load()
+
+    @staticmethod
+    def key(selector: dict) -> str:
+        return json.dumps(
+            {k: v for k, v in selector.items() if k != "mask"}, sort_keys=True
+        )
+
+    def deadline(self, key: str, ceiling: float) -> float:
+        histogram = self.histograms.get(key)
+        if histogram is None or len(histogram) < self.MIN_SAMPLES:
+            return ceiling
+        learned = max(
+            self.MIN_DEADLINE, histogram.percentile(self.PERCENTILE) * self.MARGIN
+        )
+        return min(ceiling, learned)
+
+    def record(self, key: str, latency: float):
+        self.histograms.setdefault(key, LatencyHistogram()).add(latency)
+
+    def wait_for(
+        self, key: str, ceiling: float, probe: Callable[[], Tuple[bool, int]]
+    ) -> bool:
+        """probe() returns (element found, fingerprint of the screen)"""
+        start = perf_counter()
+        deadline = self.deadline(key, ceiling)
+        fingerprint = None
+        stable_since = 0.0
+        while True:
+            found, current = probe()
+            elapsed = perf_counter() - start
+            if found:
+                self.record(key, elapsed)
+                return True
+            if elapsed >= deadline:
+                break
+            if current != fingerprint:
+                fingerprint = current
+                stable_since = elapsed
+            elif elapsed - stable_since >= self.STABLE_FOR:
+                logger.debug(
+                    f"Screen is stable since {self.STABLE_FOR}s, stop waiting."
+                )
+                break
+            sleep(self.POLL_INTERVAL)
+        self.saved_seconds += max(0.0, ceiling - (perf_counter() - start))
+        return False
+
+    def load(self):
+        if not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Can't load learned waits from {self.path}: {e}")
+            return
+        self.histograms = {
+            key: LatencyHistogram(samples) for key, samples in data.items()
+        }
+        logger.debug(f"Loaded learned waits of {len(self.histograms)} selector(s).")
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with atomic_write(self.path, overwrite=True, encoding="utf-8") as f:
+            json.dump({key: list(h.samples) for key, h in self.histograms.items()}, f)
@@ -10,9 +10,9 @@ from GramAddict.core.resources import ClassName
 from GramAddict.core.resources import ResourceID as resources
 from GramAddict.core.scroll_end_detector import ScrollEndDetector
 from GramAddict.core.storage import FollowingStatus
+from GramAddict.core.user_rows import get_user_rows
 from GramAddict.core.utils import (
     get_value,
-    inspect_current_view,
     random_sleep,
     save_crash,
 )
@@ -311,21 +311,17 @@ class ActionUnfollowFollowers(Plugin):
                 resourceIdMatches=self.ResourceID.USER_LIST_CONTAINER,
             )
             checked_user_count = 0
-            row_height, n_users = inspect_current_view(user_list)
-            for item in user_list:
-                cur_row_height = item.get_height()
-                if cur_row_height < row_height:
+            for row in get_user_rows(device, user_list, self.ResourceID):
+                if not row.fully_visible:
                     continue
-                user_info_view = item.child(index=1)
-                user_name_view = user_info_view.child(index=0).child()
-                if not user_name_view.exists():
+                if row.username is None:
                     logger.info(
                         "Next item not found: probably reached end of the screen.",
                         extra={"color": f"{Fore.GREEN}"},
                     )
                     break
 
-                username = user_name_view.get_text()
+                username = row.username
                 screen_iterated_followings.append(username)
                 if username not in checked:
                     checked[username] = None
@@ -385,7 +381,7 @@ class ActionUnfollowFollowers(Plugin):
                         UnfollowRestriction.FOLLOWED_BY_SCRIPT,
                     ]:
                         unfollowed = FollowingView(device).do_unfollow_from_list(
-                            user_row=item, username=username
+                            user_row=row.view, username=username
                         )
                     if unfollow_restriction in [
                         UnfollowRestriction.NON_FOLLOWERS_NOT_FOLLOWED_BY_SCRIPT,
@@ -200,6 +200,20 @@ class CoreArguments(Plugin):
                 "help": "enable screen recording for debugging",
                 "action": "store_true",
             },
+            {
+                "arg": "--screen-record-seconds",
+                "nargs": None,
+                "help": "seconds of screen recording saved with a crash, 30 by default",
+                "metavar": "30",
+                "default": "30",
+            },
+            {
+                "arg": "--screen-record-memory",
+                "nargs": None,
+                "help": "max memory in MB taken by the screen recording, older frames are dropped first, 50 by default",
+                "metavar": "50",
+                "default": "50",
+            },
             {
                 "arg": "--close-apps",
                 "help": "close all apps except IG, to avoid interference",
@@ -408,4 +422,39 @@ class CoreArguments(Plugin):
                 "help": "don't ask the user to press enter to continue with an untested IG version",
                 "action": "store_true",
             },
+            {
+                "arg": "--hierarchy-snapshot",
+                "help": "dump the screen hierarchy once and answer the selectors locally until the next click, swipe, back or text input",
+                "action": "store_true",
+            },
+            {
+                "arg": "--learn-selectors",
+                "help": "when an element can be found in several ways depending on the Instagram version, remember the one that worked and try it first next time, saved per device and version in devices/",
+                "action": "store_true",
+            },
+            {
+                "arg": "--popup-watcher",
+                "help": "look for popups and dialogs in every dump of the screen (only when the bot checks for blocks without hierarchy-snapshot) instead of one by one after each action: crash popups and deleted post dialogs are closed, blocks stop the session right away",
+                "action": "store_true",
+            },
+            {
+                "arg": "--deep-links",
+                "help": "open users, hashtags and places (given by their location id) with an Instagram link instead of typing them in the search, which is still used when the link doesn't work",
+                "action": "store_true",
+            },
+            {
+                "arg": "--adaptive-waits",
+                "help": "learn how long each element takes to appear on this device and stop waiting earlier for the ones that won't come",
+                "action": "store_true",
+            },
+            {
+                "arg": "--rpc-stats",
+                "help": "measure the latency of every call to the device and print it per job and per call site at the end of each session, saved in accounts/<username>/rpc_stats",
+                "action": "store_true",
+            },
+            {
+                "arg": "--record-trace",
+                "help": "record every call to the device with its answer in traces/, to replay the session without the phone. The trace is added to the crash archives",
+                "action": "store_true",
+            },
         ]
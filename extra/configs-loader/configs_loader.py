@@ -1,3 +1,5 @@
+# `gramaddict fleet configs-list.yml` runs these configs in a single process,
+# one worker per device at the same time. This script is kept for old setups.
 import logging
 from enum import Enum, auto
 from itertools import cycle
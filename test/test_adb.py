@@ -0,0 +1,75 @@
+import socketserver
+import threading
+
+import pytest
+
+from GramAddict.core.adb import AdbClient, AdbError
+
+SHELL_OUTPUTS = {
+    "settings get system screen_off_timeout": "60000\n",
+    "dumpsys input_method": "  mInputShown=true\n",
+}
+
+
+class FakeAdbHandler(socketserver.BaseRequestHandler):
+    """speaks just enough of the adb server protocol"""
+
+    def _read_request(self) -> str:
+        size = int(self.request.recv(4), 16)
+        return self.request.recv(size).decode()
+
+    def _fail(self, message: str) -> None:
+        self.request.sendall(b"FAIL" + f"{len(message):04x}{message}".encode())
+
+    def handle(self):
+        request = self._read_request()
+        self.server.requests.append(request)
+        if request == "host:devices":
+            payload = "emulator-5554\tdevice\n0123456789\tunauthorized\n"
+            self.request.sendall(b"OKAY" + f"{len(payload):04x}{payload}".encode())
+            return
+        if request not in ("host:transport:emulator-5554", "host:transport-any"):
+            self._fail("device not found")
+            return
+        self.request.sendall(b"OKAY")
+        request = self._read_request()
+        self.server.requests.append(request)
+        cmd = request[len("shell:") :]
+        self.request.sendall(b"OKAY" + SHELL_OUTPUTS.get(cmd, "").encode())
+
+
+@pytest.fixture
+def adb_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), FakeAdbHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_devices(adb_server):
+    client = AdbClient(port=adb_server.server_address[1])
+    assert client.devices() == [
+        ("emulator-5554", "device"),
+        ("0123456789", "unauthorized"),
+    ]
+
+
+def test_shell_reuses_the_client(adb_server):
+    client = AdbClient("emulator-5554", port=adb_server.server_address[1])
+    assert client.shell("settings get system screen_off_timeout") == "60000\n"
+    assert "mInputShown=true" in client.shell("dumpsys input_method")
+    assert adb_server.requests == [
+        "host:transport:emulator-5554",
+        "shell:settings get system screen_off_timeout",
+        "host:transport:emulator-5554",
+        "shell:dumpsys input_method",
+    ]
+
+
+def test_unknown_device(adb_server):
+    client = AdbClient("not-there", port=adb_server.server_address[1])
+    with pytest.raises(AdbError, match="device not found"):
+        client.shell("echo hello")
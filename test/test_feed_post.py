@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+import pytest
+
+from GramAddict.core import utils, views
+from GramAddict.core.device_facade import DeviceFacade
+from GramAddict.core.replay import ReplayClock, ReplayDevice, ReplayScreen
+from GramAddict.core.views import FeedPost, MediaType, Owner, PostsViewList
+
+APP_ID = "com.instagram.android"
+
+
+@pytest.fixture(autouse=True)
+def view_config():
+    config = SimpleNamespace(args=SimpleNamespace(app_id=APP_ID, speed_multiplier=1))
+    utils.load_config(config)
+    views.load_config(config)
+
+
+@pytest.fixture
+def post():
+    return FeedPost(ReplayScreen.load("xml/feed_post.xml").hierarchy)
+
+
+def test_post_from_a_single_dump(post):
+    assert FeedPost.username_of(post.owner) == "alice"
+    assert post.owner_named("bob") is None
+    assert post.ad_or_hashtag(post.owner) == (True, False, "alice")
+    assert post.description_of("alice") == "ALICE SUNSET AT THE BEACH"
+    assert post.likes.text == "Liked by bob and 1,234 others"
+    assert post.media == (MediaType.CAROUSEL, 3)
+    assert post.has_tags
+    assert post.header_is_above_the_end()
+    assert post.action_bar_position() == (True, 60, 200)
+
+
+@pytest.mark.parametrize(
+    "owner_name, label, expected",
+    [
+        ("alice", None, (False, False, "alice")),
+        ("alice", "Sponsored", (True, False, "alice")),
+        ("#travel • Original audio", "Follow", (False, True, "#travel")),
+    ],
+)
+def test_classify_owner(owner_name, label, expected):
+    assert FeedPost.classify_owner(owner_name, label) == expected
+
+
+def test_helpers_share_the_dump():
+    backend = ReplayDevice.from_files(["xml/feed_post.xml"])
+    device = DeviceFacade(None, APP_ID, backend=backend)
+    post_view_list = PostsViewList(device)
+    with ReplayClock() as clock:
+        last_post = post_view_list._check_if_last_post("", "feed")
+        likers = post_view_list._find_likers_container()
+        position = post_view_list._post_owner("feed", Owner.GET_POSITION)
+    assert last_post == (
+        False,
+        "ALICE SUNSET AT THE BEACH",
+        "alice",
+        True,
+        False,
+        True,
+    )
+    assert likers == (True, 1234)
+    assert position == ({"left": 150, "top": 240, "right": 500, "bottom": 290}, False)
+    assert backend.rpc_count == 1
+    assert clock.slept == 0
@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from GramAddict.core import fleet
+from GramAddict.core.fleet import _run_accounts, group_by_device, load_fleet
+
+CONFIG = """username: {username}
+device: {device}
+app-id: com.instagram.android
+blogger-followers: [bob]
+"""
+
+
+@pytest.fixture
+def configs_list(tmp_path):
+    lines = []
+    for name, device in [
+        ("alice", "phone-1"),
+        ("carol", "phone-2"),
+        ("dave", "phone-1"),
+    ]:
+        path = tmp_path / f"{name}.yml"
+        path.write_text(CONFIG.format(username=name, device=device))
+        lines.append(f"{name}:\n  path: {path}\n")
+    configs_list = tmp_path / "configs-list.yml"
+    configs_list.write_text("".join(lines))
+    return str(configs_list)
+
+
+def test_load_fleet(configs_list):
+    accounts = load_fleet(configs_list)
+    assert [(a.name, a.username, a.device_id) for a in accounts] == [
+        ("alice", "alice", "phone-1"),
+        ("carol", "carol", "phone-2"),
+        ("dave", "dave", "phone-1"),
+    ]
+    # an untested IG version stops the account unless its config allows it
+    assert not any(a.config.args.allow_untested_ig_version for a in accounts)
+
+
+def test_accounts_sharing_a_phone_are_grouped(configs_list):
+    devices = group_by_device(load_fleet(configs_list))
+    assert {
+        device: [a.name for a in accounts] for device, accounts in devices.items()
+    } == {
+        "phone-1": ["alice", "dave"],
+        "phone-2": ["carol"],
+    }
+
+
+def test_one_account_failing_doesnt_stop_the_others(configs_list, monkeypatch):
+    def run_account(config, sessions):
+        ran.append((config.username, threading.current_thread().name))
+        if config.username == "alice":
+            raise SystemExit(2)
+        if config.username == "carol":
+            raise ValueError("no posts")
+
+    ran = []
+    monkeypatch.setattr(fleet, "load_configs", lambda config: None)
+    monkeypatch.setattr(fleet, "run_account", run_account)
+    monkeypatch.setattr(fleet, "configure_thread_logger", lambda username: None)
+    monkeypatch.setattr(fleet, "remove_thread_logger", lambda: None)
+    accounts = load_fleet(configs_list)
+    worker = threading.Thread(target=_run_accounts, args=(accounts, False))
+    worker.start()
+    worker.join()
+    assert ran == [("alice", "alice"), ("carol", "carol"), ("dave", "dave")]
+    assert [a.error for a in accounts] == [
+        "stopped (exit code 2)",
+        "ValueError: no posts",
+        None,
+    ]
+    assert all(a.finish_time >= a.start_time for a in accounts)
@@ -0,0 +1,64 @@
+import pytest
+from uiautomator2._selector import Selector
+
+from GramAddict.core.hierarchy import Hierarchy, UnsupportedSelector
+
+APP_ID = "com.instagram.android"
+
+
+@pytest.fixture
+def hierarchy():
+    with open("xml/profile.xml", encoding="utf-8") as f:
+        return Hierarchy(f.read())
+
+
+def test_find_by_resource_id(hierarchy):
+    node = hierarchy.find(resourceId=f"{APP_ID}:id/action_bar_title")
+    assert node is not None
+    assert node.text == "johndoe"
+    assert node.bounds == {"left": 44, "top": 100, "right": 400, "bottom": 170}
+
+
+def test_matches_is_a_full_match(hierarchy):
+    assert hierarchy.find(textMatches="(?i)(follow)") is not None
+    assert hierarchy.find(textMatches="(?i)(foll)") is None
+    assert len(hierarchy.find_all(textMatches="(?i)(follow.*)")) == 3
+
+
+def test_invisible_nodes_are_ignored(hierarchy):
+    assert hierarchy.find(resourceId=f"{APP_ID}:id/hidden_view") is None
+
+
+def test_instance(hierarchy):
+    nodes = hierarchy.find_all(className="android.widget.LinearLayout")
+    assert len(nodes) == 2
+    second = hierarchy.find(className="android.widget.LinearLayout", instance=1)
+    assert second is nodes[1]
+
+
+def test_resolve_child_chain(hierarchy):
+    selector = Selector(
+        resourceIdMatches=f"{APP_ID}:id/row_profile_header_following_container"
+    ).child(index=0)
+    nodes = hierarchy.resolve(selector)
+    assert [node.text for node in nodes] == ["56"]
+
+
+def test_resolve_sibling_chain(hierarchy):
+    selector = Selector(
+        resourceId=f"{APP_ID}:id/row_profile_header_textview_followers_count"
+    ).sibling(textContains="followers")
+    assert hierarchy.resolve(selector)[0].index == 1
+
+
+def test_info_has_uiautomator2_shape(hierarchy):
+    info = hierarchy.find(text="Follow").info
+    assert info["className"] == "android.widget.Button"
+    assert info["clickable"] is True
+    assert info["contentDescription"] is None
+    assert info["childCount"] == 0
+
+
+def test_unsupported_selector(hierarchy):
+    with pytest.raises(UnsupportedSelector):
+        hierarchy.find_all(somethingElse=True)
@@ -0,0 +1,55 @@
+import pytest
+
+from GramAddict.core import media_type
+from GramAddict.core.media_type import (
+    MediaType,
+    carousel_counts,
+    classify_media,
+    classify_medias,
+)
+
+
+@pytest.mark.parametrize(
+    "content_desc, expected",
+    [
+        (None, (None, None)),
+        ("", (MediaType.UNKNOWN, 1)),
+        (", by alice", (MediaType.UNKNOWN, 1)),
+        ("Photo by alice at Row 1, Column 1", (MediaType.PHOTO, 1)),
+        ("Hidden Photo by alice", (MediaType.PHOTO, 1)),
+        ("Video by alice", (MediaType.VIDEO, 1)),
+        ("IGTV by alice", (MediaType.IGTV, 1)),
+        ("Reel by alice", (MediaType.REEL, 1)),
+        ("Carousel with 2 photos and 1 video by alice", (MediaType.CAROUSEL, 3)),
+        ("Carousel with 4 photos by alice", (MediaType.CAROUSEL, 4)),
+    ],
+)
+def test_classify_media(content_desc, expected):
+    assert classify_media(content_desc) == expected
+
+
+@pytest.mark.parametrize(
+    "content_desc, counts",
+    [
+        ("Carousel with 2 photos and 1 video by alice", (2, 1)),
+        ("Carousel with 4 photos by alice", (4, 0)),
+        ("Carousel with 3 videos by alice", (0, 3)),
+    ],
+)
+def test_carousel_counts(content_desc, counts):
+    assert carousel_counts(content_desc) == counts
+
+
+def test_descriptions_are_classified_once():
+    media_type._classify.cache_clear()
+    content_descs = ["Photo by alice", "Reel by bob", "Photo by alice", None]
+    assert classify_medias(content_descs) == [
+        (MediaType.PHOTO, 1),
+        (MediaType.REEL, 1),
+        (MediaType.PHOTO, 1),
+        (None, None),
+    ]
+    classify_media("Reel by bob")
+    cache_info = media_type._classify.cache_info()
+    assert (cache_info.misses, cache_info.hits) == (2, 1)
+    assert cache_info.maxsize == media_type.CACHE_SIZE
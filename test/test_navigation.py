@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+import pytest
+
+from GramAddict.core import adb, navigation, utils, views
+from GramAddict.core.device_facade import DeviceFacade
+from GramAddict.core.navigation import deep_link, is_target_title, open_with_deep_link
+from GramAddict.core.replay import ReplayClock, ReplayDevice
+
+APP_ID = "com.instagram.android"
+
+
+@pytest.mark.parametrize(
+    "target, job, url",
+    [
+        ("alice", "blogger-followers", "https://www.instagram.com/alice/"),
+        ("@alice", "interact-from-file", "https://www.instagram.com/alice/"),
+        (
+            "sunset",
+            "hashtag-posts-top",
+            "https://www.instagram.com/explore/tags/sunset/",
+        ),
+        (
+            "#café",
+            "hashtag-likers-recent",
+            "https://www.instagram.com/explore/tags/caf%C3%A9/",
+        ),
+        (
+            "213385402/london-united-kingdom",
+            "place-posts-top",
+            "https://www.instagram.com/explore/locations/213385402/london-united-kingdom/",
+        ),
+        ("london", "place-posts-recent", None),
+    ],
+)
+def test_deep_link(target, job, url):
+    assert deep_link(target, job) == url
+
+
+def test_deep_links_are_opt_in():
+    navigation.load_config(SimpleNamespace(args=SimpleNamespace(deep_links=False)))
+    # never touches the device when it's off
+    assert not open_with_deep_link(None, "alice", "blogger-followers")
+
+
+class FakeAdb:
+    def __init__(self):
+        self.commands = []
+
+    def shell(self, cmd):
+        self.commands.append(cmd)
+        return "Starting: Intent { act=android.intent.action.VIEW }\n"
+
+
+@pytest.fixture
+def linked_device(monkeypatch):
+    config = SimpleNamespace(
+        device_id=None,
+        args=SimpleNamespace(app_id=APP_ID, speed_multiplier=1, deep_links=True),
+    )
+    utils.load_config(config)
+    views.load_config(config)
+    navigation.load_config(config)
+    fake_adb = FakeAdb()
+    monkeypatch.setattr(adb, "_clients", {None: fake_adb})
+    # the intent doesn't change the screen: the profile of johndoe stays
+    device = DeviceFacade(
+        None, APP_ID, backend=ReplayDevice.from_files(["xml/profile.xml"])
+    )
+    return device, fake_adb
+
+
+def test_deep_link_to_the_profile_on_screen(linked_device):
+    device, fake_adb = linked_device
+    with ReplayClock():
+        assert open_with_deep_link(device, "@johndoe", "blogger-followers")
+    assert fake_adb.commands == [
+        "am start -a android.intent.action.VIEW -d 'https://www.instagram.com/johndoe/' -p com.instagram.android"
+    ]
+
+
+def test_deep_link_left_on_another_profile_falls_back(linked_device):
+    device, fake_adb = linked_device
+    with ReplayClock():
+        assert not open_with_deep_link(device, "alice", "interact-from-file")
+    assert len(fake_adb.commands) == 1
+
+
+@pytest.mark.parametrize(
+    "title, title_before, name, kind, expected",
+    [
+        ("#sunset", None, "sunset", "hashtag", True),
+        ("sunset", None, "sunrise", "hashtag", False),
+        (
+            "London, United Kingdom",
+            None,
+            "213385402/london-united-kingdom",
+            "place",
+            True,
+        ),
+        ("Paris, France", None, "213385402/london-united-kingdom", "place", False),
+        ("London", "Paris", "213385402", "place", True),
+        ("Paris", "Paris", "213385402", "place", False),
+        (None, None, "alice", "account", False),
+    ],
+)
+def test_is_target_title(title, title_before, name, kind, expected):
+    assert is_target_title(title, title_before, name, kind) == expected
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+
+from GramAddict.core import utils, views
+from GramAddict.core.device_facade import DeviceFacade
+from GramAddict.core.popup_watcher import NOTIFICATION_WAIT, PopupWatcher
+from GramAddict.core.replay import ReplayClock, ReplayDevice
+from GramAddict.core.utils import ActionBlockedError
+
+APP_ID = "com.instagram.android"
+
+
+@pytest.fixture(autouse=True)
+def view_config():
+    config = SimpleNamespace(
+        args=SimpleNamespace(
+            app_id=APP_ID, speed_multiplier=1, disable_block_detection=True
+        )
+    )
+    utils.load_config(config)
+    views.load_config(config)
+
+
+def watched_device(paths, block_detection=True):
+    device = DeviceFacade(
+        None, APP_ID, snapshot=True, backend=ReplayDevice.from_files(paths)
+    )
+    device.watch_popups(block_detection)
+    return device
+
+
+@pytest.mark.parametrize(
+    "popup, button",
+    [("xml/crash_popup.xml", (540, 1160)), ("xml/post_deleted.xml", (540, 1210))],
+)
+def test_popups_are_closed_before_the_snapshot_is_used(popup, button):
+    device = watched_device([popup, "xml/profile.xml"])
+    snapshot = device.get_snapshot()
+    assert device.deviceV2.events == [("click", button)]
+    assert snapshot.find(resourceIdMatches=".*:id/dialog_root_view") is None
+    assert device.get_snapshot() is snapshot
+
+
+def test_blocks_are_raised_from_the_dump():
+    device = watched_device(["xml/block_dialog.xml"])
+    with pytest.raises(ActionBlockedError):
+        device.get_snapshot()
+    assert device.deviceV2.events == []
+
+
+def test_blocks_are_left_alone_when_their_detection_is_disabled():
+    device = watched_device(["xml/block_dialog.xml"], block_detection=False)
+    assert device.get_snapshot().find(resourceIdMatches=".*:id/dialog_root_view")
+
+
+def test_notification_banners_are_waited_for_once():
+    device = watched_device(["xml/notification.xml", "xml/profile.xml"])
+    with ReplayClock() as clock:
+        device.get_snapshot()
+        # the banner is still there after the settle dumps of a swipe
+        device.get_snapshot(refresh=True)
+        device.get_snapshot(refresh=True)
+    assert clock.slept == NOTIFICATION_WAIT
+    assert device.deviceV2.events == []
+
+
+def test_a_new_banner_is_waited_for_again():
+    device = watched_device(["xml/notification.xml", "xml/profile.xml"])
+    with ReplayClock() as clock:
+        device.get_snapshot()
+        device.deviceV2.position = 1
+        device.get_snapshot(refresh=True)
+        device.deviceV2.position = 0
+        device.get_snapshot(refresh=True)
+    assert clock.slept == NOTIFICATION_WAIT * 2
+
+
+def test_blocks_showing_up_in_a_cached_snapshot_are_raised():
+    backend = ReplayDevice.from_files(["xml/profile.xml", "xml/block_dialog.xml"])
+    device = DeviceFacade(None, APP_ID, snapshot=True, backend=backend)
+    device.watch_popups()
+    device.get_snapshot()
+    # the dialog shows up without a gesture, the snapshot is still fresh
+    backend.position = 1
+    with pytest.raises(ActionBlockedError):
+        views.UniversalActions.detect_block(device)
+
+
+def test_without_snapshots_blocks_are_looked_for_in_one_dump():
+    backend = ReplayDevice.from_files(["xml/block_dialog.xml"])
+    device = DeviceFacade(None, APP_ID, backend=backend)
+    device.watch_popups()
+    assert isinstance(device.popups, PopupWatcher)
+    with pytest.raises(ActionBlockedError):
+        views.UniversalActions.detect_block(device)
+    assert backend.rpc_count == 1
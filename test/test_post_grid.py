@@ -0,0 +1,95 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from GramAddict.core import utils, views
+from GramAddict.core.device_facade import DeviceFacade
+from GramAddict.core.hierarchy import Hierarchy
+from GramAddict.core.replay import ReplayClock, ReplayDevice, ReplayScreen
+from GramAddict.core.views import MediaType, PostGrid, PostsGridView, ProfileView
+
+APP_ID = "com.instagram.android"
+
+
+@pytest.fixture(autouse=True)
+def view_config():
+    config = SimpleNamespace(args=SimpleNamespace(app_id=APP_ID, speed_multiplier=1))
+    utils.load_config(config)
+    views.load_config(config)
+
+
+@pytest.fixture
+def grid():
+    return PostGrid(ReplayScreen.load("xml/post_grid.xml").hierarchy)
+
+
+def test_cells_and_visibility(grid):
+    assert len(grid.cells) == 11
+    assert grid.cell(0, 2).media == (MediaType.REEL, 1)
+    assert grid.cell(1, 0).media == (MediaType.CAROUSEL, 3)
+    last = grid.cell(3, 0)
+    assert not last.fully_visible
+    assert last.visible_bounds["bottom"] == grid.bounds["bottom"]
+    x, y = last.random_point()
+    assert last.visible_bounds["top"] <= y <= last.visible_bounds["bottom"]
+    assert grid.cell(3, 2) is None
+
+
+def test_shape_counts_fully_visible_rows(grid):
+    assert grid.shape() == (3, 0)
+
+
+def test_rows_are_counted_from_the_first_fully_visible_one():
+    with open("xml/post_grid.xml", encoding="utf-8") as f:
+        # the first row is cut by a pixel
+        xml_dump = f.read().replace("[0,400][1080,1800]", "[0,521][1080,1800]")
+    grid = PostGrid(Hierarchy(xml_dump))
+    assert grid.shape() == (2, 0)
+    assert grid.visible_cell(0, 0) is grid.cell(1, 0)
+    assert grid.visible_cell(2, 0) is None
+    backend = ReplayDevice(
+        [ReplayScreen(xml_dump), ReplayScreen.load("xml/profile.xml")]
+    )
+    device = DeviceFacade(None, APP_ID, backend=backend)
+    with ReplayClock():
+        _, media_type, obj_count = PostsGridView(device).navigateToPost(0, 0)
+    assert (media_type, obj_count) == (MediaType.CAROUSEL, 3)
+
+
+def test_no_grid():
+    with open("xml/profile.xml", encoding="utf-8") as f:
+        grid = PostGrid(Hierarchy(f.read()))
+    assert grid.cells == []
+    assert grid.shape() == (0, 0)
+
+
+def test_open_post_with_a_single_dump():
+    backend = ReplayDevice.from_files(["xml/post_grid.xml", "xml/profile.xml"])
+    device = DeviceFacade(None, APP_ID, backend=backend)
+    with ReplayClock():
+        assert ProfileView(device).count_photo_in_view() == (3, 0)
+        rpc_count = backend.rpc_count
+        _, media_type, obj_count = PostsGridView(device).navigateToPost(0, 1)
+    assert (media_type, obj_count) == (MediaType.VIDEO, 1)
+    event, (x, y) = backend.events[-1]
+    assert event == "click"
+    assert 0 <= x <= 357 + 360 and 520 <= y <= 877
+    # the grid dump is reused, opening the post is the click only
+    assert backend.rpc_count - rpc_count == 1
+
+
+def test_medias_of_the_whole_grid(grid):
+    medias = grid.medias()
+    assert len(medias) == len(grid.cells)
+    assert medias[(0, 2)] == (MediaType.REEL, 1)
+    assert medias[(1, 0)] == (MediaType.CAROUSEL, 3)
+
+
+def test_carousel_breakdown_is_logged(caplog):
+    backend = ReplayDevice.from_files(["xml/post_grid.xml", "xml/profile.xml"])
+    device = DeviceFacade(None, APP_ID, backend=backend)
+    with ReplayClock(), caplog.at_level(logging.INFO):
+        _, media_type, obj_count = PostsGridView(device).navigateToPost(1, 0)
+    assert (media_type, obj_count) == (MediaType.CAROUSEL, 3)
+    assert "It's a carousel with 2 photo(s) and 1 video(s)." in caplog.messages
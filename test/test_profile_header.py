@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import pytest
+
+from GramAddict.core import utils, views
+from GramAddict.core.device_facade import DeviceFacade
+from GramAddict.core.replay import ReplayClock, ReplayDevice
+from GramAddict.core.views import FollowStatus, ProfileHeader, ProfileView
+
+APP_ID = "com.instagram.android"
+
+
+@pytest.fixture(autouse=True)
+def view_config():
+    config = SimpleNamespace(args=SimpleNamespace(app_id=APP_ID, speed_multiplier=1))
+    utils.load_config(config)
+    views.load_config(config)
+
+
+def test_header_from_a_single_dump():
+    backend = ReplayDevice.from_files(["xml/profile.xml"])
+    device = DeviceFacade(None, APP_ID, backend=backend)
+    with ReplayClock() as clock:
+        header = ProfileView(device).getHeader()
+    # the dump, and the app check of the action bar lookup
+    assert backend.rpc_count == 2
+    assert clock.slept == 0
+    assert header.posts_count == 12
+    assert (header.followers, header.followings) == (1234, 56)
+    assert header.follow_status == FollowStatus.FOLLOW
+    assert header.mutual_friends == 0
+    assert not header.is_private
+    assert not header.has_business_category
+    assert header.biography == ""
+    assert not header.is_biography_truncated
+    assert header.link_in_bio is None
+    assert header.fullname == ""
+
+
+@pytest.mark.parametrize(
+    "raw_text, count",
+    [("1,234", 1234), ("12.5K", 12_500), ("3M", 3_000_000), ("", None)],
+)
+def test_parse_counter(raw_text, count):
+    assert ProfileHeader.parse_counter(raw_text) == count
+
+
+@pytest.mark.parametrize(
+    "text, mutual_friends",
+    [
+        ("Followed by alice", 1),
+        ("Followed by alice, bob", 2),
+        ("Followed by alice, bob and 3 others", 5),
+        ("Followed by alice and 12 others", 13),
+    ],
+)
+def test_parse_mutual_friends(text, mutual_friends):
+    assert ProfileHeader.parse_mutual_friends(text) == mutual_friends
+
+
+def test_parse_follow_status():
+    assert ProfileHeader.parse_follow_status("Requested") == FollowStatus.FOLLOWING
+    assert ProfileHeader.parse_follow_status("Follow Back") == FollowStatus.FOLLOW_BACK
+    assert ProfileHeader.parse_follow_status("Follow") == FollowStatus.FOLLOW
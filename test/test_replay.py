@@ -0,0 +1,130 @@
+from types import SimpleNamespace
+
+import pytest
+
+from GramAddict.core import utils, views
+from GramAddict.core.device_facade import DeviceFacade, Direction
+from GramAddict.core.replay import ReplayClock, ReplayDevice, ReplayScreen
+from GramAddict.core.views import ProfileView
+
+APP_ID = "com.instagram.android"
+
+
+@pytest.fixture(autouse=True)
+def view_config():
+    config = SimpleNamespace(args=SimpleNamespace(app_id=APP_ID, speed_multiplier=1))
+    utils.load_config(config)
+    views.load_config(config)
+
+
+def replay(paths, snapshot=False):
+    backend = ReplayDevice.from_files(paths)
+    return DeviceFacade(None, APP_ID, snapshot, backend=backend), backend
+
+
+def test_profile_info_offline():
+    device, _ = replay(["xml/profile.xml"])
+    with ReplayClock():
+        assert ProfileView(device).getProfileInfo() == ("johndoe", 12, 1234, 56)
+
+
+def test_profile_info_rpc_budget():
+    # with the hierarchy snapshot the whole header costs a dump and the app check
+    device, backend = replay(["xml/profile.xml"], snapshot=True)
+    with ReplayClock():
+        ProfileView(device).getProfileInfo()
+    assert backend.rpc_count <= 2
+
+
+def test_screens_advance_on_gestures():
+    device, backend = replay(["xml/profile.xml", "xml/followers.xml"])
+    assert device.find(text="Follow").exists()
+    with ReplayClock() as clock:
+        device.back()
+    assert clock.slept > 0
+    assert backend.events[-1] == ("back", "back")
+    assert not device.find(text="johndoe").exists()
+    assert device.find(text="alice").exists()
+
+
+def test_swipe_returns_the_settled_screen():
+    device, backend = replay(["xml/profile.xml", "xml/followers.xml"], snapshot=True)
+    with ReplayClock() as clock:
+        snapshot = device.swipe(Direction.DOWN)
+    assert backend.events[-1] == ("swipe", "down")
+    assert snapshot is device.get_snapshot()
+    assert snapshot.find(text="alice") is not None
+    # two identical dumps and it's settled, no need to wait the whole pause
+    assert clock.slept == pytest.approx(DeviceFacade.SETTLE_POLL_INTERVAL)
+
+
+def test_settle_without_snapshot_waits_for_idle():
+    device, backend = replay(["xml/profile.xml", "xml/followers.xml"])
+    backend._rpc_waitForIdle = lambda timeout: waits.append(timeout)
+    waits = []
+    with ReplayClock() as clock:
+        assert device.swipe(Direction.DOWN) is None
+    assert clock.slept == 0
+    assert len(waits) == 1
+    assert device.find(text="alice").exists()
+
+
+def test_scroll_without_snapshot_doesnt_wait():
+    device, backend = replay(["xml/profile.xml", "xml/followers.xml"])
+    backend._rpc_waitForIdle = lambda timeout: waits.append(timeout)
+    waits = []
+    with ReplayClock() as clock:
+        assert device.find(text="Follow").scroll(Direction.DOWN) is None
+    assert clock.slept == 0
+    assert waits == []
+    assert device.find(text="alice").exists()
+
+
+def test_app_state_is_asked_again_once_the_app_is_stopped():
+    device, backend = replay(["xml/profile.xml"])
+    assert device.app_state.is_app_opened()
+    rpc_count = backend.rpc_count
+    assert device.app_state.is_app_opened()
+    assert backend.rpc_count == rpc_count
+    utils.kill_app(device, APP_ID)
+    rpc_count = backend.rpc_count
+    device.app_state.is_app_opened()
+    assert backend.rpc_count == rpc_count + 1
+
+
+def test_view_info_is_fetched_once_per_screen_state():
+    device, backend = replay(["xml/profile.xml", "xml/profile.xml"])
+    view = device.find(text="Follow")
+    rpc_count = backend.rpc_count
+    assert view.get_text() == "Follow"
+    assert view.get_desc() == view.ui_info()["contentDescription"]
+    assert backend.rpc_count == rpc_count + 1
+    assert device.info_rpc_saved == 2
+    with ReplayClock():
+        device.swipe(Direction.DOWN)
+    rpc_count = backend.rpc_count
+    view.get_text()
+    assert backend.rpc_count == rpc_count + 1
+
+
+def test_display_metrics_are_refreshed_on_rotation_and_restart():
+    with open("xml/profile.xml", encoding="utf-8") as f:
+        xml_dump = f.read()
+    rotated = xml_dump.replace('rotation="0"', 'rotation="1"', 1)
+    backend = ReplayDevice([ReplayScreen(xml_dump), ReplayScreen(rotated)])
+    device = DeviceFacade(None, APP_ID, snapshot=True, backend=backend)
+    display = device.display
+    rpc_count = backend.rpc_count
+    assert device.display is display
+    assert backend.rpc_count == rpc_count
+    # the dump of the same screen tells nothing changed
+    device.get_snapshot()
+    assert device.display is display
+    with ReplayClock():
+        device.back()
+    device.get_snapshot()
+    assert device.display is not display
+    assert device.display.rotation == 1
+    display = device.display
+    device.reset_display()
+    assert device.display is not display
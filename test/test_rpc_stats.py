@@ -0,0 +1,62 @@
+import json
+import os
+
+from GramAddict.core import rpc_stats
+from GramAddict.core.rpc_stats import HdrHistogram, RpcStats
+
+
+class FakeSession:
+    def request(self, method, url, **kwargs):
+        return f"{method} {url}"
+
+
+class FakeDevice:
+    def __init__(self):
+        self.http = FakeSession()
+
+    def _jsonrpc_call(self, method, params=[], http_timeout=60):
+        # like uiautomator2, a jsonrpc goes through the http session
+        return self.http.request("post", "/jsonrpc/0")
+
+
+class ProfileView:
+    def __init__(self, device):
+        self.device = device
+
+    def getFollowersCount(self):
+        return self.device._jsonrpc_call("objInfo")
+
+
+def test_percentiles_within_precision():
+    histogram = HdrHistogram()
+    for ms in range(1, 101):
+        histogram.add(ms / 1000)
+    assert histogram.count == 100
+    assert abs(histogram.percentile(0.5) - 0.050) < 0.050 * 0.04
+    assert abs(histogram.percentile(0.99) - 0.099) < 0.099 * 0.04
+    assert histogram.max == 100_000
+    assert len(histogram.buckets) < 100
+
+
+def test_calls_grouped_by_job_and_call_site(tmp_path, monkeypatch):
+    # call sites are looked for in the package, here they are in this file
+    monkeypatch.setattr(rpc_stats, "_PACKAGE_DIR", os.path.dirname(__file__))
+    device = FakeDevice()
+    stats = RpcStats()
+    stats.install(device)
+    stats.set_job("blogger-followers")
+    ProfileView(device).getFollowersCount()
+    device.http.request("get", "/screenshot/0")
+    stats.set_job(None)
+
+    histograms = stats.histograms["blogger-followers"]
+    assert set(histograms) == {
+        ("ProfileView.getFollowersCount", "objInfo"),
+        ("test_calls_grouped_by_job_and_call_site", "get /screenshot/0"),
+    }
+    assert stats.table()[0].startswith("blogger-followers: 2 RPC(s)")
+
+    path = tmp_path / "rpc_stats" / "session.json"
+    stats.dump(str(path))
+    dumped = json.loads(path.read_text())
+    assert dumped["blogger-followers"]["rpc"]["count"] == 2
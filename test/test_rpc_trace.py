@@ -0,0 +1,96 @@
+import json
+
+import pytest
+import requests
+import uiautomator2
+
+from GramAddict.core import adb
+from GramAddict.core.adb import AdbClient
+from GramAddict.core.rpc_trace import TraceMismatch, TraceRecorder, open_trace
+
+
+class FakeSession(requests.Session):
+    def request(self, method, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"output": "hi\n", "exitCode": 0}).encode()
+        return response
+
+
+def fake_jsonrpc_call(method, params=[], http_timeout=60):
+    if method == "objInfo":
+        raise uiautomator2.UiObjectNotFoundError({"code": -32002, "message": "gone"})
+    return method == "exist"
+
+
+@pytest.fixture
+def trace(tmp_path):
+    path = str(tmp_path / "trace.jsonl.gz")
+    device = uiautomator2.Device("http://recorded")
+    device.http = FakeSession()
+    device._jsonrpc_call = fake_jsonrpc_call
+    recorder = TraceRecorder(path, "emulator-5554", seed=42)
+    recorder.install(device)
+    assert device(text="Follow").exists
+    assert device.shell("echo hi").output == "hi\n"
+    with pytest.raises(uiautomator2.UiObjectNotFoundError):
+        device.jsonrpc.objInfo({"text": "Unfollow"})
+    recorder.close()
+    assert recorder.calls == 3
+    return path
+
+
+def test_replay_answers_like_the_device(trace):
+    device = open_trace(trace)
+    assert device.serial == "emulator-5554"
+    assert device(text="Follow").exists
+    assert device.shell("echo hi").output == "hi\n"
+    with pytest.raises(uiautomator2.UiObjectNotFoundError):
+        device.jsonrpc.objInfo({"text": "Unfollow"})
+    assert device.replayer.replayed == 3
+    assert device.replayer.skipped == 0
+
+
+def test_replay_skips_calls_not_asked(trace):
+    device = open_trace(trace)
+    assert device.shell("echo hi").output == "hi\n"
+    assert device.replayer.skipped == 1
+    with pytest.raises(TraceMismatch):
+        device(text="Follow").exists()
+
+
+class FakeAdb(AdbClient):
+    def shell(self, cmd):
+        return "mCurrentFocus=Window{com.instagram.android}\n"
+
+
+def test_copy_of_a_trace_being_recorded(tmp_path):
+    path = str(tmp_path / "trace.jsonl.gz")
+    device = uiautomator2.Device("http://recorded")
+    device._jsonrpc_call = fake_jsonrpc_call
+    recorder = TraceRecorder(path, "emulator-5554", seed=42)
+    recorder.install(device)
+    assert device(text="Follow").exists
+    crash_path = tmp_path / "crash"
+    crash_path.mkdir()
+    recorder.save_copy(str(crash_path))
+    assert device(text="Follow").exists
+    recorder.close()
+    crash_records = open_trace(str(crash_path / "trace.jsonl.gz")).replayer.records
+    assert crash_records == open_trace(path).replayer.records[:1]
+    assert len(open_trace(path).replayer.records) == 2
+
+
+def test_adb_shell_is_recorded_and_replayed(tmp_path, monkeypatch):
+    monkeypatch.setattr(adb, "_clients", {})
+    path = str(tmp_path / "trace.jsonl.gz")
+    recorder = TraceRecorder(path, "emulator-5554", seed=42)
+    client = FakeAdb("emulator-5554")
+    recorder.install_adb(client)
+    # traced again by the device of the next session, recorded once
+    recorder.install_adb(client)
+    output = client.shell("dumpsys window")
+    recorder.close()
+    assert recorder.calls == 1
+    open_trace(path)
+    assert adb.get_adb("emulator-5554").shell("dumpsys window") == output
@@ -0,0 +1,24 @@
+from GramAddict.core.screen_recorder import CrashRecorder
+
+
+def test_ring_stays_under_memory_ceiling():
+    recorder = CrashRecorder(None, fps=10, seconds=60, max_bytes=1000)
+    for second in range(100):
+        recorder.add_frame(b"x" * 300, timestamp=second)
+    assert recorder.size <= 1000
+    assert len(recorder.frames) == 3
+
+
+def test_ring_keeps_last_seconds():
+    recorder = CrashRecorder(None, fps=10, seconds=5, max_bytes=10**6)
+    for second in range(20):
+        recorder.add_frame(bytes([second]), timestamp=second)
+    assert [jpeg for _, jpeg in recorder.frames] == [bytes([s]) for s in range(14, 20)]
+
+
+def test_frames_paced_at_fps():
+    recorder = CrashRecorder(None, fps=10, seconds=30)
+    recorder.add_frame(b"a", timestamp=0.0)
+    recorder.add_frame(b"b", timestamp=0.5)
+    recorder.add_frame(b"c", timestamp=0.6)
+    assert recorder.paced_frames() == [b"a"] * 5 + [b"b"] + [b"c"]
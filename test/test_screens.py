@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import pytest
+
+from GramAddict.core import utils, views
+from GramAddict.core.device_facade import DeviceFacade
+from GramAddict.core.replay import ReplayClock, ReplayDevice, ReplayScreen
+from GramAddict.core.screens import Screen, ScreenNavigator, classify_screen
+
+APP_ID = "com.instagram.android"
+# a dump taken in the middle of a transition
+UNKNOWN_SCREEN = f"""<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<hierarchy rotation="0">
+  <node index="0" text="" resource-id="" class="android.widget.FrameLayout" package="{APP_ID}" content-desc="" bounds="[0,0][1080,2220]" />
+</hierarchy>
+"""
+BACK_BUTTON = f"""  <node index="9" text="" resource-id="{APP_ID}:id/action_bar_button_back" class="android.widget.ImageView" package="{APP_ID}" content-desc="Back" bounds="[0,80][120,200]" />
+</hierarchy>"""
+
+
+def post_screen() -> ReplayScreen:
+    """a post opened from a profile grid: a feed with a back button"""
+    with open("xml/feed_post.xml", encoding="utf-8") as f:
+        return ReplayScreen(f.read().replace("</hierarchy>", BACK_BUTTON))
+
+
+@pytest.fixture(autouse=True)
+def view_config():
+    config = SimpleNamespace(args=SimpleNamespace(app_id=APP_ID, speed_multiplier=1))
+    utils.load_config(config)
+    views.load_config(config)
+
+
+@pytest.mark.parametrize(
+    "path, screen",
+    [
+        ("xml/profile.xml", Screen.PROFILE),
+        ("xml/post_grid.xml", Screen.PROFILE),
+        ("xml/followers.xml", Screen.FOLLOW_LIST),
+        ("xml/feed_post.xml", Screen.FEED),
+    ],
+)
+def test_classify_screen(path, screen):
+    assert classify_screen(ReplayScreen.load(path).hierarchy, APP_ID) == screen
+
+
+def test_classify_opened_post():
+    assert classify_screen(post_screen().hierarchy, APP_ID) == Screen.POST
+
+
+def test_back_to_the_profile():
+    backend = ReplayDevice([post_screen(), ReplayScreen.load("xml/profile.xml")])
+    device = DeviceFacade(None, APP_ID, backend=backend)
+    with ReplayClock():
+        assert ScreenNavigator(device).navigate_to(Screen.PROFILE)
+    assert [event for event, _ in backend.events] == ["back"]
+
+
+def test_no_back_from_a_screen_which_isnt_above_the_target():
+    backend = ReplayDevice.from_files(["xml/followers.xml", "xml/profile.xml"])
+    device = DeviceFacade(None, APP_ID, backend=backend)
+    with ReplayClock():
+        assert not ScreenNavigator(device).navigate_to(Screen.STORY)
+    assert backend.events == []
+
+
+def test_give_up_after_max_steps():
+    backend = ReplayDevice([post_screen()])
+    device = DeviceFacade(None, APP_ID, backend=backend)
+    with ReplayClock():
+        assert not ScreenNavigator(device).navigate_to(Screen.PROFILE, max_steps=2)
+    assert [event for event, _ in backend.events] == ["back", "back"]
+
+
+def test_unknown_screen_is_looked_at_again_instead_of_going_back():
+    backend = ReplayDevice.from_files(["xml/profile.xml"])
+    with open("xml/profile.xml", encoding="utf-8") as f:
+        dumps = iter([UNKNOWN_SCREEN, f.read()])
+    backend.dump_hierarchy = lambda *args, **kwargs: next(dumps)
+    device = DeviceFacade(None, APP_ID, backend=backend)
+    with ReplayClock() as clock:
+        assert ScreenNavigator(device).navigate_to(Screen.PROFILE)
+    assert backend.events == []
+    assert clock.slept > 0
@@ -0,0 +1,56 @@
+import random
+
+from GramAddict.core.scroll_end_detector import ScrollEndDetector
+
+
+def iterate_page(detector, usernames):
+    detector.notify_new_page()
+    for username in usernames:
+        detector.notify_username_iterated(username)
+
+
+def test_end_after_same_users_repeated():
+    detector = ScrollEndDetector(repeats_to_end=3)
+    iterate_page(detector, ["alice", "bob"])
+    iterate_page(detector, ["carol", "dave"])
+    assert not detector.is_the_end()
+    iterate_page(detector, ["carol", "dave"])
+    assert not detector.is_the_end()
+    iterate_page(detector, ["carol", "dave"])
+    assert detector.is_the_end()
+
+
+def test_order_of_users_matters():
+    detector = ScrollEndDetector(repeats_to_end=2)
+    iterate_page(detector, ["alice", "bob"])
+    iterate_page(detector, ["bob", "alice"])
+    assert not detector.is_the_end()
+
+
+def test_detectors_dont_share_pages():
+    first = ScrollEndDetector(repeats_to_end=2)
+    iterate_page(first, ["alice"])
+    second = ScrollEndDetector(repeats_to_end=2)
+    iterate_page(second, ["alice"])
+    assert not second.is_the_end()
+
+
+def test_same_answers_of_page_lists():
+    def reference(pages, repeats_to_end):
+        if len(pages) < 2:
+            return False
+        return all(
+            pages[-i] == pages[-1]
+            for i in range(2, min(repeats_to_end + 1, len(pages) + 1))
+        )
+
+    rng = random.Random(0)
+    for _ in range(200):
+        repeats_to_end = rng.randint(1, 5)
+        detector = ScrollEndDetector(repeats_to_end=repeats_to_end)
+        pages = []
+        for _ in range(rng.randint(1, 10)):
+            page = rng.choice([["a"], ["a", "b"], ["b"], []])
+            pages.append(page)
+            iterate_page(detector, page)
+            assert detector.is_the_end() == reference(pages, repeats_to_end)
@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import pytest
+
+from GramAddict.core import selector_preferences, utils, views
+from GramAddict.core.device_facade import DeviceFacade, Timeout
+from GramAddict.core.replay import ReplayClock, ReplayDevice
+from GramAddict.core.selector_preferences import SelectorPreferences, first_alternative
+from GramAddict.core.views import TabBarView, UniversalActions
+
+APP_ID = "com.instagram.android"
+
+
+@pytest.fixture(autouse=True)
+def devices_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(selector_preferences, "PREFERENCES_DIR", str(tmp_path))
+
+
+def alternatives(calls, matching):
+    def alternative(name):
+        def call():
+            calls.append(name)
+            return name if name == matching else None
+
+        return call
+
+    return {name: alternative(name) for name in ("old", "new")}
+
+
+def test_the_last_match_is_tried_first():
+    preferences = SelectorPreferences("serial", "300.0.0.1")
+    calls = []
+    assert preferences.first("tab", alternatives(calls, "new")) == "new"
+    assert calls == ["old", "new"]
+    calls.clear()
+    assert preferences.first("tab", alternatives(calls, "new")) == "new"
+    assert calls == ["new"]
+
+
+def test_persisted_per_ig_version():
+    preferences = SelectorPreferences("serial", "300.0.0.1")
+    preferences.first("tab", alternatives([], "new"))
+    preferences.save()
+    assert SelectorPreferences("serial", "300.0.0.1").order("tab", ["old", "new"]) == [
+        "new",
+        "old",
+    ]
+    assert SelectorPreferences("serial", "301.0.0.1").order("tab", ["old", "new"]) == [
+        "old",
+        "new",
+    ]
+
+
+def test_nothing_learned_without_preferences():
+    calls = []
+    assert first_alternative(None, "tab", alternatives(calls, "missing")) is None
+    assert calls == ["old", "new"]
+
+
+@pytest.fixture
+def tab_bar(monkeypatch):
+    config = SimpleNamespace(args=SimpleNamespace(app_id=APP_ID, speed_multiplier=1))
+    utils.load_config(config)
+    views.load_config(config)
+    # it asks adb whether the keyboard is shown
+    monkeypatch.setattr(UniversalActions, "close_keyboard", lambda device: None)
+
+    def tab_bar(paths, learn=True):
+        device = DeviceFacade(None, APP_ID, backend=ReplayDevice.from_files(paths))
+        if learn:
+            device.learn_selectors("300.0.0.1")
+        return device, TabBarView(device)
+
+    return tab_bar
+
+
+def test_search_from_home_is_learned_when_it_opens(tab_bar):
+    # two taps on the home tab, then the search of its action bar
+    device, tab_bar_view = tab_bar(["xml/home_search.xml"] * 3 + ["xml/search.xml"])
+    with ReplayClock():
+        tab_bar_view.navigateToSearch()
+    assert device.selector_preferences.preferred == {"search_tab": "home_action_bar"}
+
+
+def test_search_not_opened_is_not_learned(tab_bar):
+    device, tab_bar_view = tab_bar(["xml/profile.xml"])
+    with ReplayClock():
+        tab_bar_view.navigateToSearch()
+    assert device.selector_preferences.preferred == {}
+
+
+@pytest.mark.parametrize("learn, timeout", [(True, Timeout.SHORT), (False, None)])
+def test_search_tab_is_waited_for_only_while_learning(
+    tab_bar, monkeypatch, learn, timeout
+):
+    def exists(self, ui_timeout=None, ignore_bug=False):
+        timeouts.append(ui_timeout)
+        return False
+
+    timeouts = []
+    monkeypatch.setattr(DeviceFacade.View, "exists", exists)
+    _, tab_bar_view = tab_bar(["xml/home_search.xml"], learn=learn)
+    with ReplayClock():
+        tab_bar_view.navigateToSearch()
+    assert timeouts[0] == timeout
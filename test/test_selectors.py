@@ -0,0 +1,43 @@
+from uiautomator2._selector import Selector
+
+from GramAddict.core.hierarchy import Hierarchy
+from GramAddict.core.selectors import ViewSelector, case_insensitive_re, selectors
+
+APP_ID = "com.instagram.android"
+
+
+def test_selectors_are_hashable_values():
+    first = ViewSelector(resourceId="a", className="b")
+    second = ViewSelector(className="b", resourceId="a")
+    assert first == second
+    assert len({first, second}) == 1
+    assert first != ViewSelector(resourceId="a")
+
+
+def test_registry_is_built_once_per_app():
+    assert selectors(APP_ID) is selectors(APP_ID)
+    assert selectors(APP_ID).POST_COUNT.kwargs == {
+        "resourceIdMatches": case_insensitive_re(
+            f"{APP_ID}:id/row_profile_header_textview_post_count"
+        )
+    }
+
+
+def test_case_insensitive_re():
+    assert case_insensitive_re("follow") == "(?i)(follow)"
+    assert case_insensitive_re(["a", "b"]) == "(?i)(a|b)"
+
+
+def test_resolve_is_memoized_per_snapshot():
+    with open("xml/profile.xml", encoding="utf-8") as f:
+        xml_dump = f.read()
+    hierarchy = Hierarchy(xml_dump)
+    post_count = selectors(APP_ID).POST_COUNT
+    selector = Selector(**post_count.kwargs)
+    nodes = hierarchy.resolve(selector, key=post_count.key)
+    assert [node.text for node in nodes] == ["12"]
+    assert hierarchy._resolved[post_count.key] == nodes
+    # the callers may change the list they get
+    nodes.clear()
+    assert len(hierarchy.resolve(selector, key=post_count.key)) == 1
+    assert Hierarchy(xml_dump)._resolved == {}
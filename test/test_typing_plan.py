@@ -0,0 +1,35 @@
+import base64
+import re
+
+from GramAddict.core.typing_plan import TypingPlan
+
+TEXT = "Hello there, nice pic!\nKeep going :)"
+
+
+def typed_by(commands):
+    return "".join(
+        base64.b64decode(encoded).decode("utf-8")
+        for command in commands
+        for encoded in re.findall(r"--es text (\S+);", command)
+    )
+
+
+def test_plan_types_the_text():
+    plan = TypingPlan(TEXT)
+    assert plan.typed_text() == TEXT
+    assert typed_by(plan.batches()) == TEXT
+
+
+def test_words_start_letter_by_letter():
+    plan = TypingPlan("wonderful!")
+    chunks = [keystroke.text for keystroke in plan.keystrokes]
+    assert 1 <= [len(chunk) for chunk in chunks].index(max(map(len, chunks))) <= 3
+    assert chunks[-1] == "!"
+
+
+def test_few_calls_for_a_long_comment():
+    plan = TypingPlan(" ".join(["lovely"] * 40))
+    batches = list(plan.batches())
+    assert len(plan.keystrokes) > 100
+    assert len(batches) <= len(plan.keystrokes) // TypingPlan.MAX_BATCH_KEYSTROKES + 3
+    assert abs(plan.duration - sum(k.delay for k in plan.keystrokes)) < 1e-9
@@ -0,0 +1,32 @@
+import pytest
+
+from GramAddict.core.hierarchy import Hierarchy
+from GramAddict.core.resources import ResourceID
+from GramAddict.core.user_rows import parse_user_rows
+
+APP_ID = "com.instagram.android"
+
+
+@pytest.fixture
+def rows():
+    with open("xml/followers.xml", encoding="utf-8") as f:
+        return parse_user_rows(Hierarchy(f.read()), ResourceID(APP_ID))
+
+
+def test_rows_in_screen_order(rows):
+    assert [row.username for row in rows] == ["alice", "bob", "carol", "dave"]
+    assert [row.index for row in rows] == [0, 1, 2, 3]
+
+
+def test_row_fields(rows):
+    alice, bob, carol, _ = rows
+    assert alice.full_name == "Alice Liddell"
+    assert carol.full_name is None
+    assert alice.follow_button_text == "Follow"
+    assert bob.follow_button_text == "Following"
+    assert alice.story_ring and not bob.story_ring
+    assert alice.bounds == {"left": 0, "top": 300, "right": 1080, "bottom": 500}
+
+
+def test_partially_visible_row(rows):
+    assert [row.fully_visible for row in rows] == [True, True, True, False]
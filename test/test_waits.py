@@ -0,0 +1,45 @@
+import pytest
+
+from GramAddict.core import waits
+from GramAddict.core.waits import AdaptiveWaits
+
+
+@pytest.fixture
+def adaptive(tmp_path, monkeypatch):
+    monkeypatch.setattr(waits, "WAITS_DIR", str(tmp_path))
+    monkeypatch.setattr(AdaptiveWaits, "POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(AdaptiveWaits, "STABLE_FOR", 0.05)
+    return AdaptiveWaits("emulator-5554")
+
+
+def test_deadline_is_learned(adaptive):
+    key = adaptive.key({"text": "Follow", "mask": 1})
+    assert adaptive.deadline(key, 8) == 8
+    for _ in range(AdaptiveWaits.MIN_SAMPLES):
+        adaptive.record(key, 0.2)
+    assert adaptive.deadline(key, 8) == AdaptiveWaits.MIN_DEADLINE
+    assert adaptive.deadline(key, 0.5) == 0.5
+
+
+def test_stops_when_screen_is_stable(adaptive):
+    probes = []
+
+    def probe():
+        probes.append(None)
+        return False, 42
+
+    assert not adaptive.wait_for("key", 8, probe)
+    assert len(probes) < 50
+
+
+def test_found_records_latency(adaptive):
+    answers = iter([(False, 1), (False, 2), (True, 3)])
+    assert adaptive.wait_for("key", 8, lambda: next(answers))
+    assert len(adaptive.histograms["key"]) == 1
+
+
+def test_persisted_per_device(adaptive):
+    adaptive.record("key", 0.3)
+    adaptive.save()
+    assert list(AdaptiveWaits("emulator-5554").histograms["key"].samples) == [0.3]
+    assert AdaptiveWaits("another-device").histograms == {}